@@ -0,0 +1,94 @@
+"""
+Memory & construction-time benchmark for the record-like models.
+
+Compares the slotted models against dict-backed references that mirror
+their previous layout.
+
+Usage: python -m df_py.benchmarks.bench_models [N_RECORDS]
+"""
+
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from df_py.predictoor.models import Prediction
+from df_py.util import oceanutil
+from df_py.util.typecheck import enforce_types
+from df_py.volume.models import SimpleDataNft
+
+
+class _DictPrediction:
+    """Dict-backed Prediction, for reference."""
+
+    @enforce_types
+    def __init__(self, slot: int, payout: float, stake: float, contract_addr: str):
+        self.slot = slot
+        self.payout = payout
+        self.stake = stake
+        self.contract_addr = contract_addr
+
+
+@enforce_types
+class _DictSimpleDataNft:
+    """Dict-backed SimpleDataNft with an eager did, for reference."""
+
+    def __init__(self, chain_id: int, nft_addr: str, _symbol: str, owner_addr: str):
+        self.chain_id = chain_id
+        self.nft_addr = nft_addr.lower()
+        self.symbol = _symbol.upper()
+        self.owner_addr = owner_addr.lower()
+        self.is_purgatory = False
+        self.name = ""
+        self.did = oceanutil.calc_did(nft_addr, chain_id)
+
+
+def _time(make: Callable[[int], object], n: int) -> float:
+    """@return -- wall time to construct n objects, in seconds"""
+    t0 = time.perf_counter()
+    objs = [make(i) for i in range(n)]
+    seconds = time.perf_counter() - t0
+    del objs
+    return seconds
+
+
+def _bytes_per_obj(make: Callable[[int], object], n: int) -> int:
+    """@return -- traced memory held per object, in bytes"""
+    tracemalloc.start()
+    objs = [make(i) for i in range(n)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+    return current // max(n, 1)
+
+
+def _nft_addr(i: int) -> str:
+    return f"0x{i:040x}"
+
+
+def run(n: int) -> List[Tuple[str, float, int]]:
+    """@return -- list of (label, seconds, bytes_per_obj)"""
+    cases = [
+        ("Prediction (dict)", lambda i: _DictPrediction(i, 1.0, 0.5, "0x1")),
+        ("Prediction (slots)", lambda i: Prediction(i, 1.0, 0.5, "0x1")),
+        (
+            "SimpleDataNft (dict, eager did)",
+            lambda i: _DictSimpleDataNft(137, _nft_addr(i), "DN", "0x123"),
+        ),
+        (
+            "SimpleDataNft (slots, lazy did)",
+            lambda i: SimpleDataNft(137, _nft_addr(i), "DN", "0x123"),
+        ),
+    ]
+    return [(label, _time(make, n), _bytes_per_obj(make, n)) for label, make in cases]
+
+
+def main(argv: List[str]):
+    n = int(argv[1]) if len(argv) > 1 else 1_000_000
+    print(f"Constructing {n} records per model")
+    for label, seconds, bytes_per_obj in run(n):
+        print(f"  {label:32s} {seconds:8.3f} s  {bytes_per_obj:6d} B/obj")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
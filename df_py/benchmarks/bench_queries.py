@@ -0,0 +1,113 @@
+"""
+Subgraph query benchmark, offline.
+
+Record once, against a real subgraph and RPC:
+  python -m df_py.benchmarks.bench_queries record FIXTURE_DIR CHAINID ST FIN [NSAMP]
+
+Then time queryVebalances, queryAllocations, _queryVolsOwners and
+query_predictoors over and over, with subgraph_replay serving the recorded
+responses, after LATENCY s each (default: 0, to time df-py's own work):
+  python -m df_py.benchmarks.bench_queries FIXTURE_DIR [LATENCY] [N_RUNS] [--json]
+
+The replay needs no network. queryVebalances' "latest" block timestamp
+comes from the recording too.
+"""
+
+import io
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+from unittest.mock import patch
+
+from df_py.predictoor.queries import query_predictoors
+from df_py.util import networkutil, subgraph_replay
+from df_py.util.blockrange import BlockRange
+from df_py.volume.queries import _queryVolsOwners, queryAllocations, queryVebalances
+
+RANDOM_SEED = 42  # so the recorded and replayed block samples match
+META_FILE = "bench_queries_meta.json"
+
+
+def _queries(meta: dict) -> Dict[str, Callable]:
+    chainID = meta["chainID"]
+    rng = BlockRange(meta["st_block"], meta["fin_block"], meta["n_samp"], RANDOM_SEED)
+    return {
+        "queryVebalances": lambda: queryVebalances(rng, chainID),
+        "queryAllocations": lambda: queryAllocations(rng, chainID),
+        "_queryVolsOwners": lambda: _queryVolsOwners(
+            meta["st_block"], meta["fin_block"], chainID
+        ),
+        "query_predictoors": lambda: query_predictoors(
+            meta["st_ts"], meta["end_ts"], chainID
+        ),
+    }
+
+
+def record(fixture_dir: str, chainID: int, st_block: int, fin_block: int, n_samp: int):
+    web3 = networkutil.chain_id_to_web3(chainID)
+    meta = {
+        "chainID": chainID,
+        "st_block": st_block,
+        "fin_block": fin_block,
+        "n_samp": n_samp,
+        "st_ts": web3.eth.get_block(st_block).timestamp,
+        "end_ts": web3.eth.get_block(fin_block).timestamp,
+        "latest_ts": web3.eth.get_block("latest").timestamp,
+    }
+    with subgraph_replay.recording(fixture_dir):
+        for query in _queries(meta).values():
+            query()
+    with open(os.path.join(fixture_dir, META_FILE), "w") as f:
+        json.dump(meta, f)
+
+
+def run(fixture_dir: str, latency: float, n: int) -> dict:
+    """@return -- dict of [query_name] : best time over n runs, in ms"""
+    with open(os.path.join(fixture_dir, META_FILE), "r") as f:
+        meta = json.load(f)
+    latest_block = SimpleNamespace(timestamp=meta["latest_ts"], number=0)
+    web3 = SimpleNamespace(eth=SimpleNamespace(get_block=lambda _: latest_block))
+
+    results = {}
+    with subgraph_replay.replaying(fixture_dir, latency), patch.object(
+        networkutil, "chain_id_to_web3", return_value=web3
+    ):
+        for name, query in _queries(meta).items():
+            best = float("inf")
+            for _ in range(n):
+                t0 = time.perf_counter()
+                with redirect_stdout(io.StringIO()):  # progress prints
+                    query()
+                best = min(best, (time.perf_counter() - t0) * 1e3)
+            results[name] = best
+    return results
+
+
+def main(argv: List[str]):
+    if len(argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    if argv[1] == "record":
+        n_samp = int(argv[6]) if len(argv) > 6 else 10
+        record(argv[2], int(argv[3]), int(argv[4]), int(argv[5]), n_samp)
+        return
+
+    args = [arg for arg in argv[2:] if arg != "--json"]
+    latency = float(args[0]) if args else 0.0
+    n = int(args[1]) if len(args) > 1 else 3
+    results = run(argv[1], latency, n)
+    if "--json" in argv:
+        print(json.dumps(results))
+        return
+
+    print(f"Best of {n}, with {latency * 1e3:.0f} ms latency per query:")
+    for name, ms in results.items():
+        print(f"  {name:20s} {ms:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,216 @@
+"""
+Reward-calc pipeline benchmark, on synthetic data (see synth_data).
+
+Times each stage of `dftool calc` at a given scale: saving and loading the
+volume and predictoor csvs, allocs_to_stakes, RewardCalculator.calculate,
+and calc_predictoor_rewards. No network: predictoor contracts come from
+the synthetic data.
+
+RewardCalculator holds dense [LP, nft] arrays, so it's timed on its own,
+smaller dataset (CALC_SIZES), not at full scale.
+
+Each run is appended to a history file (default: in DFPY_CACHE_DIR), with
+the git commit. Stages more than REGRESSION_FACTOR slower than the last
+run at the same scale are flagged.
+
+Usage: python -m df_py.benchmarks.bench_rewards [SCALE] [--json] [--history FILE]
+  SCALE -- one of SCALES (default: small)
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from unittest.mock import patch
+
+from df_py.benchmarks import synth_data
+from df_py.predictoor import csvs as predictoor_csvs
+from df_py.predictoor.calc_rewards import calc_predictoor_rewards
+from df_py.util import disk_cache
+from df_py.volume import csvs
+from df_py.volume.allocations import allocs_to_stakes
+from df_py.volume.reward_calculator import RewardCalculator
+
+# [scale] : (n_lps, n_nfts, n_predictoors, n_predictions)
+SCALES = {
+    "small": (10_000, 10_000, 100, 100_000),
+    "medium": (100_000, 100_000, 1_000, 1_000_000),
+    "large": (1_000_000, 1_000_000, 10_000, 10_000_000),
+}
+CALC_SIZES = {"small": (200, 200), "medium": (1_000, 500), "large": (2_000, 1_000)}
+REGRESSION_FACTOR = 1.2
+HISTORY_FILE = "bench_rewards_history.jsonl"
+
+
+def _timed(f: Callable, times: Dict[str, float], name: str):
+    """Call f, quietly, and store its wall time in times[name], in s"""
+    t0 = time.perf_counter()
+    with redirect_stdout(io.StringIO()):  # progress prints
+        result = f()
+    times[name] = time.perf_counter() - t0
+    return result
+
+
+def _save_volume_csvs(data: synth_data.VolumeData, csv_dir: str):
+    csvs.save_allocation_csv(data.allocs, csv_dir)
+    csvs.save_vebals_csv(data.vebals, data.locked_amts, data.unlock_times, csv_dir)
+    for chainID in synth_data.CHAINS:
+        csvs.save_nftvols_csv(data.nftvols[chainID], csv_dir, chainID)
+        csvs.save_owners_csv(data.owners[chainID], csv_dir, chainID)
+        csvs.save_symbols_csv(data.symbols[chainID], csv_dir, chainID)
+    for symbol, rate in data.rates.items():
+        csvs.save_rate_csv(symbol, rate, csv_dir)
+
+
+def _load_volume_csvs(csv_dir: str) -> tuple:
+    return (
+        csvs.load_allocation_csvs(csv_dir),
+        csvs.load_vebals_csv(csv_dir)[0],
+        csvs.load_nftvols_csvs(csv_dir),
+        csvs.load_owners_csvs(csv_dir),
+        csvs.load_symbols_csvs(csv_dir),
+        csvs.load_rate_csvs(csv_dir),
+    )
+
+
+def _calc_volume_rewards(data: synth_data.VolumeData):
+    stakes = allocs_to_stakes(data.allocs, data.vebals)
+    calculator = RewardCalculator(
+        stakes,
+        data.nftvols,
+        data.owners,
+        data.symbols,
+        data.rates,
+        df_week=60,
+        OCEAN_avail=10_000.0,
+        do_pubrewards=True,
+        do_rank=True,
+        predictoor_feed_addrs={},
+    )
+    return calculator.calculate(as_table=True)
+
+
+def run(scale: str) -> Dict[str, float]:
+    """@return -- dict of [stage] : wall time in s"""
+    n_lps, n_nfts, n_predictoors, n_predictions = SCALES[scale]
+    times: Dict[str, float] = {}
+
+    data = _timed(
+        lambda: synth_data.synth_volume_data(n_lps, n_nfts), times, "generate_volume"
+    )
+    predictoors = _timed(
+        lambda: synth_data.synth_predictoors(n_predictoors, n_predictions),
+        times,
+        "generate_predictoors",
+    )
+    calc_data = synth_data.synth_volume_data(*CALC_SIZES[scale])
+    contracts = {addr: None for addr in synth_data.addrs(8, 20)}
+
+    with tempfile.TemporaryDirectory() as csv_dir:
+        _timed(lambda: _save_volume_csvs(data, csv_dir), times, "volume_csv_save")
+        allocs, vebals, *_ = _timed(
+            lambda: _load_volume_csvs(csv_dir), times, "volume_csv_load"
+        )
+        _timed(lambda: allocs_to_stakes(allocs, vebals), times, "allocs_to_stakes")
+        _timed(lambda: _calc_volume_rewards(calc_data), times, "reward_calculator")
+
+        _timed(
+            lambda: predictoor_csvs.save_predictoor_data_csv(predictoors, csv_dir),
+            times,
+            "predictoor_csv_save",
+        )
+        predictoors = _timed(
+            lambda: predictoor_csvs.load_predictoor_data_csv(csv_dir),
+            times,
+            "predictoor_csv_load",
+        )
+
+    module = "df_py.predictoor.calc_rewards"
+    with patch(f"{module}.wait_to_latest_block"), patch(
+        f"{module}.query_predictoor_contracts", return_value=contracts
+    ):
+        _timed(
+            lambda: calc_predictoor_rewards(predictoors, 10_000.0, 23294),
+            times,
+            "predictoor_calc",
+        )
+    return times
+
+
+def _git_commit() -> Optional[str]:
+    out = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        capture_output=True,
+        text=True,
+        check=False,
+        cwd=os.path.dirname(__file__),
+    )
+    return out.stdout.strip() or None
+
+
+def load_history(filename: str) -> List[dict]:
+    if not os.path.exists(filename):
+        return []
+    with open(filename, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(filename: str, scale: str, times: Dict[str, float]):
+    entry = {
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "scale": scale,
+        "times_s": times,
+    }
+    with open(filename, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def main(argv: List[str]):
+    args = argv[1:]
+    history_file = disk_cache.cache_filename(HISTORY_FILE)
+    if "--history" in args:
+        i = args.index("--history")
+        history_file = args[i + 1]
+        del args[i : i + 2]
+    as_json = "--json" in args
+    args = [arg for arg in args if arg != "--json"]
+    scale = args[0] if args else "small"
+    if scale not in SCALES:
+        print(__doc__)
+        sys.exit(1)
+
+    prev = [e for e in load_history(history_file) if e["scale"] == scale]
+    prev_times = prev[-1]["times_s"] if prev else {}
+    times = run(scale)
+    append_history(history_file, scale, times)
+    if as_json:
+        print(json.dumps({"scale": scale, "times_s": times, "prev_s": prev_times}))
+        return
+
+    n_lps, n_nfts, n_predictoors, n_predictions = SCALES[scale]
+    print(
+        f"Scale {scale}: {n_lps} LPs, {n_nfts} NFTs, {n_predictoors} predictoors,"
+        f" {n_predictions} predictions. RewardCalculator: {CALC_SIZES[scale]}"
+    )
+    if prev:
+        print(f"vs last run, at {prev[-1]['commit']} ({prev[-1]['time']}):")
+    for name, s in times.items():
+        line = f"  {name:22s} {s:9.3f} s"
+        if name in prev_times:
+            ratio = s / prev_times[name]
+            line += f"  {ratio:5.2f}x"
+            if ratio > REGRESSION_FACTOR:
+                line += "  <- slower"
+        print(line)
+    print(f"History: {history_file}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,98 @@
+"""
+Startup time of dftool.
+
+Times light commands end to end, each in a fresh process, and uses
+`python -X importtime` to show which imports the time goes to. Light
+commands shouldn't import web3, scipy or pandas; the target is
+TARGET_MS per command.
+
+Usage: python -m df_py.benchmarks.bench_startup [N_RUNS] [--json]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+TARGET_MS = 200.0
+
+DFTOOL = os.path.join(os.path.dirname(__file__), "..", "..", "dftool")
+COMMANDS = [["help"], ["get_rate", "-h"]]  # light commands
+
+
+def time_command(args: List[str], n: int) -> float:
+    """@return -- best wall time of `dftool <args>` over n runs, in ms"""
+    best = float("inf")
+    for _ in range(n):
+        t0 = time.perf_counter()
+        subprocess.run(
+            [sys.executable, DFTOOL] + args, check=False, capture_output=True
+        )
+        best = min(best, (time.perf_counter() - t0) * 1e3)
+    return best
+
+
+def slowest_imports(module: str, n_top: int) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    @description
+      Import module in a fresh process, with -X importtime.
+
+    @return
+      total_ms -- cumulative import time of module
+      top -- list of (package, ms) of its n_top slowest top-level packages
+    """
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    # lines look like: "import time:  self [us] | cumulative | imported package"
+    cumulative: Dict[str, float] = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cum_us, name = line[len("import time:") :].split("|")
+        cumulative[name.strip()] = int(cum_us) / 1e3
+
+    total_ms = cumulative.get(module, 0.0)
+    top = sorted(
+        ((name, ms) for name, ms in cumulative.items() if "." not in name),
+        key=lambda item: -item[1],
+    )
+    return total_ms, top[:n_top]
+
+
+def run(n: int) -> dict:
+    total_ms, top = slowest_imports("df_py.util.dftool_module", 8)
+    return {
+        "import_dftool_module_ms": total_ms,
+        "slowest_imports_ms": dict(top),
+        "commands_ms": {" ".join(args): time_command(args, n) for args in COMMANDS},
+        "target_ms": TARGET_MS,
+    }
+
+
+def main(argv: List[str]):
+    n = int(argv[1]) if len(argv) > 1 and argv[1] != "--json" else 5
+    results = run(n)
+    if "--json" in argv:
+        print(json.dumps(results))
+        return
+
+    print(
+        f"import df_py.util.dftool_module: {results['import_dftool_module_ms']:.0f} ms"
+    )
+    print("  slowest top-level imports:")
+    for name, ms in results["slowest_imports_ms"].items():
+        print(f"    {name:24s} {ms:7.0f} ms")
+    print(f"dftool commands, best of {n} (target: {TARGET_MS:.0f} ms):")
+    for command, ms in results["commands_ms"].items():
+        flag = "" if ms <= TARGET_MS else "  <- over target"
+        print(f"  dftool {command:20s} {ms:7.0f} ms{flag}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
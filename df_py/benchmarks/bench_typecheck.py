@@ -0,0 +1,145 @@
+"""
+Overhead of runtime type checks (@enforce_types), per call and on the
+load/calc pipeline.
+
+Times with DFPY_ENFORCE_TYPES=1 (checks on, as in tests) and
+DFPY_ENFORCE_TYPES=0 (pass-through, as in dftool). The switch is read at
+import time, so each setting runs in its own subprocess.
+- per call: hot functions, N_CALLS times each
+- pipeline: load_*_csvs of the volume and predictoor csvs, and
+  RewardCalculator.calculate, on synthetic data (see synth_data)
+
+Usage: python -m df_py.benchmarks.bench_typecheck [N_CALLS]
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List
+
+# pipeline data: LPs & nfts in the csvs, predictions, and LPs & nfts in
+# RewardCalculator, which holds dense [LP, nft] arrays
+PIPELINE_CSV_SIZE = (10_000, 10_000)
+PIPELINE_N_PREDICTIONS = 100_000
+PIPELINE_CALC_SIZE = (200, 200)
+
+
+def _time_per_call(f: Callable[[int], object], n: int) -> float:
+    """@return -- wall time per call of f, in ns"""
+    t0 = time.perf_counter()
+    for i in range(n):
+        f(i)
+    return (time.perf_counter() - t0) / n * 1e9
+
+
+def run_here(n: int) -> dict:
+    """
+    @description
+      Time the hot functions and the pipeline, with the type-check setting
+      of this process.
+
+    @return
+      results -- dict with
+        "ns_per_call" -- dict of [label] : ns per call
+        "pipeline_s" -- dict of [stage] : wall time in s
+    """
+    return {"ns_per_call": _time_calls(n), "pipeline_s": _time_pipeline()}
+
+
+def _time_calls(n: int) -> Dict[str, float]:
+    """@return -- dict of [label] : ns per call"""
+    # pylint: disable=import-outside-toplevel
+    from df_py.predictoor.models import Prediction
+    from df_py.util import oceanutil
+    from df_py.util.csv_helpers import assert_is_eth_addr
+    from df_py.volume import cleancase
+
+    stakes = {1: {"0x1": {"0xa": 1.0, "0xb": 2.0}, "0x2": {"0xc": 3.0}}}
+    cases = {
+        "Prediction()": lambda i: Prediction(i, 1.0, 0.5, "0x1"),
+        "assert_is_eth_addr()": lambda i: assert_is_eth_addr("0x123"),
+        "cleancase.assert_stakes()": lambda i: cleancase.assert_stakes(stakes),
+        "cleancase.mod_stakes()": lambda i: cleancase.mod_stakes(stakes),
+        "oceanutil.calc_did()": lambda i: oceanutil.calc_did("0x" + "1" * 40, 137),
+    }
+    return {label: _time_per_call(f, n) for label, f in cases.items()}
+
+
+def _time_pipeline() -> Dict[str, float]:
+    """@return -- dict of [stage] : wall time in s"""
+    # pylint: disable=import-outside-toplevel
+    from df_py.benchmarks import synth_data
+    from df_py.benchmarks.bench_rewards import (
+        _calc_volume_rewards,
+        _load_volume_csvs,
+        _save_volume_csvs,
+    )
+    from df_py.predictoor import csvs as predictoor_csvs
+
+    data = synth_data.synth_volume_data(*PIPELINE_CSV_SIZE)
+    calc_data = synth_data.synth_volume_data(*PIPELINE_CALC_SIZE)
+    predictoors = synth_data.synth_predictoors(100, PIPELINE_N_PREDICTIONS)
+
+    times = {}
+    with tempfile.TemporaryDirectory() as csv_dir, redirect_stdout(io.StringIO()):
+        _save_volume_csvs(data, csv_dir)
+        predictoor_csvs.save_predictoor_data_csv(predictoors, csv_dir)
+
+        t0 = time.perf_counter()
+        _load_volume_csvs(csv_dir)
+        times["load volume csvs"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        predictoor_csvs.load_predictoor_data_csv(csv_dir)
+        times["load predictoor csvs"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        _calc_volume_rewards(calc_data)
+        times["RewardCalculator"] = time.perf_counter() - t0
+    return times
+
+
+def run(n: int) -> Dict[str, dict]:
+    """@return -- dict of [DFPY_ENFORCE_TYPES value] : run_here() result"""
+    results = {}
+    for flag in ["1", "0"]:
+        env = dict(os.environ, DFPY_ENFORCE_TYPES=flag)
+        cmd = [sys.executable, "-m", "df_py.benchmarks.bench_typecheck"]
+        cmd += ["--here", str(n)]
+        out = subprocess.run(cmd, env=env, check=True, capture_output=True, text=True)
+        results[flag] = json.loads(out.stdout)
+    return results
+
+
+def main(argv: List[str]):
+    if len(argv) > 1 and argv[1] == "--here":
+        print(json.dumps(run_here(int(argv[2]))))
+        return
+
+    n = int(argv[1]) if len(argv) > 1 else 100_000
+    print(f"Calling each function {n} times")
+    print(f"  {'':28s} {'checks on':>12s} {'checks off':>12s} {'saved':>12s}")
+    results = run(n)
+    for label, on in results["1"]["ns_per_call"].items():
+        off = results["0"]["ns_per_call"][label]
+        print(f"  {label:28s} {on:9.0f} ns {off:9.0f} ns {on - off:9.0f} ns")
+
+    n_lps, n_nfts = PIPELINE_CSV_SIZE
+    print(
+        f"Pipeline: csvs of {n_lps} LPs, {n_nfts} NFTs,"
+        f" {PIPELINE_N_PREDICTIONS} predictions. RewardCalculator:"
+        f" {PIPELINE_CALC_SIZE}"
+    )
+    print(f"  {'':28s} {'checks on':>12s} {'checks off':>12s} {'speedup':>12s}")
+    for stage, on in results["1"]["pipeline_s"].items():
+        off = results["0"]["pipeline_s"][stage]
+        print(f"  {stage:28s} {on:10.3f} s {off:10.3f} s {on / off:11.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,117 @@
+"""
+Synthetic, seeded reward-calc inputs at any scale: allocations, veOCEAN
+balances, nftvols, owners, symbols, rates, and predictoors.
+
+Shapes are roughly realistic: a few NFTs draw most allocations, balances
+and volumes are lognormal, most NFTs have no volume, and a bit over half
+of predictions are correct. Addresses are valid and distinct per kind.
+"""
+
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+from df_py.predictoor.models import Prediction, Predictoor
+from df_py.util.typecheck import enforce_types
+
+CHAINS = [1, 137]
+SYMBOLS = ["OCEAN", "H2O"]
+RATES = {"OCEAN": 0.5, "H2O": 1.6}
+ALLOCS_PER_LP = 3
+FRAC_NFTS_WITH_VOL = 0.2
+PREDICTION_ACCURACY = 0.55
+
+
+class VolumeData(NamedTuple):
+    allocs: Dict[int, Dict[str, Dict[str, float]]]  # [chainID][nft][LP] : perc
+    vebals: Dict[str, float]  # [LP] : veOCEAN
+    locked_amts: Dict[str, float]  # [LP] : OCEAN
+    unlock_times: Dict[str, int]  # [LP] : unix time
+    nftvols: Dict[int, Dict[str, Dict[str, float]]]  # [chainID][basetoken][nft]
+    owners: Dict[int, Dict[str, str]]  # [chainID][nft] : owner
+    symbols: Dict[int, Dict[str, str]]  # [chainID][basetoken] : symbol
+    rates: Dict[str, float]  # [symbol] : USD
+
+
+@enforce_types
+def addrs(kind: int, n: int) -> List[str]:
+    """Returns n distinct eth addresses. Different kinds never collide"""
+    return [f"0x{kind:02x}{i:038x}" for i in range(n)]
+
+
+@enforce_types
+def synth_volume_data(n_lps: int, n_nfts: int, seed: int = 0) -> VolumeData:
+    rng = np.random.default_rng(seed)
+    LP_addrs, nft_addrs = addrs(1, n_lps), addrs(2, n_nfts)
+    owner_addrs = addrs(3, max(n_nfts // 10, 1))
+    basetokens = {  # [chainID] : list of basetoken_addr, one per symbol
+        chainID: addrs(4 + chain_i, len(SYMBOLS))
+        for chain_i, chainID in enumerate(CHAINS)
+    }
+    nft_chains = rng.choice(CHAINS, n_nfts).tolist()
+
+    # each LP allocates part of its veOCEAN to a few NFTs, mostly popular ones
+    nft_i = (rng.pareto(1.0, (n_lps, ALLOCS_PER_LP)) * 10).astype(int) % n_nfts
+    percs = rng.dirichlet(np.ones(ALLOCS_PER_LP), n_lps)
+    percs *= rng.uniform(0.5, 1.0, (n_lps, 1))
+    allocs: Dict[int, Dict[str, Dict[str, float]]] = {c: {} for c in CHAINS}
+    for LP_addr, row_i, row_percs in zip(LP_addrs, nft_i.tolist(), percs.tolist()):
+        for i, perc in zip(row_i, row_percs):
+            allocs[nft_chains[i]].setdefault(nft_addrs[i], {})[LP_addr] = perc
+
+    bals = rng.lognormal(7.0, 2.0, n_lps)
+    unlock_times = rng.integers(1_700_000_000, 1_800_000_000, n_lps)
+    vebals = dict(zip(LP_addrs, bals.tolist()))
+    locked_amts = dict(zip(LP_addrs, (bals * 2).tolist()))
+
+    nftvols: Dict[int, Dict[str, Dict[str, float]]] = {
+        chainID: {addr: {} for addr in basetokens[chainID]} for chainID in CHAINS
+    }
+    n_with_vol = max(int(n_nfts * FRAC_NFTS_WITH_VOL), 1)
+    vol_nfts = rng.choice(n_nfts, n_with_vol, replace=False).tolist()
+    symbol_is = rng.integers(0, len(SYMBOLS), n_with_vol).tolist()
+    vols = rng.lognormal(3.0, 2.0, n_with_vol).tolist()
+    for i, symbol_i, vol in zip(vol_nfts, symbol_is, vols):
+        chainID = nft_chains[i]
+        nftvols[chainID][basetokens[chainID][symbol_i]][nft_addrs[i]] = vol
+
+    owners: Dict[int, Dict[str, str]] = {c: {} for c in CHAINS}
+    owner_is = rng.integers(0, len(owner_addrs), n_nfts).tolist()
+    for nft_addr, chainID, owner_i in zip(nft_addrs, nft_chains, owner_is):
+        owners[chainID][nft_addr] = owner_addrs[owner_i]
+
+    return VolumeData(
+        allocs,
+        vebals,
+        locked_amts,
+        dict(zip(LP_addrs, unlock_times.tolist())),
+        nftvols,
+        owners,
+        {c: dict(zip(basetokens[c], SYMBOLS)) for c in CHAINS},
+        dict(RATES),
+    )
+
+
+@enforce_types
+def synth_predictoors(
+    n_predictoors: int, n_predictions: int, n_contracts: int = 20, seed: int = 0
+) -> Dict[str, Predictoor]:
+    """Returns dict of [predictoor_addr] : Predictoor, with n_predictions total"""
+    rng = np.random.default_rng(seed)
+    predictoor_addrs, contract_addrs = addrs(7, n_predictoors), addrs(8, n_contracts)
+    predictoors = {addr: Predictoor(addr) for addr in predictoor_addrs}
+
+    stakes = rng.uniform(1.0, 10.0, n_predictions)
+    payouts = np.where(
+        rng.random(n_predictions) < PREDICTION_ACCURACY, stakes * 1.8, 0.0
+    )
+    for predictoor_i, slot, payout, stake, contract_i in zip(
+        rng.integers(0, n_predictoors, n_predictions).tolist(),
+        rng.integers(1, 100_000, n_predictions).tolist(),
+        payouts.tolist(),
+        stakes.tolist(),
+        rng.integers(0, n_contracts, n_predictions).tolist(),
+    ):
+        prediction = Prediction(slot, payout, stake, contract_addrs[contract_i])
+        predictoors[predictoor_addrs[predictoor_i]].add_prediction(prediction)
+    return predictoors
@@ -13,6 +13,12 @@ def pytest_sessionstart():
     )
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    # so tests neither read nor write the developer's cache, eg daily prices
+    monkeypatch.setenv("DFPY_CACHE_DIR", str(tmp_path / "cache"))
+
+
 @pytest.fixture
 def w3():
     web3 = networkutil.chain_id_to_web3(8996)
@@ -1,10 +1,9 @@
 from typing import Dict, Union
 
-from enforce_typing import enforce_types
-
 from df_py.predictoor.models import Predictoor
 from df_py.predictoor.queries import query_predictoor_contracts
 from df_py.util.graphutil import wait_to_latest_block
+from df_py.util.typecheck import enforce_types
 
 
 @enforce_types
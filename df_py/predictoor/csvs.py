@@ -1,12 +1,25 @@
 import csv
 import os
 import random
-from typing import Dict
-
-from enforce_typing import enforce_types
+from typing import Dict, Set
 
 from df_py.predictoor.models import PredictContract, Prediction, Predictoor
-from df_py.util.csv_helpers import assert_is_eth_addr
+from df_py.util import tables
+from df_py.util.csv_helpers import assert_is_eth_addr, lowercase_eth_addrs
+from df_py.util.typecheck import enforce_types
+
+PREDICTOOR_DATA_SCHEMA = {
+    "predictoor_addr": str,
+    "slot": int,
+    "payout": float,
+    "stake": float,
+    "contract_addr": str,
+}
+PREDICTOOR_REWARDS_SCHEMA = {
+    "predictoor_addr": str,
+    "contract_addr": str,
+    "ROSE_amt": float,
+}
 
 
 # ------------------------------- PREDICTOOR DATA -------------------------------
@@ -23,7 +36,7 @@ def sample_predictoor_data_csv(num_rows=50000):
     def random_contract_address():
         return f"0xContract{random.randint(1, 3)}"
 
-    result = "predictoor_addr,slot,payout,stake,contract_addr\n"
+    lines = ["predictoor_addr,slot,payout,stake,contract_addr\n"]
 
     for _ in range(num_rows):
         predictor_address = random_predictor_address()
@@ -31,9 +44,11 @@ def sample_predictoor_data_csv(num_rows=50000):
         payout = random_payout()
         stake = 1 if payout == 0 else 0.5
         contract_address = random_contract_address()
-        result += f"{predictor_address},{slot},{payout},{stake},{contract_address}\n"
+        lines.append(
+            f"{predictor_address},{slot},{payout},{stake},{contract_address}\n"
+        )
 
-    return result
+    return "".join(lines)
 
 
 @enforce_types
@@ -43,49 +58,43 @@ def save_predictoor_data_csv(
 ):
     assert os.path.exists(csv_dir), csv_dir
     csv_file = predictoor_data_csv_filename(csv_dir)
-    assert not os.path.exists(csv_file), csv_file
-
-    fieldnames = ["predictoor_addr", "slot", "payout", "stake", "contract_addr"]
-    with open(csv_file, mode="w", newline="") as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-        writer.writeheader()
-        for predictoor in predictoor_data.values():
-            assert_is_eth_addr(predictoor.address)
-            for prediction in predictoor._predictions:
-                writer.writerow(
-                    {
-                        "predictoor_addr": predictoor.address,
-                        "contract_addr": prediction.contract_addr,
-                        "slot": prediction.slot,
-                        "payout": prediction.payout,
-                        "stake": prediction.stake,
-                    }
-                )
 
-    print(f"Created {csv_file}")
+    rows = []
+    for predictoor in predictoor_data.values():
+        assert_is_eth_addr(predictoor.address)
+        for prediction in predictoor._predictions:
+            rows.append(
+                [
+                    predictoor.address,
+                    prediction.slot,
+                    prediction.payout,
+                    prediction.stake,
+                    prediction.contract_addr,
+                ]
+            )
+    tables.save_table(csv_file, PREDICTOOR_DATA_SCHEMA, rows)
 
 
 @enforce_types
 def load_predictoor_data_csv(csv_dir: str) -> Dict[str, Predictoor]:
     csv_file = predictoor_data_csv_filename(csv_dir)
+    cols = tables.load_table(csv_file, PREDICTOOR_DATA_SCHEMA)
 
     predictoors = {}
-    with open(csv_file, mode="r") as file:
-        csv_reader = csv.DictReader(file)
-        for row in csv_reader:
-            address = row["predictoor_addr"]
-            contract_addr = row["contract_addr"]
-            slot = int(row["slot"])
-            payout = float(row["payout"])
-            stake = float(row["stake"])
-            prediction = Prediction(slot, payout, stake, contract_addr)
+    for address, slot, payout, stake, contract_addr in zip(
+        cols["predictoor_addr"].tolist(),
+        cols["slot"].tolist(),
+        cols["payout"].tolist(),
+        cols["stake"].tolist(),
+        cols["contract_addr"].tolist(),
+    ):
+        prediction = Prediction(slot, payout, stake, contract_addr)
 
-            if address not in predictoors:
-                predictoors[address] = Predictoor(address)
+        if address not in predictoors:
+            predictoors[address] = Predictoor(address)
 
-            predictoors[address].add_prediction(prediction)
+        predictoors[address].add_prediction(prediction)
 
-    print(f"Loaded {csv_file}")
     return predictoors
 
 
@@ -170,21 +179,14 @@ def save_predictoor_rewards_csv(
 ):
     assert os.path.exists(csv_dir), csv_dir
     csv_file = predictoor_rewards_csv_filename(csv_dir)
-    assert not os.path.exists(csv_file), csv_file
-
-    with open(csv_file, "w") as f:
-        writer = csv.writer(f)
-        row = ["predictoor_addr", "contract_addr", "ROSE_amt"]
-        writer.writerow(row)
-
-        for contract_addr, contracts in predictoor_rewards.items():
-            assert_is_eth_addr(contract_addr)
-            for predictoor_addr, reward in contracts.items():
-                assert_is_eth_addr(predictoor_addr)
-                row = [predictoor_addr.lower(), contract_addr.lower(), str(reward)]
-                writer.writerow(row)
 
-    print(f"Created {csv_file}")
+    rows = []
+    for contract_addr, contracts in predictoor_rewards.items():
+        assert_is_eth_addr(contract_addr)
+        for predictoor_addr, reward in contracts.items():
+            assert_is_eth_addr(predictoor_addr)
+            rows.append([predictoor_addr.lower(), contract_addr.lower(), reward])
+    tables.save_table(csv_file, PREDICTOOR_REWARDS_SCHEMA, rows)
 
 
 @enforce_types
@@ -203,27 +205,18 @@ def load_predictoor_rewards_csv(csv_dir: str) -> Dict[str, Dict[str, float]]:
     - AssertionError: If the CSV file structure doesn't match the expected structure.
     """
     csv_file = predictoor_rewards_csv_filename(csv_dir)
-    predictoor_rewards: Dict[str, Dict[str, float]] = {}
+    cols = tables.load_table(csv_file, PREDICTOOR_REWARDS_SCHEMA)
+    predictoor_addrs = lowercase_eth_addrs(cols["predictoor_addr"])
+    contract_addrs = lowercase_eth_addrs(cols["contract_addr"])
 
-    with open(csv_file, "r") as f:
-        reader = csv.reader(f)
-
-        for row_i, row in enumerate(reader):
-            if row_i == 0:
-                assert row == ["predictoor_addr", "contract_addr", "ROSE_amt"]
-                continue
-            predictoor_addr, contract_addr, reward_s = row
-            predictoor_addr = predictoor_addr.lower()
-            contract_addr = contract_addr.lower()
-            reward = float(reward_s)
-            assert_is_eth_addr(predictoor_addr)
-            assert_is_eth_addr(contract_addr)
-
-            if not contract_addr in predictoor_rewards:
-                predictoor_rewards[contract_addr] = {}
-            predictoor_rewards[contract_addr][predictoor_addr] = reward
+    predictoor_rewards: Dict[str, Dict[str, float]] = {}
+    for predictoor_addr, contract_addr, reward in zip(
+        predictoor_addrs, contract_addrs, cols["ROSE_amt"].tolist()
+    ):
+        if not contract_addr in predictoor_rewards:
+            predictoor_rewards[contract_addr] = {}
+        predictoor_rewards[contract_addr][predictoor_addr] = reward
 
-    print(f"Loaded {csv_file}")
     return predictoor_rewards
 
 
@@ -281,6 +274,22 @@ def load_predictoor_contracts_csv(csv_dir: str) -> Dict[str, PredictContract]:
     return contracts
 
 
+@enforce_types
+def load_predictoor_feed_addrs(csv_dir: str) -> Dict[int, Set[str]]:
+    """
+    @description
+      Load the nft addrs of predictoor feeds, from predictoor_contracts.csv.
+      It's the offline alternative to querying the feeds each calc.
+
+    @return
+      feed_addrs -- dict of [chainID] : set of nft_addr
+    """
+    feed_addrs: Dict[int, Set[str]] = {}
+    for contract in load_predictoor_contracts_csv(csv_dir).values():
+        feed_addrs.setdefault(contract.chainid, set()).add(contract.address)
+    return feed_addrs
+
+
 def predictoor_contracts_csv_filename(csv_dir):
     f = "predictoor_contracts.csv"
     return os.path.join(csv_dir, f)
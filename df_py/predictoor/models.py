@@ -1,9 +1,13 @@
-from typing import Dict, List
+import copy
+from typing import Dict, List, Optional
 
-from enforce_typing import enforce_types
+from df_py.util.typecheck import enforce_types
 
 
 class Prediction:
+    # created once per prediction, so keep instances small
+    __slots__ = ("slot", "payout", "stake", "contract_addr")
+
     @enforce_types
     def __init__(self, slot: int, payout: float, stake: float, contract_addr: str):
         self.slot = slot
@@ -123,6 +127,7 @@ class Predictoor(PredictoorBase):
     def __init__(self, address: str):
         super().__init__(address, 0, 0, 0, 0)
         self._predictions: List[Prediction] = []
+        self._prediction_summaries: Optional[Dict[str, PredictionSummary]] = None
 
     def get_prediction_summary(self, contract_addr: str) -> PredictionSummary:
         """
@@ -132,31 +137,12 @@ class Predictoor(PredictoorBase):
 
         @return:
             PredictionSummary - The prediction summary for the specified contract address.
+            A copy: changing it doesn't change the cached summary.
         """
-        prediction_count = 0
-        correct_prediction_count = 0
-        total_stake = 0.0
-        total_payout = 0.0
-        total_revenue = 0.0
-
-        for prediction in self._predictions:
-            if prediction.contract_addr != contract_addr:
-                continue
-            prediction_count += 1
-            total_revenue += prediction.revenue
-            total_stake += prediction.stake
-            if prediction.is_correct:
-                correct_prediction_count += 1
-                total_payout += prediction.payout
-
-        return PredictionSummary(
-            prediction_count,
-            correct_prediction_count,
-            contract_addr,
-            total_payout,
-            total_revenue,
-            total_stake,
-        )
+        summaries = self._get_prediction_summaries()
+        if contract_addr in summaries:
+            return copy.copy(summaries[contract_addr])
+        return PredictionSummary(0, 0, contract_addr, 0.0, 0.0, 0.0)
 
     @property
     def prediction_summaries(self) -> Dict[str, PredictionSummary]:
@@ -165,17 +151,40 @@ class Predictoor(PredictoorBase):
 
         @return
             Dict[str, PredictionSummary] - A dict of PredictionSummary objects.
+            Copies: changing them doesn't change the cached summaries.
+        """
+        return {
+            contract_addr: copy.copy(summary)
+            for contract_addr, summary in self._get_prediction_summaries().items()
+        }
+
+    def _get_prediction_summaries(self) -> Dict[str, PredictionSummary]:
         """
-        prediction_summaries = {}
+        Compute the per-contract summaries in a single pass over all
+        predictions. The result is cached until the next add_prediction().
+
+        @return
+            Dict[str, PredictionSummary] - [contract_addr] : PredictionSummary
+        """
+        if self._prediction_summaries is not None:
+            return self._prediction_summaries
+
+        summaries: Dict[str, PredictionSummary] = {}
         for prediction in self._predictions:
             contract_addr = prediction.contract_addr
-            if contract_addr in prediction_summaries:
-                continue
-            prediction_summaries[contract_addr] = self.get_prediction_summary(
-                contract_addr
-            )
+            summary = summaries.get(contract_addr)
+            if summary is None:
+                summary = PredictionSummary(0, 0, contract_addr, 0.0, 0.0, 0.0)
+                summaries[contract_addr] = summary
+            summary.prediction_count += 1
+            summary.total_revenue += prediction.revenue
+            summary.total_stake += prediction.stake
+            if prediction.is_correct:
+                summary.correct_prediction_count += 1
+                summary.total_payout += prediction.payout
 
-        return prediction_summaries
+        self._prediction_summaries = summaries
+        return summaries
 
     @property
     def accuracy(self) -> float:
@@ -192,6 +201,7 @@ class Predictoor(PredictoorBase):
     @enforce_types
     def add_prediction(self, prediction: Prediction):
         self._predictions.append(prediction)
+        self._prediction_summaries = None
         self._prediction_count += 1
         if prediction.is_correct:
             self._correct_prediction_count += 1
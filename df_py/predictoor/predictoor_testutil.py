@@ -1,7 +1,7 @@
 import random
 from typing import List
 
-from enforce_typing import enforce_types
+from df_py.util.typecheck import enforce_types
 
 
 @enforce_types
@@ -1,12 +1,12 @@
 from typing import Dict, Optional
 
-from enforce_typing import enforce_types
 from web3 import Web3
 
 from df_py.predictoor.models import PredictContract, Prediction, Predictoor
 from df_py.util.constants import DEPLOYER_ADDRS
 from df_py.util.graphutil import submit_query
 from df_py.util.networkutil import DEV_CHAINID
+from df_py.util.typecheck import enforce_types
 
 
 @enforce_types
@@ -109,3 +109,17 @@ def test_predictoor_contracts(tmp_path):
     for addr, original_contract in predictoor_contracts.items():
         loaded_contract = loaded_predictoor_contracts[addr]
         assert loaded_contract.to_dict() == original_contract.to_dict()
+
+
+@enforce_types
+def test_predictoor_feed_addrs(tmp_path):
+    predictoor_contracts = {}
+    for chainid, address in [(1, "0xA1"), (1, "0xa2"), (137, "0xb1")]:
+        contract = PredictContract(chainid, address, "name", "SYM", 100, 10)
+        predictoor_contracts[contract.address] = contract
+
+    csv_dir = str(tmp_path)
+    csvs.save_predictoor_contracts_csv(predictoor_contracts, csv_dir)
+
+    feed_addrs = csvs.load_predictoor_feed_addrs(csv_dir)
+    assert feed_addrs == {1: {"0xa1", "0xa2"}, 137: {"0xb1"}}
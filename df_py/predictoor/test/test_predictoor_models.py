@@ -49,6 +49,44 @@ def test_predictoor_summary():
     assert summary.total_stake == 12.0  # 1 + 1 + 10
 
 
+def test_predictoor_summaries_multiple_contracts():
+    predictoor = Predictoor("0x1")
+    predictoor.add_prediction(Prediction(123, 10.0, 1.0, "0xa"))
+    predictoor.add_prediction(Prediction(124, 0.0, 2.0, "0xb"))
+    predictoor.add_prediction(Prediction(125, 3.0, 1.0, "0xa"))
+
+    summaries = predictoor.prediction_summaries
+    assert sorted(summaries.keys()) == ["0xa", "0xb"]
+    assert summaries["0xa"].prediction_count == 2
+    assert summaries["0xa"].total_payout == 13.0
+    assert summaries["0xb"].correct_prediction_count == 0
+    assert summaries["0xb"].total_revenue == -2.0
+
+    # unseen contract gives an empty summary
+    summary = predictoor.get_prediction_summary("0xc")
+    assert summary.prediction_count == 0
+    assert summary.contract_addr == "0xc"
+    assert summary.accuracy == 0
+
+    # cached summaries are invalidated by add_prediction
+    predictoor.add_prediction(Prediction(126, 0.0, 1.0, "0xc"))
+    assert predictoor.get_prediction_summary("0xc").prediction_count == 1
+    assert predictoor.prediction_summaries["0xa"].prediction_count == 2
+
+
+def test_predictoor_summaries_are_copies():
+    predictoor = Predictoor("0x1")
+    predictoor.add_prediction(Prediction(123, 10.0, 1.0, "0xa"))
+
+    summary = predictoor.get_prediction_summary("0xa")
+    summary.total_payout += 100.0
+    predictoor.prediction_summaries["0xa"].prediction_count += 1
+
+    summary = predictoor.get_prediction_summary("0xa")
+    assert summary.total_payout == 10.0
+    assert summary.prediction_count == 1
+
+
 def test_prediction_from_query_result():
     prediction_dict = {
         "slot": {
@@ -0,0 +1,215 @@
+"""
+Recompute past DF weeks, in parallel. It's what `dftool backfill` runs.
+
+Each week does the steps of scripts/gen_hist_data.sh, into its own csv dir
+<CSV_DIR>/<week>. Weeks run in a pool of processes. The workers share the
+on-disk caches in DFPY_CACHE_DIR (asset names, purgatory list). Each
+worker sends back the metrics it counted (see instrument), for the report.
+
+It's resumable. A step is skipped if all of its output tables exist, and a
+week is skipped if it already has its rewards. So after an interruption,
+re-running the same command picks up where it stopped.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from df_py.util import blockrange, get_rate, instrument, networkutil, steps, tables
+from df_py.util.blocktime import get_st_fin_blocks
+from df_py.util.oceanutil import record_deployed_contracts
+from df_py.util.retry import retry_function
+from df_py.util.typecheck import enforce_types
+from df_py.volume import csvs, queries
+from df_py.volume.calc_rewards import calc_volume_rewards_from_csvs
+
+FIRST_WEEK = 5
+FIRST_WEEK_START = datetime(2022, 9, 29)  # start of DF5
+
+TOKEN_SYMBOLS = ["OCEAN", "ETH", "BNB", "EWT", "MOVR", "MATIC", "USDC"]
+CHAINIDS = [1, 137]
+VE_CHAINID = 1  # chain of vebals and allocations
+
+
+@enforce_types
+def week_dates(df_week: int) -> Tuple[str, str]:
+    """Returns (start date, end date) of DF week, as "YYYY-MM-DD" strs"""
+    if df_week < FIRST_WEEK:
+        raise ValueError(f"DF week must be >= {FIRST_WEEK}, got {df_week}")
+    st = FIRST_WEEK_START + timedelta(weeks=df_week - FIRST_WEEK)
+    fin = st + timedelta(weeks=1)
+    return st.strftime("%Y-%m-%d"), fin.strftime("%Y-%m-%d")
+
+
+@enforce_types
+def week_reward_amount(df_week: int) -> float:
+    """Returns the OCEAN given out in DF week"""
+    return 5000.0 if df_week < 9 else 25000.0
+
+
+@enforce_types
+def week_csv_dir(csv_dir: str, df_week: int) -> str:
+    return os.path.join(csv_dir, str(df_week))
+
+
+@enforce_types
+def backfill(
+    start_week: int,
+    end_week: int,
+    csv_dir: str,
+    n_samp: int,
+    secret_seed: int,
+    address_file: str,
+    chain_ids: List[int],
+    n_workers: int,
+    retries: int = 1,
+) -> Dict[int, str]:
+    """
+    @description
+      Recompute DF weeks start_week .. end_week (inclusive), in parallel.
+      A failed week doesn't stop the others.
+
+    @arguments
+      n_workers -- # processes. If 1, run in this process
+
+    @return
+      status -- dict of [df_week] : "done", "skipped" or "failed: <error>"
+    """
+    weeks = list(range(start_week, end_week + 1))
+    args = (csv_dir, n_samp, secret_seed, address_file, chain_ids, retries)
+    status = {}
+
+    # one bulk fetch of prices, so that the weeks find them in the store
+    todo = [
+        df_week
+        for df_week in weeks
+        if df_week >= FIRST_WEEK
+        and not tables.table_exists(
+            csvs.volume_rewards_csv_filename(week_csv_dir(csv_dir, df_week))
+        )
+    ]
+    if todo:
+        st, fin = week_dates(todo[0])[0], week_dates(todo[-1])[1]
+        get_rate.fill_price_store(TOKEN_SYMBOLS, st, fin)
+
+    if n_workers == 1:
+        for df_week in weeks:
+            status[df_week] = _try_backfill_week(df_week, *args)
+        return status
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = {
+            executor.submit(_backfill_week_in_worker, df_week, *args): df_week
+            for df_week in weeks
+        }
+        for future in as_completed(futures):
+            df_week = futures[future]
+            status[df_week], metrics = future.result()
+            instrument.merge(metrics)
+            print(f"DF week {df_week}: {status[df_week]}")
+
+    return dict(sorted(status.items()))
+
+
+def _backfill_week_in_worker(df_week: int, *args) -> Tuple[str, List[dict]]:
+    """Returns (status, metrics counted for this week), to the parent process"""
+    instrument.reset()  # a worker starts with, or kept, counts of others
+    status = _try_backfill_week(df_week, *args)
+    return status, instrument.metrics()
+
+
+def _try_backfill_week(df_week: int, *args) -> str:
+    try:
+        return backfill_week(df_week, *args)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return f"failed: {e!r}"
+
+
+@enforce_types
+def backfill_week(
+    df_week: int,
+    csv_dir: str,
+    n_samp: int,
+    secret_seed: int,
+    address_file: str,
+    chain_ids: List[int],
+    retries: int = 1,
+) -> str:
+    """
+    @description
+      Recompute one DF week into <csv_dir>/<df_week>: rates, then volumes,
+      vebals, allocations and nftinfo, then volume rewards.
+
+    @return
+      status -- "done" or "skipped"
+    """
+    week_dir = week_csv_dir(csv_dir, df_week)
+    if tables.table_exists(csvs.volume_rewards_csv_filename(week_dir)):
+        return "skipped"
+    os.makedirs(week_dir, exist_ok=True)
+    st, fin = week_dates(df_week)
+
+    for token_symbol in TOKEN_SYMBOLS:
+        steps.run_step(
+            [csvs.rate_csv_filename(token_symbol, week_dir)],
+            steps.save_rate,
+            token_symbol,
+            st,
+            fin,
+            week_dir,
+            retries,
+        )
+    steps.run_step(
+        [csvs.rate_csv_filename("MOCEAN", week_dir)],
+        steps.copy_table,
+        csvs.rate_csv_filename("OCEAN", week_dir),
+        csvs.rate_csv_filename("MOCEAN", week_dir),
+    )
+
+    for chain_id in chain_ids:
+        web3 = networkutil.chain_id_to_web3(chain_id)
+        record_deployed_contracts(address_file, chain_id)
+
+        # look up the blocks once per chain, rather than once per step
+        st_block, fin_block = get_st_fin_blocks(web3, st, fin)
+        rng = blockrange.create_range(web3, st_block, fin_block, n_samp, secret_seed)
+
+        steps.run_step(
+            [
+                csvs.nftvols_csv_filename(week_dir, chain_id),
+                csvs.owners_csv_filename(week_dir, chain_id),
+                csvs.symbols_csv_filename(week_dir, chain_id),
+            ],
+            steps.save_volsym,
+            rng,
+            week_dir,
+            chain_id,
+            retries,
+        )
+        if chain_id == VE_CHAINID:
+            steps.run_step(
+                [csvs.vebals_csv_filename(week_dir)],
+                steps.save_vebals,
+                rng,
+                week_dir,
+                chain_id,
+                retries,
+            )
+            steps.run_step(
+                [csvs.allocation_csv_filename(week_dir)],
+                steps.save_allocations,
+                rng,
+                week_dir,
+                chain_id,
+                retries,
+            )
+
+        # nftinfo is only for the frontend, and is plain csv
+        if not os.path.exists(csvs.nftinfo_csv_filename(week_dir, chain_id)):
+            nftinfo = retry_function(queries.queryNftinfo, 3, 10, chain_id, fin_block)
+            csvs.save_nftinfo_csv(nftinfo, week_dir, chain_id)
+
+    st_date = datetime.strptime(st, "%Y-%m-%d")
+    calc_volume_rewards_from_csvs(week_dir, st_date, week_reward_amount(df_week))
+    return "done"
@@ -1,4 +1,4 @@
-from enforce_typing import enforce_types
+from df_py.util.typecheck import enforce_types
 
 
 @enforce_types
@@ -1,7 +1,7 @@
 import numpy
-from enforce_typing import enforce_types
 
 from df_py.util.blocktime import get_st_fin_blocks
+from df_py.util.typecheck import enforce_types
 
 
 @enforce_types
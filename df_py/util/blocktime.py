@@ -2,9 +2,7 @@ from datetime import datetime, timedelta, timezone
 from math import ceil
 from typing import Union
 
-from enforce_typing import enforce_types
-from scipy import optimize
-from web3.main import Web3
+from df_py.util.typecheck import enforce_types
 
 
 @enforce_types
@@ -129,7 +127,11 @@ def timestamp_to_block(web3, timestamp: Union[float, int]) -> int:
     if f(a) < 0 and f(b) < 0:  # corner case: everything's in the future
         return web3.eth.get_block("latest").number
 
-    # pylint: disable=unused-variable
+    # scipy is imported here, not at the top: it's slow to import, and most
+    # users of this module only want timestr_to_timestamp
+    # pylint: disable=unused-variable, import-outside-toplevel
+    from scipy import optimize
+
     (block_i, results) = optimize.bisect(f, a, b, xtol=0.4, full_output=True)
 
     # uncomment to debug
@@ -174,7 +176,7 @@ def eth_calc_block_number(ts: int, block: int, target_ts: int, web3):
 
 @enforce_types
 def eth_find_closest_block(
-    web3: Web3, block_number: int, timestamp: Union[float, int]
+    web3, block_number: int, timestamp: Union[float, int]
 ) -> int:
     """
     @arguments
@@ -4,6 +4,7 @@ from typing import Dict, List
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
 
 AQUARIUS_BASE_URL = "https://v4.aquarius.oceanprotocol.com"
+AQUARIUS_NAMES_TTL = 86400  # re-fetch cached asset names this old or more (s)
 
 MAX_ALLOCATE = 10000.0
 ACTIVE_REWARDS_MULTIPLIER = 0.5
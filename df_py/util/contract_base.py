@@ -7,10 +7,10 @@
 import logging
 from typing import Optional
 
-from enforce_typing import enforce_types
 from web3.main import Web3
 
 from df_py.util.contract_utils import deploy_contract, load_contract
+from df_py.util.typecheck import enforce_types
 
 logger = logging.getLogger(__name__)
 
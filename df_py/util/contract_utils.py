@@ -8,12 +8,12 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 
 import solcx
-from enforce_typing import enforce_types
 from solcx import compile_source
 from web3.contract import Contract
 from web3.main import Web3
 
 import artifacts
+from df_py.util.typecheck import enforce_types
 
 GANACHE_URL = "http://127.0.0.1:8545"
 
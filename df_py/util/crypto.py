@@ -4,10 +4,11 @@
 #
 from ecies import decrypt as asymmetric_decrypt
 from ecies import encrypt as asymmetric_encrypt
-from enforce_typing import enforce_types
 from eth_keys import keys
 from eth_utils import decode_hex
 
+from df_py.util.typecheck import enforce_types
+
 
 @enforce_types
 def calc_pubkey(privkey: str) -> str:
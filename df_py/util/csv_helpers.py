@@ -1,6 +1,9 @@
 import re
+from typing import List
 
-from enforce_typing import enforce_types
+import numpy as np
+
+from df_py.util.typecheck import enforce_types
 
 
 @enforce_types
@@ -9,6 +12,15 @@ def assert_is_eth_addr(s: str):
     assert s[:2] == "0x", s
 
 
+@enforce_types
+def lowercase_eth_addrs(addrs: np.ndarray) -> List[str]:
+    """Lowercase a column of addresses, and check that each is an eth addr"""
+    lowered = np.char.lower(addrs.astype(str))
+    ok = np.char.startswith(lowered, "0x")
+    assert ok.all(), lowered[~ok][0]
+    return lowered.tolist()
+
+
 @enforce_types
 def _last_int(s: str) -> int:
     """Return the last integer in the given str"""
@@ -5,9 +5,8 @@ import os
 import sys
 from typing import Optional
 
-from enforce_typing import enforce_types
-
 from df_py.util.networkutil import DEV_CHAINID, chain_id_to_rpc_url
+from df_py.util.typecheck import enforce_types
 
 CHAINID_EXAMPLES = (
     f"{DEV_CHAINID} for development, 1 for (eth) mainnet, 137 for polygon"
@@ -20,15 +19,17 @@ Usage: dftool get_rate|volsym|allocations.. ARG1 ARG2 ..
 
   dftool help - full command list
 
-  dftool get_rate TOKEN_SYMBOL ST FIN CSV_DIR --RETRIES
+  dftool get_rate TOKEN_SYMBOL[,..] ST FIN CSV_DIR --RETRIES
   dftool volsym ST FIN NSAMP CSV_DIR CHAINID --RETRIES - query chain, output volumes, symbols, owners
   dftool allocations ST FIN NSAMP CSV_DIR CHAINID --RETRIES
   dftool vebals ST FIN NSAMP CSV_DIR CHAINID --RETRIES
   dftool predictoor_data START_DATE END_DATE CSV_DIR CHAINID --RETRIES
   dftool calc volume|predictoor CSV_DIR TOT_OCEAN START_DATE - from stakes/etc csvs (or predictoor/volume data csvs), output rewards
-  dftool dispense_active CSV_DIR CHAINID --DFREWARDS_ADDR --TOKEN_ADDR --BATCH_NBR - from rewards, dispense funds
+  dftool dispense_active CSV_DIR CHAINID --DFREWARDS_ADDR --TOKEN_ADDR --BATCH_NBR --PIPELINED --GAS_FRACTION - from rewards, dispense funds
   dftool dispense_passive CHAINID AMOUNT
   dftool nftinfo CSV_DIR CHAINID -- Query chain, output nft info csv
+  dftool backfill START_WEEK END_WEEK CSV_DIR --NSAMP --CHAINIDS --WORKERS --RETRIES - recompute past DF weeks in parallel
+  dftool weekly ST CSV_DIR --TOT_OCEAN --NSAMP --TOKENS --CHAINIDS --WORKERS --RETRIES - run the weekly data pipeline in one process
 
   dftool new_acct - generate new account
   dftool init_dev_wallets CHAINID - Init wallets with OCEAN. (GANACHE ONLY)
@@ -1,30 +1,11 @@
-# pylint: disable=too-many-lines,too-many-statements
+# pylint: disable=too-many-lines,too-many-statements,import-outside-toplevel
 import argparse
 import os
 import sys
+import time
 
-from enforce_typing import enforce_types
-from eth_account import Account
-from web3.main import Web3
-
-from df_py.predictoor.csvs import (
-    predictoor_data_csv_filename,
-    load_predictoor_data_csv,
-    load_predictoor_rewards_csv,
-    save_predictoor_contracts_csv,
-    save_predictoor_data_csv,
-    save_predictoor_summary_csv,
-    save_predictoor_rewards_csv,
-)
-from df_py.predictoor.calc_rewards import (
-    aggregate_predictoor_rewards,
-    calc_predictoor_rewards,
-)
-from df_py.predictoor.queries import query_predictoor_contracts, query_predictoors
-from df_py.util import blockrange, dispense, get_rate, networkutil, oceantestutil
+from df_py.util import instrument, networkutil
 from df_py.util.base18 import from_wei, to_wei
-from df_py.util.blocktime import get_fin_block, timestr_to_timestamp
-from df_py.util.contract_base import ContractBase
 from df_py.util.dftool_arguments import (
     CHAINID_EXAMPLES,
     DfStrategyArgumentParser,
@@ -39,31 +20,17 @@ from df_py.util.dftool_arguments import (
     valid_date,
     valid_date_and_convert,
 )
-from df_py.util.multisig import send_multisig_tx
 from df_py.util.networkutil import DEV_CHAINID, chain_id_to_multisig_addr
-from df_py.util.oceantestutil import (
-    random_consume_FREs,
-    random_create_dataNFT_with_FREs,
-    random_lock_and_allocate,
-)
-from df_py.util.oceanutil import (
-    FeeDistributor,
-    OCEAN_token,
-    record_deployed_contracts,
-    veAllocate,
-)
 from df_py.util.retry import retry_function
-from df_py.util.vesting_schedule import (
-    get_active_reward_amount_for_week_eth,
-    get_active_reward_amount_for_week_eth_by_stream,
-)
-from df_py.volume import csvs, queries
-from df_py.volume.reward_calculator import RewardShaper
-from df_py.volume.calc_rewards import calc_volume_rewards_from_csvs
+from df_py.util.typecheck import enforce_types
 
 
 @enforce_types
 def do_volsym():
+    from df_py.util import blockrange, steps
+    from df_py.util.oceanutil import record_deployed_contracts
+    from df_py.volume import csvs
+
     parser = StartFinArgumentParser(
         description="Query chain, output volumes, symbols, owners",
         epilog=f"""Uses these envvars:
@@ -96,13 +63,7 @@ def do_volsym():
         web3, arguments.ST, arguments.FIN, arguments.NSAMP, SECRET_SEED
     )
 
-    (Vi, Ci, SYMi) = retry_function(
-        queries.queryVolsOwnersSymbols, arguments.RETRIES, 60, rng, chain_id
-    )
-
-    csvs.save_nftvols_csv(Vi, csv_dir, chain_id)
-    csvs.save_owners_csv(Ci, csv_dir, chain_id)
-    csvs.save_symbols_csv(SYMi, csv_dir, chain_id)
+    steps.save_volsym(rng, csv_dir, chain_id, arguments.RETRIES)
 
     print("dftool volsym: Done")
 
@@ -112,6 +73,9 @@ def do_volsym():
 
 @enforce_types
 def do_nftinfo():
+    from df_py.util.blocktime import get_fin_block
+    from df_py.volume import csvs, queries
+
     parser = argparse.ArgumentParser(description="Query chain, output nft info csv")
     parser.add_argument("command", choices=["nftinfo"])
     parser.add_argument(
@@ -159,6 +123,9 @@ def do_nftinfo():
 
 @enforce_types
 def do_allocations():
+    from df_py.util import blockrange, steps
+    from df_py.volume import csvs
+
     parser = StartFinArgumentParser(
         description="Query chain, outputs allocation csv",
         epilog="""Uses these envvars:
@@ -184,10 +151,7 @@ def do_allocations():
     rng = blockrange.create_range(
         web3, arguments.ST, arguments.FIN, n_samp, SECRET_SEED
     )
-    allocs = retry_function(
-        queries.queryAllocations, arguments.RETRIES, 10, rng, chain_id
-    )
-    csvs.save_allocation_csv(allocs, csv_dir, n_samp > 1)
+    steps.save_allocations(rng, csv_dir, chain_id, arguments.RETRIES, n_samp > 1)
 
     print("dftool allocations: Done")
 
@@ -197,6 +161,9 @@ def do_allocations():
 
 @enforce_types
 def do_vebals():
+    from df_py.util import blockrange, steps
+    from df_py.volume import csvs
+
     parser = StartFinArgumentParser(
         description="Query chain, outputs veBalances csv",
         epilog="""Uses these envvars:
@@ -220,10 +187,7 @@ def do_vebals():
         web3, arguments.ST, arguments.FIN, n_samp, SECRET_SEED
     )
 
-    balances, locked_amt, unlock_time = retry_function(
-        queries.queryVebalances, arguments.RETRIES, 10, rng, chain_id
-    )
-    csvs.save_vebals_csv(balances, locked_amt, unlock_time, csv_dir, n_samp > 1)
+    steps.save_vebals(rng, csv_dir, chain_id, arguments.RETRIES, n_samp > 1)
 
     print("dftool vebals: Done")
 
@@ -231,6 +195,9 @@ def do_vebals():
 # ========================================================================
 @enforce_types
 def do_get_rate():
+    from df_py.util import get_rate
+    from df_py.volume import csvs
+
     parser = argparse.ArgumentParser(
         description="Get exchange rate, and output rate csv"
     )
@@ -238,7 +205,7 @@ def do_get_rate():
     parser.add_argument(
         "TOKEN_SYMBOL",
         type=str,
-        help="e.g. OCEAN, H20",
+        help="e.g. OCEAN, H20. Or several, comma-separated: OCEAN,ETH,MATIC",
     )
     parser.add_argument(
         "ST",
@@ -266,22 +233,34 @@ def do_get_rate():
     arguments = parser.parse_args()
     print_arguments(arguments)
 
-    token_symbol, csv_dir = arguments.TOKEN_SYMBOL, arguments.CSV_DIR
+    token_symbols, csv_dir = arguments.TOKEN_SYMBOL.split(","), arguments.CSV_DIR
 
     # check files, prep dir
-    _exitIfFileExists(csvs.rate_csv_filename(token_symbol, csv_dir))
+    for token_symbol in token_symbols:
+        _exitIfFileExists(csvs.rate_csv_filename(token_symbol, csv_dir))
 
     # main work
-    rate = retry_function(
-        get_rate.get_rate,
-        arguments.RETRIES,
-        60,
-        token_symbol,
-        arguments.ST,
-        arguments.FIN,
-    )
-    print(f"rate = ${rate:.4f} / {token_symbol}")
-    csvs.save_rate_csv(token_symbol, rate, csv_dir)
+    if len(token_symbols) > 1:  # fetch missing prices of all at once
+        get_rate.fill_price_store(token_symbols, arguments.ST, arguments.FIN)
+
+    failed = []
+    for token_symbol in token_symbols:
+        rate = retry_function(
+            get_rate.get_rate,
+            arguments.RETRIES,
+            60,
+            token_symbol,
+            arguments.ST,
+            arguments.FIN,
+        )
+        if rate is None:
+            print(f"Couldn't get rate for {token_symbol}")
+            failed.append(token_symbol)
+            continue
+        print(f"rate = ${rate:.4f} / {token_symbol}")
+        csvs.save_rate_csv(token_symbol, rate, csv_dir)
+    if failed:
+        sys.exit(1)
 
     print("dftool get_rate: Done")
 
@@ -289,6 +268,15 @@ def do_get_rate():
 # ========================================================================
 @enforce_types
 def do_predictoor_data():
+    from df_py.predictoor.csvs import (
+        predictoor_data_csv_filename,
+        save_predictoor_contracts_csv,
+        save_predictoor_data_csv,
+        save_predictoor_summary_csv,
+    )
+    from df_py.predictoor.queries import query_predictoor_contracts, query_predictoors
+    from df_py.util.blocktime import timestr_to_timestamp
+
     parser = argparse.ArgumentParser(description="Get data for Predictoor DF")
     parser.add_argument("command", choices=["predictoor_data"])
     parser.add_argument(
@@ -360,6 +348,15 @@ def do_predictoor_data():
 
 @enforce_types
 def do_calc():
+    from df_py.predictoor.calc_rewards import calc_predictoor_rewards
+    from df_py.predictoor.csvs import (
+        load_predictoor_data_csv,
+        save_predictoor_rewards_csv,
+    )
+    from df_py.util import steps, tables
+    from df_py.volume import csvs
+    from df_py.volume.calc_rewards import calc_volume_rewards_from_csvs
+
     parser = argparse.ArgumentParser(
         description="From substream data files, output rewards csvs."
     )
@@ -398,16 +395,7 @@ def do_calc():
         sys.exit(1)
 
     if tot_ocean == 0:
-        # Vesting wallet contract is used to calculate the reward amount for given week / start date
-        # currently only deployed on Goerli
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        address_path = os.path.join(
-            current_dir, "..", "..", ".github", "workflows", "data", "address.json"
-        )
-        record_deployed_contracts(address_path, 5)
-        tot_ocean = get_active_reward_amount_for_week_eth_by_stream(
-            start_date, arguments.SUBSTREAM
-        )
+        tot_ocean = steps.calc_tot_ocean(start_date, arguments.SUBSTREAM)
         print(
             f"TOT_OCEAN was 0, so re-calc'd: TOT_OCEAN={tot_ocean}"
             f", START_DATE={start_date}"
@@ -425,7 +413,7 @@ def do_calc():
         ]
 
         for fname in required_files:
-            if not os.path.exists(fname):
+            if not tables.table_exists(fname):
                 print(f"\nNo file {fname} in '{csv_dir}'. Exiting.")
                 sys.exit(1)
 
@@ -450,11 +438,188 @@ def do_calc():
     print("dftool calc: Done")
 
 
+# ========================================================================
+@enforce_types
+def do_backfill():
+    from df_py.util import backfill
+
+    parser = argparse.ArgumentParser(
+        description="Recompute past DF weeks in parallel, into CSV_DIR/<week>/."
+        " Re-running resumes: finished weeks and steps are skipped.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""Uses these envvars:
+          \nADDRESS_FILE -- eg: export ADDRESS_FILE={networkutil.chain_id_to_address_file(chainID=DEV_CHAINID)}
+          \nSECRET_SEED -- secret integer used to seed the rng
+        """,
+    )
+    parser.add_argument("command", choices=["backfill"])
+    parser.add_argument("START_WEEK", type=int, help="first DF week, >= 5")
+    parser.add_argument("END_WEEK", type=int, help="last DF week (inclusive)")
+    parser.add_argument(
+        "CSV_DIR", type=autocreate_path, help="output dir; gets a subdir per week"
+    )
+    parser.add_argument(
+        "--NSAMP",
+        default=200,
+        type=int,
+        help="blocks to sample liquidity from, per week",
+        required=False,
+    )
+    parser.add_argument(
+        "--CHAINIDS",
+        default=",".join(str(c) for c in backfill.CHAINIDS),
+        type=str,
+        help="comma-separated chainIDs to query volumes on",
+        required=False,
+    )
+    parser.add_argument(
+        "--WORKERS",
+        default=os.cpu_count() or 1,
+        type=int,
+        help="# weeks to compute at once, each in its own process",
+        required=False,
+    )
+    parser.add_argument(
+        "--RETRIES",
+        default=1,
+        type=int,
+        help="# times to retry failed queries",
+        required=False,
+    )
+
+    arguments = parser.parse_args()
+    print_arguments(arguments)
+
+    # extract envvars
+    ADDRESS_FILE = _getAddressEnvvarOrExit()
+    SECRET_SEED = _getSecretSeedOrExit()
+
+    # main work
+    status = backfill.backfill(
+        arguments.START_WEEK,
+        arguments.END_WEEK,
+        arguments.CSV_DIR,
+        arguments.NSAMP,
+        SECRET_SEED,
+        ADDRESS_FILE,
+        [chain_type(s) for s in arguments.CHAINIDS.split(",")],
+        arguments.WORKERS,
+        arguments.RETRIES,
+    )
+    for df_week, week_status in status.items():
+        print(f"DF week {df_week}: {week_status}")
+
+    if any(week_status.startswith("failed") for week_status in status.values()):
+        print("dftool backfill: Some weeks failed. Re-run to retry them.")
+        sys.exit(1)
+    print("dftool backfill: Done")
+
+
+# ========================================================================
+@enforce_types
+def do_weekly():
+    from df_py.util import weekly
+
+    parser = argparse.ArgumentParser(
+        description="Run the weekly data pipeline, from ST until now, in one"
+        " process: rates, volsym, vebals, allocations, calc volume, and"
+        " calculate_passive. Stages run as soon as their inputs are ready."
+        " Re-running resumes: stages whose outputs exist are skipped.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""Uses these envvars:
+          \nADDRESS_FILE -- eg: export ADDRESS_FILE={networkutil.chain_id_to_address_file(chainID=DEV_CHAINID)}
+          \nSECRET_SEED -- secret integer used to seed the rng
+        """,
+    )
+    parser.add_argument("command", choices=["weekly"])
+    parser.add_argument(
+        "ST", type=valid_date, help="start date of the DF week -- YYYY-MM-DD"
+    )
+    parser.add_argument("CSV_DIR", type=autocreate_path, help="output dir")
+    parser.add_argument(
+        "--TOT_OCEAN",
+        default=0.0,
+        type=float,
+        help="OCEAN to give out. If 0, use the vesting schedule",
+        required=False,
+    )
+    parser.add_argument(
+        "--NSAMP",
+        default=50,
+        type=int,
+        help="blocks to sample liquidity from",
+        required=False,
+    )
+    parser.add_argument(
+        "--TOKENS",
+        default="OCEAN,ETH,MATIC",
+        type=str,
+        help="comma-separated token symbols to get rates of",
+        required=False,
+    )
+    parser.add_argument(
+        "--CHAINIDS",
+        default="1,137",
+        type=str,
+        help="comma-separated chainIDs to query volumes on",
+        required=False,
+    )
+    parser.add_argument(
+        "--WORKERS",
+        default=8,
+        type=int,
+        help="# stages to run at once, each in its own thread",
+        required=False,
+    )
+    parser.add_argument(
+        "--RETRIES",
+        default=1,
+        type=int,
+        help="# times to retry failed queries",
+        required=False,
+    )
+
+    arguments = parser.parse_args()
+    print_arguments(arguments)
+
+    # extract envvars
+    ADDRESS_FILE = _getAddressEnvvarOrExit()
+    SECRET_SEED = _getSecretSeedOrExit()
+
+    # main work
+    stages = weekly.weekly_stages(
+        arguments.ST,
+        arguments.CSV_DIR,
+        ADDRESS_FILE,
+        SECRET_SEED,
+        arguments.NSAMP,
+        arguments.TOKENS.split(","),
+        [chain_type(s) for s in arguments.CHAINIDS.split(",")],
+        arguments.TOT_OCEAN,
+        arguments.RETRIES,
+    )
+    t0 = time.time()
+    seconds = weekly.run_stages(stages, arguments.WORKERS)
+
+    for name, stage_seconds in seconds.items():
+        print(f"{name:<24} {stage_seconds:8.1f} s")
+    print(f"{'total (wall)':<24} {time.time() - t0:8.1f} s")
+    print("dftool weekly: Done")
+
+
 # ========================================================================
 @enforce_types
 def do_dispense_active():
+    from df_py.predictoor.calc_rewards import aggregate_predictoor_rewards
+    from df_py.predictoor.csvs import load_predictoor_rewards_csv
+    from df_py.util import dispense, dispense_journal, tables
+    from df_py.volume import csvs
+    from df_py.volume.reward_calculator import RewardShaper
+
     parser = argparse.ArgumentParser(
         description="From rewards csv, dispense funds to chain."
+        " Batches are journaled in CSV_DIR: if interrupted, re-run the same"
+        " command to resume."
     )
     parser.add_argument("command", choices=["dispense_active"])
     parser.add_argument(
@@ -494,8 +659,23 @@ def do_dispense_active():
         help="specify the batch number to run dispense only for that batch. If not given, runs dispense for all batches.",
         required=False,
     )
+    parser.add_argument(
+        "--PIPELINED",
+        action="store_true",
+        help="send all batches, then wait for them together, rather than one by one",
+    )
+    parser.add_argument(
+        "--GAS_FRACTION",
+        default=None,
+        type=float,
+        help="size batches to use at most this fraction of the block gas limit,"
+        " eg 0.5. If not given, batches have a fixed size",
+        required=False,
+    )
 
     arguments = parser.parse_args()
+    if arguments.GAS_FRACTION is not None and arguments.BATCH_NBR is not None:
+        parser.error("--GAS_FRACTION batches aren't fixed, so can't use --BATCH_NBR")
     print_arguments(arguments)
 
     assert arguments.DFREWARDS_ADDR is not None
@@ -509,7 +689,7 @@ def do_dispense_active():
 
     if arguments.PREDICTOOR_ROSE is False:
         volume_rewards = {}
-        if os.path.exists(csvs.volume_rewards_csv_filename(arguments.CSV_DIR)):
+        if tables.table_exists(csvs.volume_rewards_csv_filename(arguments.CSV_DIR)):
             volume_rewards_3d = csvs.load_volume_rewards_csv(arguments.CSV_DIR)
             volume_rewards = RewardShaper.flatten(volume_rewards_3d)
 
@@ -527,6 +707,11 @@ def do_dispense_active():
         web3.to_checksum_address(arguments.TOKEN_ADDR),
         from_account,
         batch_number=arguments.BATCH_NBR,
+        pipelined=arguments.PIPELINED,
+        gas_fraction=arguments.GAS_FRACTION,
+        journal_file=dispense_journal.journal_filename(
+            arguments.CSV_DIR, arguments.CHAINID, arguments.DFREWARDS_ADDR
+        ),
     )
 
     print("dftool dispense_active: Done")
@@ -535,6 +720,8 @@ def do_dispense_active():
 # ========================================================================
 @enforce_types
 def do_new_df_rewards():
+    from df_py.util.contract_base import ContractBase
+
     parser = SimpleChainIdArgumentParser(
         "Deploy new DFRewards contract", "new_df_rewards"
     )
@@ -553,6 +740,8 @@ def do_new_df_rewards():
 # ========================================================================
 @enforce_types
 def do_new_df_strategy():
+    from df_py.util.contract_base import ContractBase
+
     parser = argparse.ArgumentParser(description="Deploy new DFStrategy")
     parser.add_argument("command", choices=["new_df_strategy"])
     parser.add_argument("CHAINID", type=chain_type, help=f"{CHAINID_EXAMPLES}")
@@ -576,6 +765,8 @@ def do_new_df_strategy():
 # ========================================================================
 @enforce_types
 def do_add_strategy():
+    from df_py.util.contract_base import ContractBase
+
     parser = DfStrategyArgumentParser(
         "Add a strategy to DFRewards contract", "addstrategy"
     )
@@ -600,6 +791,8 @@ def do_add_strategy():
 # ========================================================================
 @enforce_types
 def do_retire_strategy():
+    from df_py.util.contract_base import ContractBase
+
     parser = DfStrategyArgumentParser(
         "Retire a strategy from DFRewards contract", "retire_strategy"
     )
@@ -624,6 +817,9 @@ def do_retire_strategy():
 # ========================================================================
 @enforce_types
 def do_init_dev_wallets():
+    from df_py.util import oceantestutil
+    from df_py.util.oceanutil import record_deployed_contracts
+
     parser = SimpleChainIdArgumentParser(
         "Init wallets with OCEAN. (GANACHE ONLY)",
         "init_dev_wallets",
@@ -657,6 +853,14 @@ def do_init_dev_wallets():
 @enforce_types
 def do_many_random():
     # UPDATE THIS
+    from df_py.util import oceantestutil
+    from df_py.util.oceantestutil import (
+        random_consume_FREs,
+        random_create_dataNFT_with_FREs,
+        random_lock_and_allocate,
+    )
+    from df_py.util.oceanutil import OCEAN_token, record_deployed_contracts
+
     parser = SimpleChainIdArgumentParser(
         "deploy many datatokens + locks OCEAN + allocates + consumes (for testing)",
         "many_random",
@@ -699,6 +903,10 @@ def do_many_random():
 # ========================================================================
 @enforce_types
 def do_fake_rewards():
+    from df_py.util import oceantestutil
+    from df_py.util.contract_base import ContractBase
+    from df_py.util.oceanutil import OCEAN_token, record_deployed_contracts
+
     parser = SimpleChainIdArgumentParser(
         "create some rewards (for testing)",
         "fake_rewards",
@@ -791,6 +999,8 @@ def do_new_acct():
 # ========================================================================
 @enforce_types
 def do_new_token():
+    from df_py.util.contract_base import ContractBase
+
     parser = argparse.ArgumentParser(description="Generate new token (for testing)")
     parser.add_argument("command", choices=["new_token"])
     parser.add_argument("CHAINID", type=chain_type, help=CHAINID_EXAMPLES)
@@ -813,6 +1023,8 @@ def do_new_token():
 # ========================================================================
 @enforce_types
 def do_new_veallocate():
+    from df_py.util.contract_base import ContractBase
+
     parser = argparse.ArgumentParser(
         description="Generate new veAllocate (for testing)"
     )
@@ -833,6 +1045,10 @@ def do_new_veallocate():
 # ========================================================================
 @enforce_types
 def do_ve_set_allocation():
+    from web3.main import Web3
+
+    from df_py.util.oceanutil import record_deployed_contracts, veAllocate
+
     parser = argparse.ArgumentParser(
         description="""
         Allocate weight to veAllocate contract (for testing).
@@ -868,6 +1084,9 @@ def do_ve_set_allocation():
 # ========================================================================
 @enforce_types
 def do_acct_info():
+    from df_py.util.contract_base import ContractBase
+    from df_py.util.oceanutil import OCEAN_token, record_deployed_contracts
+
     parser = argparse.ArgumentParser(
         description="Info about an account",
         epilog="If envvar ADDRESS_FILE is not None, it gives balance for OCEAN token too.",
@@ -939,6 +1158,14 @@ def do_chain_info():
 # ========================================================================
 @enforce_types
 def do_dispense_passive():
+    from df_py.util import dispense
+    from df_py.util.oceanutil import (
+        FeeDistributor,
+        OCEAN_token,
+        record_deployed_contracts,
+    )
+    from df_py.util.vesting_schedule import get_active_reward_amount_for_week_eth
+
     parser = argparse.ArgumentParser(description="Dispense passive rewards")
     parser.add_argument("command", choices=["dispense_passive"])
     parser.add_argument("CHAINID", type=chain_type, help=CHAINID_EXAMPLES)
@@ -976,6 +1203,12 @@ def do_dispense_passive():
 
 @enforce_types
 def do_fund_predictoor_ocean_dispenser():
+    from df_py.util import dispense
+    from df_py.util.oceanutil import OCEAN_token, record_deployed_contracts
+    from df_py.util.vesting_schedule import (
+        get_active_reward_amount_for_week_eth_by_stream,
+    )
+
     parser = argparse.ArgumentParser(description="Dispense predictoor rewards")
     parser.add_argument("command", choices=["fund_predictoor_ocean_dispenser"])
     parser.add_argument("CHAINID", type=chain_type, help=CHAINID_EXAMPLES)
@@ -992,7 +1225,7 @@ def do_fund_predictoor_ocean_dispenser():
     web3 = networkutil.chain_id_to_web3(arguments.CHAINID)
 
     predictoor_budget_week = get_active_reward_amount_for_week_eth_by_stream(
-        arguments.ST, "predictoor", arguments.CHAINID
+        arguments.ST, "predictoor"
     )
 
     retry_function(
@@ -1009,6 +1242,11 @@ def do_fund_predictoor_ocean_dispenser():
 # ========================================================================
 @enforce_types
 def do_calculate_passive():
+    from df_py.util import steps, tables
+    from df_py.util.blocktime import timestr_to_timestamp
+    from df_py.util.oceanutil import record_deployed_contracts
+    from df_py.volume import csvs
+
     parser = argparse.ArgumentParser(description="Calculate passive rewards")
     parser.add_argument("command", choices=["calculate_passive"])
     parser.add_argument("CHAINID", type=chain_type, help=CHAINID_EXAMPLES)
@@ -1025,34 +1263,27 @@ def do_calculate_passive():
 
     timestamp = int(timestr_to_timestamp(arguments.DATE))
 
-    S_PER_WEEK = 7 * 86400
-    timestamp = timestamp // S_PER_WEEK * S_PER_WEEK
     ADDRESS_FILE = _getAddressEnvvarOrExit()
     record_deployed_contracts(ADDRESS_FILE, arguments.CHAINID)
 
     # load vebals csv file
     passive_fname = csvs.passive_csv_filename(csv_dir)
     vebals_realtime_fname = csvs.vebals_csv_filename(csv_dir, False)
-    if not os.path.exists(vebals_realtime_fname):
+    if not tables.table_exists(vebals_realtime_fname):
         print(f"\nNo file {vebals_realtime_fname} in '{csv_dir}'. Exiting.")
         sys.exit(1)
     _exitIfFileExists(passive_fname)
 
-    # get addresses
-    vebals, _, _ = csvs.load_vebals_csv(csv_dir, False)
-    addresses = list(vebals.keys())
-
-    balances, rewards = queries.queryPassiveRewards(
-        arguments.CHAINID, timestamp, addresses
-    )
-
-    # save to csv
-    csvs.save_passive_csv(rewards, balances, csv_dir)
+    # main work
+    steps.save_passive(arguments.CHAINID, timestamp, csv_dir)
 
 
 # ========================================================================
 @enforce_types
 def do_checkpoint_feedist():
+    from df_py.util.multisig import SafeCall, send_multisig_txs
+    from df_py.util.oceanutil import FeeDistributor, record_deployed_contracts
+
     parser = SimpleChainIdArgumentParser(
         "Checkpoint FeeDistributor contract", "checkpoint_feedist"
     )
@@ -1079,30 +1310,19 @@ def do_checkpoint_feedist():
             fn_name="checkpoint_token", args=[]
         )
 
-        to = feedist.address
-        value = 0
         multisig_addr = chain_id_to_multisig_addr(web3.eth.chain_id)
 
-        # submit transactions to multisig
-        retry_function(
-            send_multisig_tx,
-            3,
-            60,
-            multisig_addr,
-            web3,
-            to,
-            value,
-            total_supply_encoded,
-        )
+        # submit transactions to multisig, as one Safe tx
         retry_function(
-            send_multisig_tx,
+            send_multisig_txs,
             3,
             60,
             multisig_addr,
             web3,
-            to,
-            value,
-            checkpoint_token_encoded,
+            [
+                SafeCall(feedist.address, total_supply_encoded),
+                SafeCall(feedist.address, checkpoint_token_encoded),
+            ],
         )
 
     print("Checkpointed FeeDistributor")
@@ -1113,7 +1333,9 @@ def do_checkpoint_feedist():
 
 
 def _exitIfFileExists(filename: str):
-    if os.path.exists(filename):
+    from df_py.util import tables
+
+    if tables.table_exists(filename):
         print(f"\nFile {filename} exists. Exiting.")
         sys.exit(1)
 
@@ -1141,6 +1363,8 @@ def _getSecretSeedOrExit() -> int:
 
 @enforce_types
 def _getPrivateAccount():
+    from eth_account import Account
+
     private_key = os.getenv("DFTOOL_KEY")
     assert private_key is not None, "Need to set envvar DFTOOL_KEY"
     account = Account.from_key(private_key=private_key)
@@ -1158,4 +1382,15 @@ def _do_main():
     if func is None:
         do_help_long(1)
 
-    func()
+    try:
+        with instrument.timer("command"):
+            func()
+    except SystemExit as e:
+        if e.code not in (None, 0):  # eg sys.exit(1) on bad input
+            instrument.inc("command_failures")
+        raise
+    except Exception:
+        instrument.inc("command_failures")
+        raise
+    finally:
+        instrument.write_reports(sys.argv[1])
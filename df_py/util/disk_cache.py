@@ -0,0 +1,73 @@
+"""
+On-disk cache for data that is slow or rate-limited to fetch, and that
+doesn't change between runs (e.g. Aquarius asset names).
+
+Files live in envvar DFPY_CACHE_DIR, default ~/.cache/df-py.
+"""
+
+import fcntl
+import json
+import os
+
+from df_py.util.typecheck import enforce_types
+
+DEFAULT_CACHE_DIR = "~/.cache/df-py"
+
+
+@enforce_types
+def cache_dir() -> str:
+    """Returns the cache directory, creating it if needed"""
+    path = os.path.expanduser(os.getenv("DFPY_CACHE_DIR", DEFAULT_CACHE_DIR))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+@enforce_types
+def cache_filename(name: str) -> str:
+    """Returns the full path of a file in the cache directory"""
+    return os.path.join(cache_dir(), name)
+
+
+@enforce_types
+def load_json(filename: str, default):
+    """
+    @description
+      Load a json cache file. A missing or corrupt file is not an error:
+      the cache is just empty.
+
+    @return
+      data -- the file's contents, or default
+    """
+    if not os.path.exists(filename):
+        return default
+    try:
+        with open(filename, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable cache file {filename}: {e}")
+        return default
+
+
+@enforce_types
+def save_json(filename: str, data):
+    """Save a json cache file atomically, so readers never see a partial file"""
+    tmp_filename = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp_filename, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_filename, filename)
+
+
+def locked_update(filename: str, update_fn, default):
+    """
+    @description
+      Load a json cache file, update it, and save it. A lock file is held
+      throughout, so no other thread or process saves in between. Use it to
+      merge into a file that others may have saved since it was loaded.
+
+    @arguments
+      update_fn -- function(data) -> new data to save
+      default -- data if the file is missing or unreadable
+    """
+    with open(f"{filename}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)  # released on close
+        save_json(filename, update_fn(load_json(filename, default)))
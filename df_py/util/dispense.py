@@ -1,20 +1,55 @@
+import math
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # pylint: disable=logging-fstring-interpolation
-from typing import Dict, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
-from enforce_typing import enforce_types
+from web3.exceptions import TransactionNotFound
 from web3.main import Web3
 
 from df_py.util.base18 import to_wei
 from df_py.util.contract_base import ContractBase
+from df_py.util.dispense_journal import DispenseJournal, dispense_fingerprint
 from df_py.util.logger import logger
-from df_py.util.multisig import send_multisig_tx
+from df_py.util.multisig import (
+    DEFAULT_CALL_GAS,
+    MAX_BUNDLE_GAS,
+    SafeCall,
+    send_multisig_tx,
+    send_multisig_txs,
+)
 from df_py.util.networkutil import chain_id_to_multisig_addr
+from df_py.util.oceanutil import checksum_addr
+from df_py.util.typecheck import enforce_types
 
 MAX_BATCH_SIZE = 500
 TRY_AGAIN = 3
 
+# gas-sized batches: # recipients of the two batches whose gas is estimated,
+# to get gas per recipient
+GAS_PROBE_SIZES = (10, 100)
+
+# gas-sized batches: a batch whose gas estimate fails is split, down to this
+# size. If one this small still fails, it's not its size (eg a bad recipient,
+# or a missing allowance), so stop rather than try each recipient alone
+MIN_SPLIT_SIZE = 10
+
+# multisig: upper bound of DFRewards.allocate gas, to bundle batches in as
+# few Safe txs as fit. 1250 recipients take < 30M gas
+ALLOCATE_GAS_BASE = 100_000
+ALLOCATE_GAS_PER_ADDR = 30_000
+
+# pipelined mode: how long to wait for a batch's tx before re-sending it, and
+# how often to poll for receipts
+RECEIPT_TIMEOUT = 300
+POLL_LATENCY = 2.0
+
+# pipelined mode: fee bump of a tx that replaces a pending one. Nodes need
+# >= +10% on each fee field
+FEE_BUMP = 1.125
+
 
 # pylint: disable=too-many-statements
 @enforce_types
@@ -26,11 +61,17 @@ def dispense(
     from_account,
     batch_size: int = MAX_BATCH_SIZE,
     batch_number: Optional[int] = None,
+    pipelined: bool = False,
+    journal_file: Optional[str] = None,
+    gas_fraction: Optional[float] = None,
 ):
     """
     @description
       Allocate rewards to LPs.
 
+      With envvar USE_MULTISIG=true, approve and allocations are proposed
+      to the multisig instead, bundled into as few Safe txs as fit.
+
     @arguments
       rewards -- dict of [LP_addr]:TOKEN_amt (float, not wei)
         -- rewards for each LP
@@ -39,6 +80,16 @@ def dispense(
       from_account -- account doing the spending
       batch_size -- largest # LPs allocated per tx (due to EVM limits)
       batch_number -- specify the batch number to run dispense only for that batch.
+      pipelined -- send all batches without waiting for each to be mined,
+        then wait for them together. See allocate_pipelined(). Not used
+        with multisig, which queues txs for signing instead
+      journal_file -- if given, record each batch's txs in this file, and
+        skip the batches it has as confirmed. So if dispense gets
+        interrupted, calling it again finishes the job. Not used with
+        multisig. See dispense_journal.py
+      gas_fraction -- if given, ignore batch_size: put as many recipients
+        in a batch as fit in this fraction of the block gas limit. See
+        gas_sized_ranges(). Not with batch_number or multisig
 
     @return
       <<nothing, but updates the dfrewards contract on-chain>>
@@ -52,15 +103,15 @@ def dispense(
         multisigaddr = chain_id_to_multisig_addr(web3.eth.chain_id)
     df_rewards = ContractBase(web3, "DFRewards", dfrewards_addr)
     TOK = ContractBase(web3, "OceanToken", token_addr)
+    safe_calls: List[SafeCall] = []  # multisig: proposed together, at the end
     logger.info(f"  Total amount: {sum(rewards.values())} {TOK.symbol()}")
 
     # checksum addresses
-    rewards = {web3.to_checksum_address(k): v for k, v in rewards.items()}
+    rewards = {checksum_addr(k): v for k, v in rewards.items()}
     to_addrs = list(rewards.keys())
     values = [to_wei(rewards[to_addr]) for to_addr in to_addrs]
 
     N = len(rewards)
-    sts = list(range(N))[::batch_size]  # send in batches to avoid gas issues
 
     LEGACY_TX = False
     if web3.eth.chain_id == 23294:
@@ -71,10 +122,7 @@ def dispense(
             data = TOK.contract.encodeABI(
                 fn_name="approve", args=[df_rewards.address, amt]
             )
-            value = 0
-            to = TOK.address
-            # data = bytes.fromhex(data[2:])
-            send_multisig_tx(multisigaddr, web3, to, value, data)
+            safe_calls.append(SafeCall(TOK.address, data))
             return
         tx_dict = {
             "from": from_account,
@@ -84,22 +132,107 @@ def dispense(
             tx_dict["gasPrice"] = web3.eth.gas_price
         TOK.approve(df_rewards, amt, tx_dict)
 
-    if batch_number is not None:
-        b_st = (batch_number - 1) * batch_size
-        approveAmt(sum(values[b_st : b_st + batch_size]))
-    else:
+    if gas_fraction is not None and usemultisig:
+        logger.info("multisig: batches have a fixed size, not sized by gas")
+        gas_fraction = None
+    if gas_fraction is not None and batch_number is not None:
+        raise ValueError("gas_fraction batches aren't fixed: no batch_number")
+
+    # batches, as (st, fin) ranges of recipients. They're sized by gas after
+    # approving, since estimating the gas of allocate needs the allowance
+    ranges: Optional[List[Tuple[int, int]]] = None
+    if usemultisig:
+        ranges = bundle_sized_ranges(N, batch_size)
+    elif gas_fraction is None:
+        ranges = [(st, min(st + batch_size, N)) for st in range(0, N, batch_size)]
+
+    journal = None
+    if journal_file is not None and not usemultisig:
+        fingerprint = dispense_fingerprint(
+            web3.eth.chain_id, dfrewards_addr, token_addr, to_addrs, values
+        )
+        journal = DispenseJournal(journal_file, fingerprint)
+        journal.check_chain(web3)
+        if journal.ranges is not None:
+            ranges = journal.ranges  # resume with the batches of the first run
+
+    batch_ids = None  # None = all batches
+    if ranges is not None:
+        batch_ids = [
+            i
+            for i in range(len(ranges))
+            if batch_number is None or batch_number == i + 1
+        ]
+        if journal is not None:
+            done_ids = [i for i in batch_ids if journal.is_confirmed(i)]
+            if done_ids:
+                logger.info(f"Skipping {len(done_ids)} batches confirmed in journal")
+            batch_ids = [i for i in batch_ids if i not in done_ids]
+            if not batch_ids:
+                logger.info("dispense: done")
+                return
+
+    # approve only what's left to allocate
+    if batch_ids is None:
         approveAmt(sum(values))
+    else:
+        assert ranges is not None
+        approveAmt(sum(sum(values[st:fin]) for st, fin in _at(ranges, batch_ids)))
 
-    logger.info(f"Total {len(sts)} batches")
-    for i, st in enumerate(sts):
-        if batch_number is not None and batch_number != i + 1:
-            continue
-        fin = st + batch_size
+    if ranges is None:
+        ranges = gas_sized_ranges(
+            web3,
+            df_rewards,
+            TOK.address,
+            to_addrs,
+            values,
+            from_account.address,
+            gas_fraction,
+        )
+        batch_ids = list(range(len(ranges)))
+    if journal is not None and journal.ranges is None:
+        journal.record_ranges(ranges)
+    assert batch_ids is not None
+
+    logger.info(f"Total {len(ranges)} batches")
+    if (pipelined or journal is not None) and not usemultisig:
+        batches = {
+            i: (to_addrs[st:fin], values[st:fin])
+            for i, (st, fin) in zip(batch_ids, _at(ranges, batch_ids))
+        }
+        if pipelined:
+            failed = allocate_pipelined(
+                web3,
+                df_rewards,
+                TOK.address,
+                batches,
+                from_account,
+                LEGACY_TX,
+                journal=journal,
+            )
+        else:  # one batch at a time, so that it's journaled
+            failed = []
+            for i, batch in batches.items():
+                failed += allocate_pipelined(
+                    web3,
+                    df_rewards,
+                    TOK.address,
+                    {i: batch},
+                    from_account,
+                    LEGACY_TX,
+                    journal=journal,
+                )
+        for i in failed:
+            logger.critical(f"Could not allocate funds for batch {i+1}")
+        logger.info("dispense: done")
+        return
+
+    for i, (st, fin) in zip(batch_ids, _at(ranges, batch_ids)):
         done = False
         for z in range(TRY_AGAIN):
             # pylint: disable=line-too-long
             logger.info(
-                f"Allocating rewards Batch #{(i+1)}/{len(sts)}, {len(to_addrs[st:fin])} addresses {z}"
+                f"Allocating rewards Batch #{(i+1)}/{len(ranges)}, {len(to_addrs[st:fin])} addresses {z}"
             )
 
             # if env use multisig
@@ -109,13 +242,8 @@ def dispense(
                     fn_name="allocate",
                     args=[to_addrs[st:fin], values[st:fin], TOK.address],
                 )
-                # value is 0
-                value = 0
-                to = df_rewards.address
-                # convert data to bytes
-                # data = bytes.fromhex(data[2:])
-
-                send_multisig_tx(multisigaddr, web3, to, value, data)
+                gas = allocate_gas_bound(fin - st)
+                safe_calls.append(SafeCall(df_rewards.address, data, gas=gas))
             else:
                 tx_dict = {
                     "from": from_account,
@@ -134,9 +262,306 @@ def dispense(
 
         if done is False:
             logger.critical(f"Could not allocate funds for batch {i+1}")
+
+    if usemultisig:  # approve and allocations, in as few Safe txs as fit
+        send_multisig_txs(multisigaddr, web3, safe_calls)
     logger.info("dispense: done")
 
 
+def _at(ranges: List[Tuple[int, int]], batch_ids: List[int]) -> list:
+    return [ranges[i] for i in batch_ids]
+
+
+@enforce_types
+def allocate_gas_bound(n_addrs: int) -> int:
+    """Upper bound of the gas of DFRewards.allocate to n_addrs"""
+    return ALLOCATE_GAS_BASE + ALLOCATE_GAS_PER_ADDR * n_addrs
+
+
+@enforce_types
+def bundle_sized_ranges(
+    N: int, batch_size: int, max_gas: int = MAX_BUNDLE_GAS
+) -> List[Tuple[int, int]]:
+    """
+    @description
+      Batches for multisig, as (st, fin) ranges of recipients: sized to
+      fill each MultiSend bundle of max_gas, after the approve in the first.
+      So chunk_calls() packs them into as few Safe txs as the gas allows.
+      Each batch still has at most batch_size recipients.
+    """
+    ranges = []
+    room = max_gas - DEFAULT_CALL_GAS  # the approve comes first
+    st = 0
+    while st < N:
+        n_fit = (room - ALLOCATE_GAS_BASE) // ALLOCATE_GAS_PER_ADDR
+        if n_fit < 1 and room < max_gas:  # bundle full: start the next one
+            room = max_gas
+            continue
+        fin = min(st + batch_size, st + max(n_fit, 1), N)
+        ranges.append((st, fin))
+        room -= allocate_gas_bound(fin - st)
+        st = fin
+    return ranges
+
+
+@enforce_types
+def gas_sized_ranges(
+    web3: Web3,
+    df_rewards,
+    token_addr: str,
+    to_addrs: list,
+    values: list,
+    from_addr: str,
+    gas_fraction: float,
+) -> List[Tuple[int, int]]:
+    """
+    @description
+      Split recipients into as few DFRewards.allocate batches as possible,
+      each using at most gas_fraction of the block gas limit.
+
+      Gas per recipient comes from estimating two small batches. It varies
+      (eg a recipient's first reward costs more storage), so each batch is
+      then estimated too. A batch that's over the limit, or whose estimate
+      fails, is split in two. If the estimate of a batch of MIN_SPLIT_SIZE
+      or fewer recipients fails, raise ValueError.
+
+      Needs the allowance for the allocations to be approved already.
+
+    @return
+      ranges -- list of (st, fin): batch i is recipients st..fin-1
+    """
+    N = len(to_addrs)
+    max_gas = int(web3.eth.get_block("latest")["gasLimit"] * gas_fraction)
+
+    def estimate(st: int, fin: int) -> Optional[int]:
+        func = df_rewards.contract.functions.allocate(
+            to_addrs[st:fin], values[st:fin], token_addr
+        )
+        try:
+            return func.estimate_gas({"from": from_addr})
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.info(f"Gas estimate failed, for recipients {st}..{fin-1}: {e}")
+            return None
+
+    # fit gas = base + per_addr * n, from batches of n_small and n_big
+    n_small, n_big = min(N, GAS_PROBE_SIZES[0]), min(N, GAS_PROBE_SIZES[1])
+    gas_small, gas_big = estimate(0, n_small), estimate(0, n_big)
+    if n_small < n_big and gas_small is not None and gas_big is not None:
+        per_addr = max(1.0, (gas_big - gas_small) / (n_big - n_small))
+        base = gas_small - per_addr * n_small
+        size = max(1, int((max_gas - base) / per_addr))
+    else:
+        size = MAX_BATCH_SIZE
+    logger.info(f"Gas limit per batch: {max_gas}. Trying {size} recipients/batch")
+
+    ranges = []
+    todo = [(st, min(st + size, N)) for st in range(0, N, size)]
+    while todo:
+        st, fin = todo.pop(0)
+        gas = estimate(st, fin)
+        if gas is None and fin - st <= MIN_SPLIT_SIZE:
+            raise ValueError(
+                f"Can't estimate gas of allocate to recipients {st}..{fin-1},"
+                " even in a small batch. Check the recipients and the allowance"
+            )
+        if fin - st > 1 and (gas is None or gas > max_gas):
+            mid = (st + fin) // 2
+            todo[:0] = [(st, mid), (mid, fin)]
+            continue
+        ranges.append((st, fin))
+
+    logger.info(f"{N} recipients -> {len(ranges)} batches")
+    return ranges
+
+
+@enforce_types
+def allocate_pipelined(
+    web3: Web3,
+    df_rewards,
+    token_addr: str,
+    batches: Dict[int, Tuple[list, list]],
+    from_account,
+    legacy_tx: bool = False,
+    receipt_timeout: float = RECEIPT_TIMEOUT,
+    journal: Optional[DispenseJournal] = None,
+) -> List[int]:
+    """
+    @description
+      Call DFRewards.allocate for each batch. Send all txs back-to-back,
+      with nonces assigned here rather than fetched per tx. Then wait for
+      their receipts concurrently.
+
+      Only batches that failed are re-sent, up to TRY_AGAIN times:
+      - reverted: re-sent with a new nonce
+      - not mined within receipt_timeout (e.g. dropped): re-sent with the
+        same nonce, and each fee FEE_BUMP x that of the tx it replaces, or
+        the current fee if higher. So it replaces the old tx, and at
+        most one of them can be mined. Rewards can't be allocated twice.
+
+      With a journal, each tx is recorded before it's sent. A batch with a
+      tx sent by an earlier run is first re-checked on chain, whatever its
+      nonce: if that tx got mined since (eg before the approve), the batch
+      is done. Else, if its nonce is still unused, the batch is re-sent
+      with that nonce, so it replaces the old tx if that's still pending.
+
+    @arguments
+      batches -- dict of [batch_i] : (to_addrs, values in wei)
+      journal -- DispenseJournal to record txs in, or None
+      ..
+
+    @return
+      failed -- batch_i's that couldn't be allocated
+    """
+    next_nonce = int(web3.eth.get_transaction_count(from_account.address, "pending"))
+    nonces: Dict[int, int] = {}  # [batch_i] : nonce
+    tx_hashes: Dict[int, list] = {i: [] for i in batches}  # all sent for batch_i
+    fees: Dict[int, dict] = {}  # [batch_i] : fee fields of last tx with nonce
+    todo = sorted(batches)
+
+    if journal is not None:
+        journal.check_chain(web3)  # txs of an earlier run may be mined by now
+        todo = [i for i in todo if not journal.is_confirmed(i)]
+        mined_nonce = web3.eth.get_transaction_count(from_account.address, "latest")
+        for i in todo:
+            sends = journal.sends(i)
+            if sends and sends[-1]["nonce"] >= mined_nonce:
+                nonces[i] = sends[-1]["nonce"]
+                tx_hashes[i] = [e["tx_hash"] for e in sends if e["nonce"] == nonces[i]]
+                next_nonce = max(next_nonce, nonces[i] + 1)
+                try:  # a replacement must outbid the old tx, if still pending
+                    fees[i] = _tx_fees(web3.eth.get_transaction(tx_hashes[i][-1]))
+                except TransactionNotFound:
+                    pass
+    if not todo:
+        return []
+
+    for attempt in range(TRY_AGAIN):
+        for i in todo:
+            if i not in nonces:
+                nonces[i] = next_nonce
+                next_nonce += 1
+            logger.info(
+                f"Sending batch #{i+1}, {len(batches[i][0])} addresses,"
+                f" nonce {nonces[i]}, try {attempt}"
+            )
+            try:
+                signed_tx, fees[i] = _sign_allocate(
+                    web3,
+                    df_rewards,
+                    token_addr,
+                    batches[i],
+                    from_account,
+                    nonces[i],
+                    legacy_tx,
+                    fees.get(i),
+                )
+                tx_hash = Web3.to_hex(signed_tx.hash)
+                if journal is not None:
+                    journal.record_sent(i, *batches[i], nonces[i], tx_hash)
+                tx_hashes[i].append(tx_hash)
+                web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # eg "nonce too low", if an earlier tx of this batch was mined
+                logger.warning(f"Could not send batch #{i+1}: {e}")
+
+        with ThreadPoolExecutor(max_workers=min(32, len(todo))) as executor:
+            statuses = list(
+                executor.map(
+                    lambda i: _wait_for_batch(web3, tx_hashes[i], receipt_timeout),
+                    todo,
+                )
+            )
+
+        for i, status in zip(todo, statuses):
+            logger.info(f"Batch #{i+1}: {status}")
+            if status == "mined" and journal is not None:
+                journal.record_confirmed(i)
+            if status == "reverted":
+                del nonces[i]  # its nonce is used up
+                tx_hashes[i] = []
+                fees.pop(i, None)
+                if journal is not None:
+                    journal.record_reverted(i)
+        todo = [i for i, status in zip(todo, statuses) if status != "mined"]
+        if not todo:
+            break
+
+    return todo
+
+
+def _sign_allocate(
+    web3: Web3,
+    df_rewards,
+    token_addr: str,
+    batch: Tuple[list, list],
+    from_account,
+    nonce: int,
+    legacy_tx: bool,
+    replaced_fees: Optional[dict],
+):
+    """
+    Build and sign one DFRewards.allocate tx.
+    If it replaces a tx with replaced_fees, outbid that by FEE_BUMP.
+    Returns (signed tx, its fee fields)
+    """
+    fees = _fees(web3, legacy_tx, replaced_fees)
+    tx_dict = {"from": from_account.address, "nonce": nonce, **fees}
+    to_addrs, values = batch
+    tx = df_rewards.contract.functions.allocate(
+        to_addrs, values, token_addr
+    ).build_transaction(tx_dict)
+    signed_tx = web3.eth.account.sign_transaction(tx, from_account.key)
+    return signed_tx, fees
+
+
+def _fees(web3: Web3, legacy_tx: bool, replaced_fees: Optional[dict]) -> dict:
+    """Fee fields of a new tx: current fees, or more to replace a tx"""
+    fees: Dict[str, int]
+    if legacy_tx:
+        # gas price: legacy tx for Sapphire
+        fees = {"gasPrice": web3.eth.gas_price}
+    else:
+        priority_fee = web3.eth.max_priority_fee
+        base_fee = web3.eth.get_block("latest")["baseFeePerGas"]
+        fees = {
+            "maxPriorityFeePerGas": priority_fee,
+            "maxFeePerGas": base_fee * 2 + priority_fee,
+        }
+    for field in fees:
+        if replaced_fees and replaced_fees.get(field) is not None:
+            bumped = math.ceil(replaced_fees[field] * FEE_BUMP)
+            fees[field] = max(fees[field], bumped)
+    return fees
+
+
+def _tx_fees(tx) -> dict:
+    """Fee fields of a sent tx"""
+    fields = ["gasPrice", "maxPriorityFeePerGas", "maxFeePerGas"]
+    return {field: tx[field] for field in fields if tx.get(field) is not None}
+
+
+def _wait_for_batch(web3: Web3, tx_hashes: list, timeout: float) -> str:
+    """
+    @description
+      Wait until one of a batch's txs is mined. They share a nonce, so at
+      most one can be.
+
+    @return
+      status -- "mined", "reverted", or "dropped" if none is mined in time
+    """
+    deadline = time.time() + timeout
+    while True:
+        for tx_hash in tx_hashes:
+            try:
+                receipt = web3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                continue
+            return "mined" if receipt["status"] == 1 else "reverted"
+        if time.time() >= deadline:
+            return "dropped"
+        time.sleep(POLL_LATENCY)
+
+
 @enforce_types
 def dispense_passive(web3, ocean, feedistributor, amount: Union[float, int]):
     amount_wei = to_wei(amount)
@@ -152,10 +577,15 @@ def dispense_passive(web3, ocean, feedistributor, amount: Union[float, int]):
     )
 
     multisig_addr = chain_id_to_multisig_addr(web3.eth.chain_id)
-    send_multisig_tx(multisig_addr, web3, ocean.address, 0, transfer_data)
-
-    for data in [checkpoint_total_supply_data, checkpoint_token_data]:
-        send_multisig_tx(multisig_addr, web3, feedistributor.address, 0, data)
+    send_multisig_txs(
+        multisig_addr,
+        web3,
+        [
+            SafeCall(ocean.address, transfer_data),
+            SafeCall(feedistributor.address, checkpoint_total_supply_data),
+            SafeCall(feedistributor.address, checkpoint_token_data),
+        ],
+    )
 
 
 @enforce_types
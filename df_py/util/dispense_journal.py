@@ -0,0 +1,175 @@
+"""
+Journal of a dispense, so that an interrupted `dftool dispense_active` can
+be re-run as is.
+
+It's an append-only JSONL file in CSV_DIR. The first line identifies the
+dispense (chain, contracts, rewards). Next come the batches: the range of
+recipients in each. Then one line per event: a batch's tx was signed
+("sent"), mined ("confirmed") or reverted. A "sent" line is written before
+the tx is sent, with its hash and nonce. So after a crash, every tx that
+may be on chain is in the journal.
+
+On a re-run, the same batches are used, confirmed ones are skipped, and
+sent ones are re-checked against the chain first.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+from web3.exceptions import TransactionNotFound
+
+from df_py.util.typecheck import enforce_types
+
+
+@enforce_types
+def journal_filename(csv_dir: str, chainID: int, dfrewards_addr: str) -> str:
+    """Returns the journal of dispensing to a DFRewards contract"""
+    f = f"dispense_journal-{chainID}-{dfrewards_addr.lower()}.jsonl"
+    return os.path.join(csv_dir, f)
+
+
+@enforce_types
+def dispense_fingerprint(
+    chainID: int,
+    dfrewards_addr: str,
+    token_addr: str,
+    to_addrs: List[str],
+    values: List[int],
+) -> str:
+    """Returns a hash that identifies a dispense, to match it to its journal"""
+    s = json.dumps(
+        [
+            chainID,
+            dfrewards_addr.lower(),
+            token_addr.lower(),
+            [addr.lower() for addr in to_addrs],
+            [str(value) for value in values],
+        ]
+    )
+    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+
+
+class DispenseJournal:
+    """Confirmed batches, and the txs sent for the others, of one dispense"""
+
+    @enforce_types
+    def __init__(self, filename: str, fingerprint: str):
+        """
+        @description
+          Open the journal in filename, or start one.
+
+        @raises
+          ValueError -- if filename is the journal of a different dispense,
+            eg if the rewards changed since. Move it away to start over.
+        """
+        self.filename = filename
+        self._sends: Dict[int, List[dict]] = {}  # [batch_i] : "sent" entries
+        self._confirmed: Set[int] = set()
+        self.ranges: Optional[List[Tuple[int, int]]] = None  # batches
+
+        if not os.path.exists(filename):
+            self._append({"fingerprint": fingerprint})
+            return
+
+        entries = _read_entries(filename)  # drops a line torn by a crash
+        if not entries or entries[0].get("fingerprint") != fingerprint:
+            raise ValueError(
+                f"{filename} is the journal of a different dispense."
+                " If that dispense is done or abandoned, move the file away."
+            )
+        for entry in entries[1:]:
+            if entry["state"] == "ranges":
+                self.ranges = [tuple(r) for r in entry["ranges"]]
+            elif entry["state"] == "sent":
+                self._sends.setdefault(entry["batch"], []).append(entry)
+            elif entry["state"] == "confirmed":
+                self._confirmed.add(entry["batch"])
+
+    @enforce_types
+    def is_confirmed(self, batch_i: int) -> bool:
+        return batch_i in self._confirmed
+
+    @enforce_types
+    def sends(self, batch_i: int) -> List[dict]:
+        """Returns the "sent" entries of batch_i, oldest first"""
+        return self._sends.get(batch_i, [])
+
+    @enforce_types
+    def record_ranges(self, ranges: list):
+        """Record the batches, as (st, fin) ranges of recipients"""
+        self._append({"state": "ranges", "ranges": [list(r) for r in ranges]})
+        self.ranges = list(ranges)
+
+    @enforce_types
+    def record_sent(
+        self,
+        batch_i: int,
+        to_addrs: list,
+        values: list,
+        nonce: int,
+        tx_hash: str,
+    ):
+        """Record a tx for batch_i. Call it before sending the tx"""
+        entry = {
+            "batch": batch_i,
+            "state": "sent",
+            "n_addrs": len(to_addrs),
+            "first_addr": to_addrs[0],
+            "last_addr": to_addrs[-1],
+            "amount_wei": str(sum(values)),
+            "nonce": nonce,
+            "tx_hash": tx_hash,
+        }
+        self._append(entry)
+        self._sends.setdefault(batch_i, []).append(entry)
+
+    @enforce_types
+    def record_confirmed(self, batch_i: int):
+        self._append({"batch": batch_i, "state": "confirmed"})
+        self._confirmed.add(batch_i)
+
+    @enforce_types
+    def record_reverted(self, batch_i: int):
+        self._append({"batch": batch_i, "state": "reverted"})
+
+    def check_chain(self, web3):
+        """
+        @description
+          For each unconfirmed batch with sent txs, look up their receipts.
+          Record the batches whose tx got mined since, e.g. after a crash.
+        """
+        for batch_i, sends in self._sends.items():
+            if batch_i in self._confirmed:
+                continue
+            for entry in sends:
+                receipt = _get_receipt(web3, entry["tx_hash"])
+                if receipt is not None and receipt["status"] == 1:
+                    self.record_confirmed(batch_i)
+                    break
+
+    def _append(self, entry: dict):
+        # flush and fsync, so the entry survives a crash right after
+        with open(self.filename, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _read_entries(filename: str) -> List[dict]:
+    """Returns the journal's entries. Truncates a last line torn by a crash"""
+    with open(filename, "rb") as f:
+        data = f.read()
+    complete = data[: data.rfind(b"\n") + 1]
+    if len(complete) < len(data):
+        os.truncate(filename, len(complete))  # so the next entry is its own line
+    return [json.loads(line) for line in complete.decode("utf-8").splitlines()]
+
+
+def _get_receipt(web3, tx_hash: str):
+    """Returns the receipt of tx_hash, or None if it's not mined"""
+    try:
+        return web3.eth.get_transaction_receipt(tx_hash)
+    except TransactionNotFound:
+        return None
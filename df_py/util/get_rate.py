@@ -1,19 +1,78 @@
+"""
+Exchange rates, USD per token.
+
+get_rate and get_rates average daily closes, which are kept in a persistent
+local store. A day's close doesn't change once the day is over, so only
+days the store doesn't have are fetched: from Binance, with CoinGecko as
+backup. Past weeks need no network after the first fetch.
+"""
+
+import functools
 import json
 import os
-from datetime import datetime, timedelta
-from typing import List, Union
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple, Union
 
 import requests
-from enforce_typing import enforce_types
 
+from df_py.util import disk_cache
 from df_py.util.blocktime import timestr_to_timestamp
+from df_py.util.typecheck import enforce_types
+
+PRICES_FILENAME = "daily_prices.json"
+MAX_WORKERS = 4
+BINANCE_KLINES_LIMIT = 1000  # most klines Binance returns per request
+H2O_RATE = 1.618
+
+
+class PriceStore:
+    """Persistent dict of [token_symbol][YYYY-MM-DD] : close, USD_per_token"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._closes: Dict[str, Dict[str, float]] = disk_cache.load_json(filename, {})
+
+    @classmethod
+    def load(cls) -> "PriceStore":
+        return cls(disk_cache.cache_filename(PRICES_FILENAME))
+
+    def lookup(
+        self, token_symbol: str, days: List[str]
+    ) -> Tuple[Dict[str, float], List[str]]:
+        """
+        @return
+          closes -- dict of [day] : close, for the days the store has
+          missing_days -- the other days
+        """
+        closes = self._closes.get(token_symbol.upper(), {})
+        found = {day: closes[day] for day in days if day in closes}
+        return found, [day for day in days if day not in closes]
+
+    def update(self, token_symbol: str, closes: Dict[str, float]):
+        self._closes.setdefault(token_symbol.upper(), {}).update(closes)
+
+    def save(self):
+        """Save the closes of past days, merged with what's on disk"""
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+        def merge(data: dict) -> dict:
+            # other processes may have saved since we loaded, eg backfill's
+            for token_symbol, closes in self._closes.items():
+                data.setdefault(token_symbol, {}).update(
+                    {day: close for day, close in closes.items() if day < today}
+                )
+            return data
+
+        disk_cache.locked_update(self.filename, merge, {})
 
 
 @enforce_types
 def get_rate(token_symbol: str, st: str, fin: str) -> Union[float, None]:
     """
     @description
-      Get the exchange rate for a token. Uses Binance. Coingecko is backup.
+      Get the exchange rate for a token: its average daily close, from st
+      to fin. Uses Binance. Coingecko is backup. See get_rates.
 
     @arguments
       token_symbol -- str -- e.g. "OCEAN" or "H2O"
@@ -23,17 +82,178 @@ def get_rate(token_symbol: str, st: str, fin: str) -> Union[float, None]:
     @return
       rate -- float or None -- USD_per_token. None if failure
     """
-    rate = get_binance_rate(token_symbol, st, fin)
-    if rate is not None:
-        return rate
+    return get_rates([token_symbol], st, fin)[token_symbol]
+
+
+@enforce_types
+def get_rates(
+    token_symbols: List[str], st: str, fin: str
+) -> Dict[str, Union[float, None]]:
+    """
+    @description
+      Get the exchange rates for several tokens. Fills the local price
+      store first, fetching all tokens' missing days concurrently.
+
+    @return
+      rates -- dict of [token_symbol] : float or None -- USD_per_token.
+        None if failure
+    """
+    days = _days(st, fin)
+    store = fill_price_store(token_symbols, st, fin)
+    rates: Dict[str, Union[float, None]] = {}
+    for token_symbol in token_symbols:
+        if token_symbol.upper() == "H2O":  # corner case
+            rates[token_symbol] = H2O_RATE
+            continue
+        closes, missing_days = store.lookup(token_symbol, days)
+        if missing_days:
+            print(f"No {token_symbol} price for {len(missing_days)} days")
+        if not closes:
+            print(f"Couldn't get {token_symbol} prices. Returning None")
+            rates[token_symbol] = None
+            continue
+        rates[token_symbol] = sum(closes.values()) / len(closes)
+    return rates
+
+
+@enforce_types
+def fill_price_store(token_symbols: List[str], st: str, fin: str) -> PriceStore:
+    """
+    @description
+      Fetch the daily closes from st to fin that the price store is
+      missing, for all token_symbols concurrently, and save them.
+
+    @return
+      store -- the PriceStore, filled
+    """
+    days = _days(st, fin)
+    store = PriceStore.load()
+    missing = {}  # [token_symbol] : missing days
+    for token_symbol in token_symbols:
+        _, missing_days = store.lookup(token_symbol, days)
+        if missing_days and token_symbol.upper() != "H2O":
+            missing[token_symbol] = missing_days
+    if not missing:
+        return store
+
+    print(f"Fetching prices of {sorted(missing)}")
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(missing))) as pool:
+        results = pool.map(lambda item: _fetch_daily_closes(*item), missing.items())
+        for token_symbol, closes in zip(missing, results):
+            store.update(token_symbol, closes)
+    store.save()
+    return store
+
+
+@enforce_types
+def _fetch_daily_closes(token_symbol: str, days: List[str]) -> Dict[str, float]:
+    """Returns dict of [day] : close, for the days of days that can be found"""
+    closes = get_binance_daily_closes(token_symbol, days[0], days[-1])
+    closes = {day: closes[day] for day in days if day in closes}
+    missing_days = [day for day in days if day not in closes]
+    if missing_days:
+        print(f"Couldn't get all {token_symbol} Binance data; trying CoinGecko")
+        cg_closes = get_coingecko_daily_closes(
+            token_symbol, missing_days[0], missing_days[-1]
+        )
+        closes.update({day: cg_closes[day] for day in missing_days if day in cg_closes})
+    return closes
+
+
+@enforce_types
+def _days(st: str, fin: str) -> List[str]:
+    """Returns days from st to fin, as "YYYY-MM-DD". At least two days, like
+    the klines get_binance_rate averages"""
+    st_dt = _utc_day(timestr_to_timestamp(st))
+    fin_dt = _utc_day(timestr_to_timestamp(fin))
+    if st_dt > fin_dt:
+        raise ValueError("Start date is after end date")
+    if st_dt == fin_dt:
+        st_dt -= timedelta(days=1)
+    n_days = (fin_dt - st_dt).days + 1
+    return [(st_dt + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(n_days)]
+
+
+def _utc_day(timestamp: float) -> datetime:
+    dt = datetime.fromtimestamp(timestamp, timezone.utc)
+    return datetime(dt.year, dt.month, dt.day)
+
+
+@enforce_types
+def get_binance_daily_closes(
+    token_symbol: str, st_day: str, fin_day: str, target_currency="USDT"
+) -> Dict[str, float]:
+    """
+    @arguments
+      token_symbol -- e.g. "OCEAN", "BTC"
+      st_day, fin_day -- first and last day, "YYYY-MM-DD"
+      target_currency -- e.g. "USDT", "BTC"
+    @return
+      closes -- dict of [day] : close, target_currency_per_token. Only the
+        days Binance has; empty if failure
+    """
+    url_base = os.getenv("BINANCE_API_URL", "https://api.binance.com")
+    url = url_base + "/api/v3/klines"
+    start_time_unix = int(timestr_to_timestamp(st_day)) * 1000
+    end_time_unix = int(timestr_to_timestamp(fin_day)) * 1000
+
+    closes: Dict[str, float] = {}
+    try:
+        while start_time_unix <= end_time_unix:
+            params = {
+                "symbol": token_symbol + target_currency,
+                "interval": "1d",
+                "startTime": start_time_unix,
+                "endTime": end_time_unix,
+                "limit": BINANCE_KLINES_LIMIT,
+            }
+            res = requests.get(url, params=params, timeout=30)
+            data = res.json()
+            if not isinstance(data, list) or not data:
+                break
+            for kline in data:  # [open_time_ms, open, high, low, close, ..]
+                day = _utc_day(kline[0] / 1000).strftime("%Y-%m-%d")
+                closes[day] = float(kline[4])
+            if len(data) < BINANCE_KLINES_LIMIT:
+                break
+            start_time_unix = int(data[-1][0]) + 86400 * 1000
+    # pylint: disable=broad-exception-caught
+    except Exception as e:
+        print(f"Error in get_binance_daily_closes: {e}")
+    return closes
 
-    print("Couldn't get Binance data; trying CoinGecko")
-    rate = get_coingecko_rate(token_symbol, st, fin)
-    if rate is not None:
-        return rate
 
-    print("Couldn't get CoinGecko data. Returning None")
-    return None
+@enforce_types
+def get_coingecko_daily_closes(
+    token_symbol: str, st_day: str, fin_day: str
+) -> Dict[str, float]:
+    """
+    @arguments
+      token_symbol -- e.g. "OCEAN", "BTC"
+      st_day, fin_day -- first and last day, "YYYY-MM-DD"
+    @return
+      closes -- dict of [day] : last price of the day, USD_per_token. Only
+        the days CoinGecko has; empty if failure
+    """
+    cg_id = _coingecko_id(token_symbol)
+    if cg_id == "":
+        print(f"Couldn't find Coingecko ID for {token_symbol}")
+        return {}
+    st_s = int(timestr_to_timestamp(st_day))
+    fin_s = int(timestr_to_timestamp(fin_day)) + 86400
+    req_s = f"https://api.coingecko.com/api/v3/coins/{cg_id}/market_chart/range?vs_currency=usd&from={st_s}&to={fin_s}"  # pylint: disable=line-too-long
+
+    closes: Dict[str, float] = {}
+    try:
+        res = requests.get(req_s, timeout=30)
+        for timestamp_ms, price in res.json().get("prices") or []:  # sorted
+            day = _utc_day(timestamp_ms / 1000).strftime("%Y-%m-%d")
+            if st_day <= day <= fin_day:
+                closes[day] = float(price)
+    # pylint: disable=broad-exception-caught
+    except Exception as e:
+        print(f"Error in get_coingecko_daily_closes: {e}")
+    return closes
 
 
 @enforce_types
@@ -146,9 +366,12 @@ def get_coingecko_rate(token_symbol: str, st: str, fin: str) -> Union[float, Non
 @enforce_types
 def _coingecko_id(token_symbol: str) -> str:
     """Convert token_symbol to coingecko id for a few common tokens"""
-    id_ = token_symbol.lower()
+    return _coingecko_ids().get(token_symbol.lower(), "")
 
-    all_tokens = None
+
+@functools.lru_cache(maxsize=None)
+def _coingecko_ids() -> Dict[str, str]:
+    """Returns dict of [symbol] : coingecko id. Loaded once"""
     # Load json file from ./data/coingecko_ids.json relative to this file
     dirname = os.path.dirname(__file__)
     datapath = "../../data/coingecko_ids.json"
@@ -156,8 +379,7 @@ def _coingecko_id(token_symbol: str) -> str:
     with open(filepath, "r") as f:
         all_tokens = json.load(f)
 
+    ids: Dict[str, str] = {}
     for token in all_tokens:
-        if token["symbol"] == id_:
-            return token["id"]
-
-    return ""
+        ids.setdefault(token["symbol"], token["id"])  # first one wins
+    return ids
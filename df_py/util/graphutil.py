@@ -2,12 +2,23 @@ import time
 
 import requests
 
-from df_py.util import networkutil
+from df_py.util import instrument, networkutil, subgraph_replay
 
 MAX_WAIT = 60 * 15
 
 
 def submit_query(query: str, chainID: int) -> dict:
+    with instrument.timer("subgraph_query", chain=chainID):
+        return _submit_query(query, chainID)
+
+
+def _submit_query(query: str, chainID: int) -> dict:
+    mode = subgraph_replay.get_mode()
+    if mode is not None and mode.action == "replay":
+        return subgraph_replay.load_response(
+            mode.fixture_dir, query, chainID, mode.latency
+        )
+
     subgraph_url = networkutil.chain_id_to_subgraph_uri(chainID)
     request = requests.post(subgraph_url, "", json={"query": query}, timeout=30)
 
@@ -15,7 +26,10 @@ def submit_query(query: str, chainID: int) -> dict:
         # pylint: disable=broad-exception-raised
         raise Exception(f"Query failed. Return code is {request.status_code}\n{query}")
 
+    instrument.inc("subgraph_bytes", len(request.content), chain=chainID)
     result = request.json()
+    if mode is not None and mode.action == "record":
+        subgraph_replay.save_response(mode.fixture_dir, query, chainID, result)
 
     return result
 
@@ -4,6 +4,7 @@
 #
 from web3 import HTTPProvider, WebsocketProvider
 
+from df_py.util import instrument
 from df_py.util.request import make_post_request
 
 
@@ -17,9 +18,11 @@ class CustomHTTPProvider(HTTPProvider):
             "Making request HTTP. URI: %s, Method: %s", self.endpoint_uri, method
         )
         request_data = self.encode_rpc_request(method, params)
-        raw_response = make_post_request(
-            self.endpoint_uri, request_data, **self.get_request_kwargs()
-        )
+        with instrument.timer("rpc", method=method):
+            raw_response = make_post_request(
+                self.endpoint_uri, request_data, **self.get_request_kwargs()
+            )
+        instrument.inc("rpc_bytes", len(raw_response), method=method)
         response = self.decode_rpc_response(raw_response)
         self.logger.debug(
             "Getting response HTTP. URI: %s, Method: %s, Response: %s",
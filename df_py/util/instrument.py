@@ -0,0 +1,128 @@
+"""
+Counters and timers for a dftool run: RPC calls, subgraph queries, bytes
+received, tables loaded, and seconds per step.
+
+Hooks call inc(), set_gauge() and timer(); each is a dict update under a
+lock, so it's cheap enough to leave on, and thread-safe. At the end of a
+dftool command, write_reports() writes what was recorded:
+- as json, appended as one line to the file in envvar DFPY_METRICS_JSON,
+  if set. So a run of many dftool commands, eg all.sh, keeps them all.
+- as a Prometheus textfile dftool_<command>.prom, in the dir in envvar
+  DFPY_METRICS_PROM, if set. Point it at node_exporter's textfile
+  collector dir, eg /var/lib/node_exporter/textfile, to track runs over
+  time. Each command has its own file, so one doesn't replace another's.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+PROM_PREFIX = "dfpy_"
+
+_LOCK = threading.Lock()
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]  # (name, sorted labels)
+_VALUES: Dict[_Key, float] = {}
+_TYPES: Dict[str, str] = {}  # [name] : "counter" or "gauge"
+
+
+def inc(name: str, value: float = 1.0, **labels):
+    """Add value to counter name"""
+    key = _key(name, labels)
+    with _LOCK:
+        _TYPES[name] = "counter"
+        _VALUES[key] = _VALUES.get(key, 0.0) + value
+
+
+def set_gauge(name: str, value: float, **labels):
+    key = _key(name, labels)
+    with _LOCK:
+        _TYPES[name] = "gauge"
+        _VALUES[key] = float(value)
+
+
+@contextmanager
+def timer(name: str, **labels):
+    """Count the block's calls in <name>_calls, and its time in <name>_seconds"""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        inc(f"{name}_seconds", time.perf_counter() - t0, **labels)
+        inc(f"{name}_calls", **labels)
+
+
+def metrics() -> List[dict]:
+    """Returns list of {name, labels, type, value}, sorted by name"""
+    with _LOCK:
+        items = sorted(_VALUES.items())
+        types = dict(_TYPES)
+    return [
+        {"name": name, "labels": dict(labels), "type": types[name], "value": value}
+        for (name, labels), value in items
+    ]
+
+
+def merge(other_metrics: List[dict]):
+    """Add metrics() of eg a worker process: sum counters, take gauges"""
+    for m in other_metrics:
+        if m["type"] == "counter":
+            inc(m["name"], m["value"], **m["labels"])
+        else:
+            set_gauge(m["name"], m["value"], **m["labels"])
+
+
+def reset():
+    with _LOCK:
+        _VALUES.clear()
+        _TYPES.clear()
+
+
+def report(command: str) -> dict:
+    return {"command": command, "time": int(time.time()), "metrics": metrics()}
+
+
+def prometheus_text(command: str) -> str:
+    """Returns the metrics in Prometheus text format, labeled with command"""
+    lines = []
+    typed = set()
+    for m in metrics():
+        name = PROM_PREFIX + m["name"]
+        if name not in typed:
+            lines.append(f"# TYPE {name} {m['type']}")
+            typed.add(name)
+        labels = {"command": command, **m["labels"]}
+        label_s = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+        lines.append(f"{name}{{{label_s}}} {m['value']!r}")
+    return "\n".join(lines) + "\n"
+
+
+def write_reports(command: str):
+    """Write the json and Prometheus reports, if their envvars are set"""
+    json_file = os.getenv("DFPY_METRICS_JSON")
+    if json_file:
+        with open(json_file, "a") as f:
+            f.write(json.dumps(report(command)) + "\n")
+    prom_dir = os.getenv("DFPY_METRICS_PROM")
+    if prom_dir:
+        os.makedirs(prom_dir, exist_ok=True)
+        prom_file = os.path.join(prom_dir, f"dftool_{command}.prom")
+        _write_atomic(prom_file, prometheus_text(command))
+
+
+def _key(name: str, labels: dict) -> _Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _write_atomic(filename: str, text: str):
+    # so that a collector never reads a half-written file
+    tmp_filename = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp_filename, "w") as f:
+        f.write(text)
+    os.replace(tmp_filename, filename)
@@ -8,7 +8,8 @@ formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
 stdout_handler = logging.StreamHandler(sys.stdout)
 stdout_handler.setFormatter(formatter)
 
-file_handler = logging.FileHandler("/tmp/dfpy.log")
+# delay: don't open the log file until something is logged
+file_handler = logging.FileHandler("/tmp/dfpy.log", delay=True)
 file_handler.setFormatter(formatter)
 
 
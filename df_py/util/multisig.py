@@ -1,10 +1,38 @@
 import json
 import os
 
+# pylint: disable=logging-fstring-interpolation
+from typing import List, NamedTuple
+
 import requests
+from eth_abi import encode
+from web3.main import Web3
 
 from df_py.util import networkutil
 from df_py.util.contract_base import ContractBase
+from df_py.util.logger import logger
+
+# Safe's MultiSendCallOnly v1.3.0, to bundle calls into one Safe tx. Chains
+# where Safe is deployed with EIP-155 txs have it at another address.
+# Override with envvar MULTISEND_ADDR
+MULTISEND_ADDR = "0x40A2aCCbd92BCA938b02010E17A5b8929b49130D"
+MULTISEND_ADDRS = {
+    23294: "0xA1dabEF33b3B82c7814B6D82A79e50F4AC44102B",
+    23295: "0xA1dabEF33b3B82c7814B6D82A79e50F4AC44102B",
+}
+
+# a bundle is executed in one tx, so it must fit in a block, with room to spare
+MAX_BUNDLE_GAS = 15_000_000
+DEFAULT_CALL_GAS = 200_000
+
+CALL, DELEGATECALL = 0, 1  # Safe tx operations
+
+
+class SafeCall(NamedTuple):
+    to: str
+    data: str  # calldata, hex
+    value: int = 0
+    gas: int = DEFAULT_CALL_GAS  # upper bound; used to split bundles
 
 
 def get_safe_nonce(multisig_address, chain_id):
@@ -25,8 +53,76 @@ def get_safe_nonce(multisig_address, chain_id):
 
 
 def send_multisig_tx(multisig_address, web3, to, value, data):
+    nonce = get_safe_nonce(multisig_address, web3.eth.chain_id)
+    _propose_safe_tx(multisig_address, web3, to, value, data, CALL, nonce)
+
+
+def send_multisig_txs(
+    multisig_address, web3, calls: List[SafeCall], max_gas: int = MAX_BUNDLE_GAS
+):
+    """
+    @description
+      Propose calls to the Safe, bundled with MultiSend: one Safe tx per
+      chunk of calls that fits in max_gas. So signers approve a few txs,
+      not one per call. Calls keep their order, also across chunks.
+
+      Gets the Safe nonce once; chunks get consecutive nonces.
+    """
+    if not calls:
+        return
+    chunks = chunk_calls(calls, max_gas)
+    nonce = get_safe_nonce(multisig_address, web3.eth.chain_id)
+    logger.info(f"Proposing {len(calls)} calls in {len(chunks)} Safe txs")
+    for i, chunk in enumerate(chunks):
+        if len(chunk) == 1:
+            call, op = chunk[0], CALL
+        else:  # MultiSend must run in the Safe's context
+            call = SafeCall(multisend_addr(web3.eth.chain_id), encode_multisend(chunk))
+            op = DELEGATECALL
+        _propose_safe_tx(
+            multisig_address, web3, call.to, call.value, call.data, op, nonce + i
+        )
+
+
+def chunk_calls(calls: List[SafeCall], max_gas: int) -> List[List[SafeCall]]:
+    """Split calls, in order, into chunks of at most max_gas each.
+    A call that needs more than max_gas on its own gets its own chunk."""
+    chunks: List[List[SafeCall]] = []
+    gas = 0
+    for call in calls:
+        if not chunks or gas + call.gas > max_gas:
+            chunks.append([])
+            gas = 0
+        chunks[-1].append(call)
+        gas += call.gas
+    return chunks
+
+
+def encode_multisend(calls: List[SafeCall]) -> str:
+    """Returns calldata of MultiSend.multiSend(transactions) for calls"""
+    packed = b""
+    for call in calls:
+        data = bytes.fromhex(call.data[2:])
+        packed += (
+            CALL.to_bytes(1, "big")
+            + bytes.fromhex(call.to[2:])
+            + call.value.to_bytes(32, "big")
+            + len(data).to_bytes(32, "big")
+            + data
+        )
+    selector = Web3.keccak(text="multiSend(bytes)")[:4]
+    args = encode(["bytes"], [packed])
+    return "0x" + (selector + args).hex()
+
+
+def multisend_addr(chain_id: int) -> str:
+    return os.getenv("MULTISEND_ADDR") or MULTISEND_ADDRS.get(chain_id, MULTISEND_ADDR)
+
+
+# pylint: disable=too-many-positional-arguments
+def _propose_safe_tx(multisig_address, web3, to, value, data, operation, nonce):
+    """Sign a Safe tx, and propose it to the Safe tx service"""
     chain_id = web3.eth.chain_id
-    nonce = get_safe_nonce(multisig_address, chain_id)
     BASE_URL = networkutil.chain_id_to_multisig_uri(chain_id)
     API_URL = f"{BASE_URL}/api/v1/safes/{multisig_address}/multisig-transactions/"
     contract = ContractBase(web3, "IGnosisSafe", multisig_address)
@@ -36,7 +132,7 @@ def send_multisig_tx(multisig_address, web3, to, value, data):
         to,
         value,
         data,
-        0,
+        operation,
         gas,
         gas,
         gasPrice,
@@ -57,7 +153,7 @@ def send_multisig_tx(multisig_address, web3, to, value, data):
         "baseGas": gas,
         "gasPrice": gasPrice,
         "nonce": nonce,
-        "operation": 0,
+        "operation": operation,
         "from": multisig_address,
         "to": to,
         "sender": sender_address,
@@ -1,11 +1,14 @@
 import os
-from typing import Union
-
-from enforce_typing import enforce_types
-from web3.main import Web3
+from typing import TYPE_CHECKING, Union
 
 from df_py.util.constants import MULTISIG_ADDRS
-from df_py.util.web3 import get_rpc_url, get_web3
+from df_py.util.typecheck import enforce_types
+
+if TYPE_CHECKING:
+    from web3.main import Web3
+
+# df_py.util.web3 is imported where it's used: importing web3 takes ~1 s, and
+# dftool imports this module just to parse arguments
 
 _BARGE_ADDRESS_FILE = "~/.ocean/ocean-contracts/artifacts/address.json"
 
@@ -88,8 +91,11 @@ def chain_id_to_network(chainID: int) -> str:
 
 
 @enforce_types
-def chain_id_to_web3(chainID: int) -> Web3:
+def chain_id_to_web3(chainID: int) -> "Web3":
     """Returns the web3 instance for a given chainID"""
+    # pylint: disable=import-outside-toplevel
+    from df_py.util.web3 import get_rpc_url, get_web3
+
     network_name = _CHAINID_TO_NETWORK[chainID]
     return get_web3(get_rpc_url(network_name))
 
@@ -97,6 +103,9 @@ def chain_id_to_web3(chainID: int) -> Web3:
 @enforce_types
 def chain_id_to_rpc_url(chainID: int) -> str:
     """Returns the web3 instance for a given chainID"""
+    # pylint: disable=import-outside-toplevel
+    from df_py.util.web3 import get_rpc_url
+
     network_name = _CHAINID_TO_NETWORK[chainID]
     return get_rpc_url(network_name)
 
@@ -2,12 +2,12 @@ import os
 import random
 import time
 
-from enforce_typing import enforce_types
 from eth_account import Account
 from web3.main import Web3
 
 from df_py.util import constants, networkutil, oceanutil
 from df_py.util.base18 import from_wei, to_wei
+from df_py.util.typecheck import enforce_types
 
 # pool constants
 NUM_STAKERS_PER_POOL = 2  # 3
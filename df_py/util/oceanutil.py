@@ -1,9 +1,9 @@
+import functools
 import hashlib
 import json
 from collections import namedtuple
 from typing import Any, Dict, List, Tuple
 
-from enforce_typing import enforce_types
 from web3.logs import DISCARD
 from web3.main import Web3
 
@@ -11,8 +11,12 @@ from df_py.util import networkutil
 from df_py.util.base18 import to_wei
 from df_py.util.constants import CONTRACTS, ZERO_ADDRESS
 from df_py.util.contract_base import ContractBase
+from df_py.util.typecheck import enforce_types
 from df_py.util.web3 import get_rpc_url, get_web3
 
+CHECKSUM_CACHE_SIZE = 2**17  # addresses
+DID_CACHE_SIZE = 2**17  # (nft_addr, chainID) pairs
+
 
 @enforce_types
 def _contracts(key: str, chainID):
@@ -420,13 +424,55 @@ def to_32byte_hex(val: int) -> str:
 
 @enforce_types
 def calc_did(nft_addr: str, chainID: int) -> str:
-    nft_addr2 = Web3.to_checksum_address(nft_addr)
+    # dids don't depend on address casing, so cache on the lowercase address
+    return _calc_did(nft_addr.lower(), chainID)
+
+
+@enforce_types
+def calc_dids(chainID: int, nft_addrs: List[str]) -> Dict[str, str]:
+    """
+    @description
+      Compute the did of many nfts at once. Each address is hashed once.
+
+    @return
+      dids -- dict of [nft_addr] : did, keyed by the given nft_addrs
+    """
+    return {nft_addr: _calc_did(nft_addr.lower(), chainID) for nft_addr in nft_addrs}
+
+
+@functools.lru_cache(maxsize=DID_CACHE_SIZE)
+def _calc_did(nft_addr: str, chainID: int) -> str:
+    nft_addr2 = _checksum_addr(nft_addr)
 
     # adapted from ocean.py/ocean_lib/ocean/ocean_assets.py
     did = f"did:op:{create_checksum(nft_addr2 + str(chainID))}"
     return did
 
 
+@enforce_types
+def checksum_addr(addr: str) -> str:
+    """
+    @description
+      Web3.to_checksum_address, memoized. Each checksum is a keccak, and
+      loaders and query loops see the same (LP) addresses over and over.
+
+    @return
+      checksum_addr -- str
+    """
+    return _checksum_addr(addr.lower())
+
+
+@enforce_types
+def checksum_addrs(addrs: List[str]) -> List[str]:
+    """Like checksum_addr, for a list of addresses"""
+    return [_checksum_addr(addr.lower()) for addr in addrs]
+
+
+@functools.lru_cache(maxsize=CHECKSUM_CACHE_SIZE)
+def _checksum_addr(addr: str) -> str:
+    return Web3.to_checksum_address(addr)
+
+
 # from ocean.py/ocean_lib/utils/utilities.py
 @enforce_types
 def create_checksum(text: str) -> str:
@@ -1,6 +1,6 @@
 import time
 
-from enforce_typing import enforce_types
+from df_py.util.typecheck import enforce_types
 
 
 @enforce_types
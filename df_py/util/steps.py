@@ -0,0 +1,101 @@
+"""
+The data steps of dftool, callable in-process: query or compute one thing,
+and save it to csv_dir.
+
+The dftool commands, `dftool backfill` and `dftool weekly` all use these.
+"""
+
+import os
+import shutil
+from datetime import datetime
+from typing import Callable, List
+
+from df_py.util import get_rate, instrument, tables
+from df_py.util.retry import retry_function
+from df_py.util.typecheck import enforce_types
+from df_py.util.vesting_schedule import get_active_reward_amount_for_week_eth_by_stream
+from df_py.volume import csvs, queries
+
+S_PER_WEEK = 7 * 86400
+
+
+def run_step(outputs: List[str], step: Callable, *args) -> bool:
+    """
+    @description
+      Run step(*args), unless all of its output tables exist. Outputs left by an
+      interrupted run are removed first, so the step can re-save them.
+
+    @return
+      ran -- did the step run?
+    """
+    if all(tables.table_exists(output) for output in outputs):
+        return False
+    for output in outputs:
+        filename = tables.find_table(output)
+        if filename is not None:
+            os.remove(filename)
+    with instrument.timer("step", step=step.__name__):
+        step(*args)
+    return True
+
+
+@enforce_types
+def save_rate(token_symbol: str, st: str, fin: str, csv_dir: str, retries: int):
+    """Save rate-TOKEN_SYMBOL.csv. If there's no rate, print so and save nothing"""
+    rate = retry_function(get_rate.get_rate, retries, 60, token_symbol, st, fin)
+    if rate is None:
+        print(f"No rate for {token_symbol} from {st} to {fin}; skipping it")
+        return
+    csvs.save_rate_csv(token_symbol, rate, csv_dir)
+
+
+@enforce_types
+def copy_table(src_csv_file: str, dst_csv_file: str):
+    """Copy a table, in whichever format it's stored in"""
+    src = tables.find_table(src_csv_file)
+    assert src is not None, f"no table {src_csv_file}"
+    ext = os.path.splitext(src)[1][1:]
+    shutil.copyfile(src, tables.format_filename(dst_csv_file, ext))
+
+
+def save_volsym(rng, csv_dir: str, chain_id: int, retries: int):
+    """Save nftvols-CHAINID.csv, owners-CHAINID.csv, symbols-CHAINID.csv"""
+    Vi, Ci, SYMi = retry_function(
+        queries.queryVolsOwnersSymbols, retries, 60, rng, chain_id
+    )
+    csvs.save_nftvols_csv(Vi, csv_dir, chain_id)
+    csvs.save_owners_csv(Ci, csv_dir, chain_id)
+    csvs.save_symbols_csv(SYMi, csv_dir, chain_id)
+
+
+def save_allocations(
+    rng, csv_dir: str, chain_id: int, retries: int, sampled: bool = True
+):
+    """Save allocations.csv, or allocations_realtime.csv if not sampled"""
+    allocs = retry_function(queries.queryAllocations, retries, 10, rng, chain_id)
+    csvs.save_allocation_csv(allocs, csv_dir, sampled)
+
+
+def save_vebals(rng, csv_dir: str, chain_id: int, retries: int, sampled: bool = True):
+    """Save vebals.csv, or vebals_realtime.csv if not sampled"""
+    balances, locked_amt, unlock_time = retry_function(
+        queries.queryVebalances, retries, 10, rng, chain_id
+    )
+    csvs.save_vebals_csv(balances, locked_amt, unlock_time, csv_dir, sampled)
+
+
+@enforce_types
+def save_passive(chain_id: int, timestamp: int, csv_dir: str):
+    """Save passive.csv, for the week of timestamp. Needs vebals_realtime.csv"""
+    timestamp = timestamp // S_PER_WEEK * S_PER_WEEK
+    vebals, _, _ = csvs.load_vebals_csv(csv_dir, False)
+    balances, rewards = queries.queryPassiveRewards(
+        chain_id, timestamp, list(vebals.keys())
+    )
+    csvs.save_passive_csv(rewards, balances, csv_dir)
+
+
+@enforce_types
+def calc_tot_ocean(start_date: datetime, substream: str) -> float:
+    """Returns the OCEAN to give out in the week of start_date, per vesting"""
+    return get_active_reward_amount_for_week_eth_by_stream(start_date, substream)
@@ -0,0 +1,172 @@
+"""
+Record subgraph responses, then replay them without a subgraph.
+
+While envvar DFPY_SUBGRAPH_RECORD=<dir> is set, graphutil.submit_query
+saves each response into fixture dir <dir>. While DFPY_SUBGRAPH_REPLAY=<dir>
+is set, it serves responses from <dir> instead, with no network. Envvar
+DFPY_SUBGRAPH_LATENCY=<seconds> adds a delay per replayed query, like a
+real subgraph's. recording() and replaying() do the same, in-process.
+
+So query code can be benchmarked and regression-tested offline, against
+responses recorded once from a real subgraph.
+
+To serve a fixture dir over HTTP instead, eg in place of Barge's subgraph:
+
+  python -m df_py.util.subgraph_replay FIXTURE_DIR [PORT] [LATENCY] [CHAINID]
+
+A fixture dir has one json file per (chainID, query). Queries match with
+whitespace collapsed, so indentation doesn't matter.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple, Optional
+
+from df_py.util import disk_cache
+from df_py.util.networkutil import DEV_CHAINID
+from df_py.util.typecheck import enforce_types
+
+DEFAULT_PORT = 9000  # Barge's subgraph
+
+
+class Mode(NamedTuple):
+    action: str  # "record" or "replay"
+    fixture_dir: str
+    latency: float = 0.0  # s per replayed query
+
+
+_MODE: Optional[Mode] = None  # set by recording() and replaying()
+
+
+def get_mode() -> Optional[Mode]:
+    """Returns the current mode, or None to query the subgraph as usual"""
+    if _MODE is not None:
+        return _MODE
+    latency = float(os.getenv("DFPY_SUBGRAPH_LATENCY", "0"))
+    if os.getenv("DFPY_SUBGRAPH_REPLAY"):
+        return Mode("replay", os.environ["DFPY_SUBGRAPH_REPLAY"], latency)
+    if os.getenv("DFPY_SUBGRAPH_RECORD"):
+        return Mode("record", os.environ["DFPY_SUBGRAPH_RECORD"])
+    return None
+
+
+@contextmanager
+def recording(fixture_dir: str):
+    """Record subgraph responses into fixture_dir, within the block"""
+    with _mode(Mode("record", fixture_dir)):
+        yield
+
+
+@contextmanager
+def replaying(fixture_dir: str, latency: float = 0.0):
+    """Serve subgraph responses from fixture_dir, within the block"""
+    with _mode(Mode("replay", fixture_dir, latency)):
+        yield
+
+
+@contextmanager
+def _mode(mode: Mode):
+    global _MODE
+    prev_mode, _MODE = _MODE, mode
+    try:
+        yield
+    finally:
+        _MODE = prev_mode
+
+
+@enforce_types
+def fixture_filename(fixture_dir: str, query: str, chainID: int) -> str:
+    normalized_query = " ".join(query.split())
+    key = hashlib.sha256(f"{chainID}:{normalized_query}".encode("utf-8"))
+    return os.path.join(fixture_dir, f"{key.hexdigest()[:32]}.json")
+
+
+@enforce_types
+def save_response(fixture_dir: str, query: str, chainID: int, response: dict):
+    os.makedirs(fixture_dir, exist_ok=True)
+    disk_cache.save_json(
+        fixture_filename(fixture_dir, query, chainID),
+        {"chainID": chainID, "query": query, "response": response},
+    )
+
+
+@enforce_types
+def load_response(
+    fixture_dir: str, query: str, chainID: int, latency: float = 0.0
+) -> dict:
+    """
+    @description
+      Return the recorded response to query, after sleeping latency s.
+
+    @raises
+      KeyError -- if the query wasn't recorded
+    """
+    filename = fixture_filename(fixture_dir, query, chainID)
+    if not os.path.exists(filename):
+        raise KeyError(
+            f"No response to this query on chain {chainID} in {fixture_dir}."
+            f" Record it first, with DFPY_SUBGRAPH_RECORD.\n{query}"
+        )
+    with open(filename, "r") as f:
+        response = json.load(f)["response"]
+    if latency > 0:
+        time.sleep(latency)
+    return response
+
+
+@enforce_types
+def make_server(
+    fixture_dir: str,
+    port: int = DEFAULT_PORT,
+    latency: float = 0.0,
+    chainID: int = DEV_CHAINID,
+) -> ThreadingHTTPServer:
+    """
+    @description
+      HTTP server that answers subgraph POSTs from fixture_dir, as if it
+      were chainID's subgraph. Unrecorded queries get a 404.
+      Call serve_forever() on it. Port 0 picks a free port.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):  # pylint: disable=invalid-name
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            query = json.loads(body)["query"]
+            try:
+                response = load_response(fixture_dir, query, chainID, latency)
+                status = 200
+            except KeyError as e:
+                response, status = {"errors": [{"message": str(e)}]}, 404
+            data = json.dumps(response).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            pass  # one line per query is too much
+
+    return ThreadingHTTPServer(("127.0.0.1", port), Handler)
+
+
+def main(argv):
+    if len(argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    fixture_dir = argv[1]
+    port = int(argv[2]) if len(argv) > 2 else DEFAULT_PORT
+    latency = float(argv[3]) if len(argv) > 3 else 0.0
+    chainID = int(argv[4]) if len(argv) > 4 else DEV_CHAINID
+    server = make_server(fixture_dir, port, latency, chainID)
+    print(f"Serving subgraph responses from {fixture_dir} on port {port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,197 @@
+"""
+Storage for the tables that dftool steps pass to each other: allocations,
+vebals, nftvols, owners, symbols, rates, rewards, predictoor data.
+
+A table is named by its csv filename, e.g. "<csv_dir>/allocations.csv".
+It's stored as csv by default, because df-sql reads the csvs. Set envvar
+DFTOOL_TABLE_FORMAT=parquet to store it as parquet instead; that needs
+pyarrow, and parquet files are memory-mapped when loaded. Loaders find a
+table in either format, so a csv_dir may mix them.
+
+Tables load as whole typed columns (numpy arrays), not rows of strings.
+That way parsing and validation are vectorized.
+"""
+
+import csv
+import glob
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from df_py.util import instrument
+from df_py.util.typecheck import enforce_types
+
+FORMATS = ["csv", "parquet"]
+DEFAULT_FORMAT = "csv"
+
+# column name : python type (int, float or str). Order = column order.
+Schema = Dict[str, type]
+
+_PANDAS_DTYPES = {int: "int64", float: "float64", str: object}
+
+
+@enforce_types
+def table_format() -> str:
+    """Returns the format that new tables are saved in"""
+    fmt = os.getenv("DFTOOL_TABLE_FORMAT", DEFAULT_FORMAT).lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"DFTOOL_TABLE_FORMAT must be one of {FORMATS}, got '{fmt}'")
+    return fmt
+
+
+@enforce_types
+def format_filename(csv_file: str, fmt: str) -> str:
+    """Returns the file that holds table csv_file, when stored as fmt"""
+    assert csv_file.endswith(".csv"), csv_file
+    return csv_file[: -len(".csv")] + "." + fmt
+
+
+@enforce_types
+def find_table(csv_file: str) -> Optional[str]:
+    """Returns the file holding table csv_file, or None if there isn't one"""
+    if not csv_file.endswith(".csv"):
+        return csv_file if os.path.exists(csv_file) else None
+
+    fmt = table_format()
+    for f in [fmt] + [f for f in FORMATS if f != fmt]:
+        filename = format_filename(csv_file, f)
+        if os.path.exists(filename):
+            return filename
+    return None
+
+
+@enforce_types
+def table_exists(csv_file: str) -> bool:
+    """Is table csv_file stored, in any format?"""
+    return find_table(csv_file) is not None
+
+
+@enforce_types
+def table_filenames(csv_dir: str, pattern: str) -> List[str]:
+    """
+    @description
+      Find the tables in csv_dir whose name matches a glob pattern,
+      whatever format they're stored in.
+
+    @arguments
+      pattern -- glob pattern without extension, e.g. "nftvols*"
+
+    @return
+      csv_files -- list of table names (csv filenames)
+    """
+    csv_files = set()
+    for fmt in FORMATS:
+        for filename in glob.glob(os.path.join(csv_dir, f"{pattern}.{fmt}")):
+            csv_files.add(filename[: -len(fmt)] + "csv")
+    return sorted(csv_files)
+
+
+@enforce_types
+def save_table(csv_file: str, schema: dict, rows: Sequence[Sequence]) -> str:
+    """
+    @description
+      Save a table, in the format given by envvar DFTOOL_TABLE_FORMAT.
+      The table can't already exist, in any format.
+
+    @arguments
+      csv_file -- name of the table
+      schema -- dict of [column_name] : int / float / str
+      rows -- list of rows; each row has a value per column, in schema order
+
+    @return
+      filename -- the file that was written
+    """
+    assert not table_exists(csv_file), f"{csv_file} can't already exist"
+    fmt = table_format()
+    filename = format_filename(csv_file, fmt)
+
+    if fmt == "csv":
+        with open(filename, "w") as f:
+            writer = csv.writer(f)
+            writer.writerow(list(schema))
+            writer.writerows(rows)
+    else:
+        _save_parquet(filename, schema, rows)
+
+    print(f"Created {filename}")
+    return filename
+
+
+@enforce_types
+def load_table(csv_file: str, schema: dict) -> Dict[str, np.ndarray]:
+    """
+    @description
+      Load a table, from whichever format it's stored in.
+
+    @arguments
+      csv_file -- name of the table
+      schema -- dict of [column_name] : int / float / str. The stored
+        columns must match it, in order.
+
+    @return
+      columns -- dict of [column_name] : 1d numpy array. Str columns
+        have dtype object.
+    """
+    table = os.path.basename(csv_file)
+    with instrument.timer("table_load", table=table):
+        columns = _load_table(csv_file, schema)
+    n_rows = len(next(iter(columns.values()))) if columns else 0
+    instrument.inc("table_rows", n_rows, table=table)
+    return columns
+
+
+def _load_table(csv_file: str, schema: dict) -> Dict[str, np.ndarray]:
+    filename = find_table(csv_file)
+    if filename is None:
+        raise FileNotFoundError(csv_file)
+
+    if filename.endswith(".parquet"):
+        _, pq = _pyarrow()
+        table = pq.read_table(filename, memory_map=True)
+        assert table.column_names == list(schema), (filename, table.column_names)
+        columns = {
+            name: table.column(name).to_numpy().astype(_PANDAS_DTYPES[typ], copy=False)
+            for name, typ in schema.items()
+        }
+    else:
+        # pandas is only needed here, and it's slow to import
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        df = pd.read_csv(
+            filename,
+            dtype={name: _PANDAS_DTYPES[typ] for name, typ in schema.items()},
+            na_filter=False,
+            float_precision="round_trip",  # same floats as float(s)
+        )
+        assert list(df.columns) == list(schema), (filename, list(df.columns))
+        columns = {name: df[name].to_numpy() for name in schema}
+
+    print(f"Loaded {filename}")
+    return columns
+
+
+def _save_parquet(filename: str, schema: dict, rows: Sequence[Sequence]):
+    pa, pq = _pyarrow()
+    arrow_types = {int: pa.int64(), float: pa.float64(), str: pa.string()}
+    values = list(zip(*rows)) if rows else [()] * len(schema)
+    table = pa.table(
+        {
+            name: pa.array(list(column), type=arrow_types[typ])
+            for (name, typ), column in zip(schema.items(), values)
+        }
+    )
+    pq.write_table(table, filename)
+
+
+def _pyarrow():
+    """Returns (pyarrow, pyarrow.parquet). pyarrow is only needed for parquet."""
+    try:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "DFTOOL_TABLE_FORMAT=parquet needs pyarrow: pip install pyarrow"
+        ) from e
+    return pyarrow, pyarrow.parquet
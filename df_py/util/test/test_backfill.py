@@ -0,0 +1,49 @@
+import os
+
+import pytest
+from enforce_typing import enforce_types
+
+from df_py.util import backfill, instrument
+from df_py.volume import csvs
+
+
+@enforce_types
+def test_week_dates():
+    assert backfill.week_dates(5) == ("2022-09-29", "2022-10-06")
+    assert backfill.week_dates(6) == ("2022-10-06", "2022-10-13")
+    with pytest.raises(ValueError):
+        backfill.week_dates(4)
+
+
+@enforce_types
+def test_week_reward_amount():
+    assert backfill.week_reward_amount(8) == 5000.0
+    assert backfill.week_reward_amount(9) == 25000.0
+
+
+@enforce_types
+def test_resume(tmp_path):
+    csv_dir = str(tmp_path)
+    for df_week in [5, 6]:
+        week_dir = backfill.week_csv_dir(csv_dir, df_week)
+        os.mkdir(week_dir)
+        csvs.save_volume_rewards_csv({1: {"0xlp": 1.0}}, week_dir)
+
+    status = backfill.backfill(5, 6, csv_dir, 10, 1, "address.json", [1], 2)
+    assert status == {5: "skipped", 6: "skipped"}
+
+
+@enforce_types
+def test_failed_week(tmp_path):
+    status = backfill.backfill(4, 4, str(tmp_path), 10, 1, "address.json", [1], 1)
+    assert status[4].startswith("failed: ValueError")
+
+
+@enforce_types
+def test_worker_returns_metrics():
+    instrument.inc("rpc_calls")  # eg inherited from the parent process
+    status, metrics = backfill._backfill_week_in_worker(
+        4, "csv_dir", 10, 1, "address.json", [1], 1
+    )
+    assert status.startswith("failed: ValueError")
+    assert metrics == []  # only what this week counted
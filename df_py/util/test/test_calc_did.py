@@ -1,4 +1,7 @@
-from df_py.util.oceanutil import calc_did
+from web3.main import Web3
+
+from df_py.util import oceanutil
+from df_py.util.oceanutil import calc_did, calc_dids, checksum_addr, checksum_addrs
 
 # pylint: disable=line-too-long
 # Example: https://v4.aquarius.oceanprotocol.com/api/aquarius/assets/ddo/did:op:8d797a40e75a73a9646e48cfb14d5c0f6afb3c897f53403d00787b00e736b9f3
@@ -25,3 +28,36 @@ def test_calc_did():
         # address is not case sensitive
         assert calc_did(address.lower(), chain_id) == did
         assert calc_did(address.upper(), chain_id) == did
+
+
+def test_calc_dids():
+    data = [x.split(",") for x in golden_data.split("\n")]
+    polygon_addrs = [address for [_, chain_id, address] in data if chain_id == "80001"]
+    polygon_dids = [did for [did, chain_id, _] in data if chain_id == "80001"]
+
+    dids = calc_dids(80001, polygon_addrs)
+    assert list(dids.keys()) == polygon_addrs
+    assert list(dids.values()) == polygon_dids
+
+    # keyed by the given addresses, whatever their casing
+    addr = polygon_addrs[0]
+    dids = calc_dids(80001, [addr.lower(), addr.upper()])
+    assert dids == {addr.lower(): polygon_dids[0], addr.upper(): polygon_dids[0]}
+
+    assert calc_dids(80001, []) == {}
+
+    # bounded, for long runs over many nfts
+    assert oceanutil._calc_did.cache_info().maxsize == oceanutil.DID_CACHE_SIZE
+
+
+def test_checksum_addr():
+    data = [x.split(",") for x in golden_data.split("\n")]
+    addrs = [Web3.to_checksum_address(address) for [_, _, address] in data]
+
+    for addr in addrs:
+        assert checksum_addr(addr) == addr
+        assert checksum_addr(addr.lower()) == addr
+        assert checksum_addr(addr.lower()) == addr  # memoized
+
+    assert checksum_addrs([addr.lower() for addr in addrs]) == addrs
+    assert checksum_addrs([]) == []
@@ -129,7 +129,7 @@ def test_calc_failures(tmp_path):
 
 @enforce_types
 def test_predictoor_data(tmp_path):
-    with patch("df_py.util.dftool_module.query_predictoor_contracts") as mock:
+    with patch("df_py.predictoor.queries.query_predictoor_contracts") as mock:
         mock.return_value = {
             "0xContract1": PredictContract(8996, "0x1", "c1", "c1", 10, 20),
             "0xContract2": PredictContract(8996, "0x2", "c2", "c2", 10, 20),
@@ -229,7 +229,7 @@ def test_calc_without_amount(tmp_path, monkeypatch):
 
     with patch("web3.main.Web3.to_checksum_address") as mock_checksum:
         mock_checksum.side_effect = lambda value: value
-        with patch("df_py.util.dftool_module.record_deployed_contracts") as mock:
+        with patch("df_py.util.steps.record_deployed_contracts") as mock:
             with sysargs_context(sys_args):
                 mock.return_value = [30, 20]
                 dftool_module.do_calc()
@@ -309,7 +309,7 @@ def test_dispense_predictoor_rose(tmp_path):
         "--PREDICTOOR_ROSE=True",
     ]
 
-    with patch("df_py.util.dftool_module.dispense.dispense") as mock:
+    with patch("df_py.util.dispense.dispense") as mock:
         with sysargs_context(sys_argv):
             dftool_module.do_dispense_active()
         mock.assert_called()
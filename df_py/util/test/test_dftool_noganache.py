@@ -6,7 +6,7 @@ from unittest.mock import patch
 import pytest
 from enforce_typing import enforce_types
 
-from df_py.util import dftool_arguments, dftool_module
+from df_py.util import dftool_arguments, dftool_module, instrument
 from df_py.util.test.test_dftool_ganache import sysargs_context
 from df_py.volume import csvs
 
@@ -69,6 +69,30 @@ def test_noarg_commands():
             assert excinfo.value.code in [1, 2]
 
 
+@enforce_types
+def test_command_failures_counted():
+    # a command that exits non-zero, eg on missing args, counts as a failure
+    instrument.reset()
+    with pytest.raises(SystemExit) as excinfo:
+        with sysargs_context(["dftool", "calc"]):
+            dftool_module._do_main()
+    assert excinfo.value.code != 0
+
+    values = {m["name"]: m["value"] for m in instrument.metrics()}
+    assert values["command_calls"] == 1
+    assert values["command_failures"] == 1
+
+
+@enforce_types
+def test_dispense_active_gas_fraction_with_batch_nbr(tmp_path):
+    sys_argv = ["dftool", "dispense_active", str(tmp_path), "8996"]
+    sys_argv += ["--BATCH_NBR", "1", "--GAS_FRACTION", "0.5"]
+    with pytest.raises(SystemExit) as excinfo:
+        with sysargs_context(sys_argv):
+            dftool_module.do_dispense_active()
+    assert excinfo.value.code == 2  # a usage error, not a traceback
+
+
 @enforce_types
 def _get_HELP_subargs_in_dftool() -> List[str]:
     """Return e.g. ["help", "get_rate", "volsym", ...]"""
@@ -98,3 +122,19 @@ def test_functions_exist():
             # patch can only overwrite existing functions
             # so that ensures the function exists
             pass
+
+
+@enforce_types
+def test_light_imports():
+    # dftool imports a command's dependencies only when it runs the command
+    code = (
+        "import sys\n"
+        "from df_py.util import dftool_module, get_rate\n"
+        "from df_py.volume import csvs\n"
+        "heavy = ['web3', 'eth_account', 'scipy', 'pandas', 'solcx']\n"
+        "print([m for m in heavy if m in sys.modules])\n"
+    )
+    out = subprocess.run(
+        ["python", "-c", code], check=True, capture_output=True, text=True
+    )
+    assert out.stdout.strip() == "[]"
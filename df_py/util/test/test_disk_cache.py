@@ -0,0 +1,41 @@
+import multiprocessing
+import os
+
+from enforce_typing import enforce_types
+
+from df_py.util import disk_cache
+
+
+@enforce_types
+def test_load_save(tmp_path):
+    filename = str(tmp_path / "foo.json")
+    assert disk_cache.load_json(filename, {}) == {}
+    disk_cache.save_json(filename, {"a": 1})
+    assert disk_cache.load_json(filename, {}) == {"a": 1}
+
+    with open(filename, "w") as f:
+        f.write("{corrupt")
+    assert disk_cache.load_json(filename, {}) == {}
+
+
+def _add_keys(filename: str, worker_i: int):
+    for i in range(20):
+        disk_cache.locked_update(
+            filename, lambda data, i=i: {**data, f"{worker_i}-{i}": i}, {}
+        )
+
+
+@enforce_types
+def test_locked_update_across_processes(tmp_path):
+    filename = str(tmp_path / "foo.json")
+    procs = [
+        multiprocessing.Process(target=_add_keys, args=(filename, worker_i))
+        for worker_i in range(4)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+
+    assert len(disk_cache.load_json(filename, {})) == 4 * 20  # no update lost
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
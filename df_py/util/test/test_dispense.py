@@ -1,7 +1,8 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from enforce_typing import enforce_types
+from web3.main import Web3
 
 from df_py.util import dispense, networkutil, oceantestutil, oceanutil
 from df_py.util.base18 import from_wei, to_wei
@@ -98,14 +99,198 @@ def test_batch_number(w3):
     assert df_rewards.claimable(accounts[batch_size + 2], token.address) == 0
 
 
+@enforce_types
+def test_multisig(w3, monkeypatch):
+    OCEAN = oceanutil.OCEAN_token(networkutil.DEV_CHAINID)
+    df_rewards = ContractBase(w3, "DFRewards", constructor_args=[])
+    rewards_at_chain = {accounts[i].address: (i + 1.0) for i in range(7)}
+
+    monkeypatch.setenv("USE_MULTISIG", "true")
+    with patch("df_py.util.dispense.chain_id_to_multisig_addr"):
+        with patch("df_py.util.dispense.send_multisig_txs") as mock:
+            dispense.dispense(
+                w3,
+                rewards_at_chain,
+                dfrewards_addr=df_rewards.address,
+                token_addr=OCEAN.address,
+                from_account=accounts[0],
+                batch_size=2,
+            )
+
+    # approve, then 4 allocate batches, proposed together
+    assert mock.call_count == 1
+    calls = mock.call_args[0][2]
+    assert [call.to for call in calls] == [OCEAN.address] + [df_rewards.address] * 4
+
+
+@enforce_types
+def test_pipelined(w3):
+    OCEAN = oceanutil.OCEAN_token(networkutil.DEV_CHAINID)
+    df_rewards = ContractBase(w3, "DFRewards", constructor_args=[])
+
+    batch_size = 2
+    total_number = batch_size * 3 + 1
+    rewards_at_chain = {accounts[i].address: (i + 1.0) for i in range(total_number)}
+
+    dispense.dispense(
+        w3,
+        rewards_at_chain,
+        dfrewards_addr=df_rewards.address,
+        token_addr=OCEAN.address,
+        from_account=accounts[0],
+        batch_size=batch_size,
+        pipelined=True,
+    )
+
+    for i in range(total_number):
+        claimable = from_wei(df_rewards.claimable(accounts[i], OCEAN.address))
+        assert claimable == pytest.approx(i + 1.0)
+
+
+@enforce_types
+def test_pipelined_resends_failed_batches():
+    web3 = MagicMock(spec=Web3)
+    web3.eth = MagicMock()
+    web3.eth.get_transaction_count.return_value = 10
+    batches = {0: (["0xa"], [1]), 1: (["0xb"], [2]), 2: (["0xc"], [3])}
+    statuses = {
+        "0xa": ["mined"],
+        "0xb": ["reverted", "mined"],
+        "0xc": ["dropped", "dropped", "dropped"],
+    }
+    sent = []  # (to_addr of batch, nonce)
+
+    def sign(_web3, _df_rewards, _token_addr, batch, _account, nonce, *_, **__):
+        sent.append((batch[0][0], nonce))
+        return MagicMock(hash=len(sent).to_bytes(32, "big")), {}
+
+    def wait(_web3, tx_hashes, _timeout):
+        to_addr = sent[int(tx_hashes[-1], 16) - 1][0]
+        return statuses[to_addr].pop(0)
+
+    with patch("df_py.util.dispense._sign_allocate", side_effect=sign):
+        with patch("df_py.util.dispense._wait_for_batch", side_effect=wait):
+            failed = dispense.allocate_pipelined(
+                web3, MagicMock(), "0xtoken", batches, accounts[0]
+            )
+
+    assert failed == [2]
+    assert sent == [
+        ("0xa", 10),
+        ("0xb", 11),
+        ("0xc", 12),
+        ("0xb", 13),  # reverted: new nonce
+        ("0xc", 12),  # dropped: same nonce, to replace the old tx
+        ("0xc", 12),
+    ]
+
+
+@enforce_types
+def test_pipelined_no_batches():
+    web3 = MagicMock(spec=Web3)
+    web3.eth = MagicMock()
+    web3.eth.get_transaction_count.return_value = 10
+    failed = dispense.allocate_pipelined(web3, MagicMock(), "0xtoken", {}, accounts[0])
+    assert failed == []
+
+
+@enforce_types
+def test_replacement_fees():
+    web3 = MagicMock(spec=Web3)
+    web3.eth = MagicMock()
+    web3.eth.gas_price = 100
+    web3.eth.max_priority_fee = 2
+    web3.eth.get_block.return_value = {"baseFeePerGas": 10}
+
+    assert dispense._fees(web3, True, None) == {"gasPrice": 100}
+    assert dispense._fees(web3, True, {"gasPrice": 200}) == {"gasPrice": 225}
+    assert dispense._fees(web3, True, {"gasPrice": 50}) == {"gasPrice": 100}
+
+    fees = dispense._fees(web3, False, None)
+    assert fees == {"maxPriorityFeePerGas": 2, "maxFeePerGas": 22}
+    fees = dispense._fees(web3, False, {**fees, "maxPriorityFeePerGas": 10})
+    assert fees == {"maxPriorityFeePerGas": 12, "maxFeePerGas": 25}
+
+    # the replaced tx's fees are bumped, not the current ones
+    web3.eth.get_block.return_value = {"baseFeePerGas": 5}
+    fees = dispense._fees(web3, False, fees)
+    assert fees == {"maxPriorityFeePerGas": 14, "maxFeePerGas": 29}
+    assert fees["maxFeePerGas"] >= 25 * 1.1
+
+
+@enforce_types
+def test_gas_sized_ranges():
+    web3 = MagicMock(spec=Web3)
+    web3.eth = MagicMock()
+    web3.eth.get_block.return_value = {"gasLimit": 10_000_000}
+    to_addrs = [f"0x{i:040x}" for i in range(250)]
+    expensive = set(to_addrs[50:60])  # eg first rewards, which need new storage
+
+    def allocate(batch_addrs, _values, _token_addr):
+        gas = 21_000 + sum(
+            80_000 if addr in expensive else 30_000 for addr in batch_addrs
+        )
+
+        def estimate_gas(_tx_dict):
+            if gas > 5_000_000:
+                raise ValueError("out of gas")
+            return gas
+
+        return MagicMock(estimate_gas=estimate_gas)
+
+    df_rewards = MagicMock()
+    df_rewards.contract.functions.allocate.side_effect = allocate
+    ranges = dispense.gas_sized_ranges(
+        web3, df_rewards, "0xtoken", to_addrs, [1] * 250, "0xfrom", 0.3
+    )
+
+    # contiguous, and each batch fits in 3M gas
+    assert ranges[0][0] == 0 and ranges[-1][1] == 250
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    for st, fin in ranges:
+        gas = 21_000 + sum(
+            80_000 if a in expensive else 30_000 for a in to_addrs[st:fin]
+        )
+        assert gas <= 3_000_000
+
+    # the probes average to 85 recipients/batch; the batch with the
+    # expensive ones is still over, so it gets split
+    assert ranges == [(0, 42), (42, 85), (85, 170), (170, 250)]
+
+
+@enforce_types
+def test_gas_sized_ranges_estimate_fails():
+    # eg a bad recipient: splitting doesn't help, so give up soon
+    web3 = MagicMock(spec=Web3)
+    web3.eth = MagicMock()
+    web3.eth.get_block.return_value = {"gasLimit": 10_000_000}
+    df_rewards = MagicMock()
+    estimate_gas = df_rewards.contract.functions.allocate.return_value.estimate_gas
+    estimate_gas.side_effect = ValueError("execution reverted")
+
+    to_addrs = [f"0x{i:040x}" for i in range(20_000)]
+    with pytest.raises(ValueError, match="even in a small batch"):
+        dispense.gas_sized_ranges(
+            web3, df_rewards, "0xtoken", to_addrs, [1] * 20_000, "0xfrom", 0.3
+        )
+    assert estimate_gas.call_count < 20
+
+
 def test_dispense_passive(w3):
     fee_distributor = oceanutil.FeeDistributor(networkutil.DEV_CHAINID)
     OCEAN = oceanutil.OCEAN_token(networkutil.DEV_CHAINID)
     with patch("df_py.util.dispense.chain_id_to_multisig_addr"):
-        with patch("df_py.util.dispense.send_multisig_tx") as mock:
+        with patch("df_py.util.dispense.send_multisig_txs") as mock:
             dispense.dispense_passive(w3, OCEAN, fee_distributor, 1)
 
-    assert mock.call_count == 3
+    # transfer and checkpoints, in one bundle
+    assert mock.call_count == 1
+    calls = mock.call_args[0][2]
+    assert [call.to for call in calls] == [
+        OCEAN.address,
+        fee_distributor.address,
+        fee_distributor.address,
+    ]
 
 
 def test_multisig_transfer_tokens(w3):
@@ -0,0 +1,158 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from enforce_typing import enforce_types
+from web3.exceptions import TransactionNotFound
+from web3.main import Web3
+
+from df_py.util import dispense
+from df_py.util.dispense_journal import (
+    DispenseJournal,
+    dispense_fingerprint,
+    journal_filename,
+)
+
+FINGERPRINT = dispense_fingerprint(1, "0xDFR", "0xTOK", ["0xa", "0xb"], [1, 2])
+
+
+@enforce_types
+def test_fingerprint():
+    assert FINGERPRINT == dispense_fingerprint(
+        1, "0xdfr", "0xtok", ["0xA", "0xB"], [1, 2]
+    )
+    assert FINGERPRINT != dispense_fingerprint(
+        1, "0xDFR", "0xTOK", ["0xa", "0xb"], [1, 3]
+    )
+    assert FINGERPRINT != dispense_fingerprint(
+        137, "0xDFR", "0xTOK", ["0xa", "0xb"], [1, 2]
+    )
+
+
+@enforce_types
+def test_reopen(tmp_path):
+    filename = journal_filename(str(tmp_path), 1, "0xDFR")
+    journal = DispenseJournal(filename, FINGERPRINT)
+    assert journal.ranges is None
+    journal.record_ranges([(0, 2), (2, 3)])
+    journal.record_sent(0, ["0xa", "0xb"], [1, 2], 7, "0xtx1")
+    journal.record_sent(1, ["0xc"], [3], 8, "0xtx2")
+    journal.record_confirmed(0)
+
+    journal = DispenseJournal(filename, FINGERPRINT)
+    assert journal.ranges == [(0, 2), (2, 3)]
+    assert journal.is_confirmed(0)
+    assert not journal.is_confirmed(1)
+    assert [e["tx_hash"] for e in journal.sends(1)] == ["0xtx2"]
+    assert journal.sends(0)[0]["amount_wei"] == "3"
+    assert journal.sends(2) == []
+
+
+@enforce_types
+def test_other_dispense(tmp_path):
+    filename = journal_filename(str(tmp_path), 1, "0xDFR")
+    DispenseJournal(filename, FINGERPRINT)
+    with pytest.raises(ValueError):
+        DispenseJournal(filename, "another fingerprint")
+
+
+@enforce_types
+def test_torn_line(tmp_path):
+    filename = journal_filename(str(tmp_path), 1, "0xDFR")
+    journal = DispenseJournal(filename, FINGERPRINT)
+    journal.record_sent(0, ["0xa"], [1], 7, "0xtx1")
+    with open(filename, "a", encoding="utf-8") as f:
+        f.write('{"batch": 0, "sta')  # crash mid-write
+
+    journal = DispenseJournal(filename, FINGERPRINT)
+    journal.record_confirmed(0)
+    assert DispenseJournal(filename, FINGERPRINT).is_confirmed(0)
+
+
+@enforce_types
+def test_check_chain(tmp_path):
+    journal = DispenseJournal(journal_filename(str(tmp_path), 1, "0x1"), FINGERPRINT)
+    journal.record_sent(0, ["0xa"], [1], 7, "0xmined")
+    journal.record_sent(1, ["0xb"], [2], 8, "0xreverted")
+    journal.record_sent(2, ["0xc"], [3], 9, "0xpending")
+
+    receipts = {"0xmined": {"status": 1}, "0xreverted": {"status": 0}}
+
+    def get_receipt(tx_hash):
+        if tx_hash not in receipts:
+            raise TransactionNotFound(tx_hash)
+        return receipts[tx_hash]
+
+    web3 = MagicMock()
+    web3.eth.get_transaction_receipt.side_effect = get_receipt
+    journal.check_chain(web3)
+
+    assert journal.is_confirmed(0)
+    assert not journal.is_confirmed(1)
+    assert not journal.is_confirmed(2)
+
+
+@enforce_types
+def test_resume(tmp_path):
+    # an earlier run sent batch 0 with nonce 12, not mined yet, and batch 1
+    # with nonce 5, which got used by another tx
+    journal = DispenseJournal(journal_filename(str(tmp_path), 1, "0x1"), FINGERPRINT)
+    journal.record_sent(0, ["0xa"], [1], 12, "0x" + "00" * 32)
+    journal.record_sent(1, ["0xb"], [2], 5, "0x" + "01" * 32)
+
+    web3 = MagicMock(spec=Web3)
+    web3.eth = MagicMock()
+    web3.eth.get_transaction_count.return_value = 12
+    web3.eth.get_transaction_receipt.side_effect = TransactionNotFound("no")
+    web3.eth.get_transaction.return_value = {"gasPrice": 100}
+    sent = []  # (batch_i, nonce)
+    replaced_fees = []
+
+    def sign(_web3, _df_rewards, _token_addr, batch, _account, nonce, *args):
+        sent.append((batch[0][0], nonce))
+        replaced_fees.append(args[-1])
+        return MagicMock(hash=bytes([len(sent) + 1]) * 32), {}
+
+    account = MagicMock()
+    with patch("df_py.util.dispense._sign_allocate", side_effect=sign):
+        with patch("df_py.util.dispense._wait_for_batch", return_value="mined"):
+            failed = dispense.allocate_pipelined(
+                web3,
+                MagicMock(),
+                "0xtoken",
+                {0: (["0xa"], [1]), 1: (["0xb"], [2])},
+                account,
+                journal=journal,
+            )
+
+    assert failed == []
+    assert sent == [("0xa", 12), ("0xb", 13)]
+    assert replaced_fees == [{"gasPrice": 100}, None]  # outbid the pending tx
+    assert journal.is_confirmed(0) and journal.is_confirmed(1)
+    assert [e["nonce"] for e in journal.sends(1)] == [5, 13]
+
+
+@enforce_types
+def test_resume_old_tx_mined_before_approve(tmp_path):
+    # an earlier run sent batch 0 with nonce 12, then crashed. On the re-run,
+    # approve took nonce 13, so the old tx got mined before it
+    journal = DispenseJournal(journal_filename(str(tmp_path), 1, "0x1"), FINGERPRINT)
+    journal.record_sent(0, ["0xa"], [1], 12, "0x" + "00" * 32)
+
+    web3 = MagicMock(spec=Web3)
+    web3.eth = MagicMock()
+    web3.eth.get_transaction_count.return_value = 14
+    web3.eth.get_transaction_receipt.return_value = {"status": 1}
+
+    with patch("df_py.util.dispense._sign_allocate") as sign:
+        failed = dispense.allocate_pipelined(
+            web3,
+            MagicMock(),
+            "0xtoken",
+            {0: (["0xa"], [1])},
+            MagicMock(),
+            journal=journal,
+        )
+
+    assert failed == []
+    assert sign.call_count == 0  # not allocated twice
+    assert journal.is_confirmed(0)
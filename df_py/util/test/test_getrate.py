@@ -67,23 +67,98 @@ def test_get_rate_H2O():
 
 
 @enforce_types
-def test_get_rate_fallback():
-    with patch("df_py.util.get_rate.get_binance_rate") as mock1:
-        mock1.return_value = None
+def test_get_rate_fallback(tmp_path, monkeypatch):
+    monkeypatch.setenv("DFPY_CACHE_DIR", str(tmp_path))
+    with patch("df_py.util.get_rate.get_binance_daily_closes") as mock1:
+        mock1.return_value = {}
         r = get_rate.get_rate("OCEAN", "2022-01-20", "2022-01-20")
 
     # from goingecko
     assert r == approx(0.75, 0.1)
 
-    with patch("df_py.util.get_rate.get_binance_rate") as mock1:
-        mock1.return_value = None
-        with patch("df_py.util.get_rate.get_coingecko_rate") as mock2:
-            mock2.return_value = None
+    monkeypatch.setenv("DFPY_CACHE_DIR", str(tmp_path / "empty"))
+    with patch("df_py.util.get_rate.get_binance_daily_closes") as mock1:
+        mock1.return_value = {}
+        with patch("df_py.util.get_rate.get_coingecko_daily_closes") as mock2:
+            mock2.return_value = {}
             r = get_rate.get_rate("OCEAN", "2022-01-20", "2022-01-20")
 
     assert r is None
 
 
+@enforce_types
+def test_get_rates_uses_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("DFPY_CACHE_DIR", str(tmp_path))
+    fetched = []  # (token_symbol, st_day, fin_day)
+
+    def binance(token_symbol, st_day, fin_day):
+        fetched.append((token_symbol, st_day, fin_day))
+        if token_symbol == "ETH":
+            return {}  # not on Binance
+        return {"2022-01-19": 1.0, "2022-01-20": 2.0, "2022-01-21": 3.0}
+
+    def coingecko(_token_symbol, _st_day, _fin_day):
+        return {"2022-01-19": 10.0, "2022-01-20": 20.0, "2022-01-21": 30.0}
+
+    with patch("df_py.util.get_rate.get_binance_daily_closes", side_effect=binance):
+        with patch(
+            "df_py.util.get_rate.get_coingecko_daily_closes", side_effect=coingecko
+        ):
+            rates = get_rate.get_rates(
+                ["OCEAN", "ETH", "H2O"], "2022-01-19", "2022-01-20"
+            )
+            assert rates == {"OCEAN": 1.5, "ETH": 15.0, "H2O": 1.618}
+            assert sorted(fetched) == [
+                ("ETH", "2022-01-19", "2022-01-20"),
+                ("OCEAN", "2022-01-19", "2022-01-20"),
+            ]
+
+            # only the missing day gets fetched
+            fetched.clear()
+            r = get_rate.get_rate("OCEAN", "2022-01-19", "2022-01-21")
+            assert r == 2.0
+            assert fetched == [("OCEAN", "2022-01-21", "2022-01-21")]
+
+            # all in the store now: no fetching
+            fetched.clear()
+            assert get_rate.get_rate("OCEAN", "2022-01-20", "2022-01-21") == 2.5
+            assert fetched == []
+
+
+@enforce_types
+def test_price_store(tmp_path):
+    filename = str(tmp_path / "prices.json")
+    store = get_rate.PriceStore(filename)
+    store.update("ocean", {"2022-01-19": 1.0, "2999-01-01": 9.0})
+    assert store.lookup("OCEAN", ["2022-01-19", "2022-01-20"]) == (
+        {"2022-01-19": 1.0},
+        ["2022-01-20"],
+    )
+
+    # meanwhile, another process saves
+    other = get_rate.PriceStore(filename)
+    other.update("ETH", {"2022-01-19": 3.0})
+    other.save()
+    store.save()
+
+    # both are saved; days that aren't over aren't
+    store = get_rate.PriceStore(filename)
+    assert store.lookup("OCEAN", ["2022-01-19", "2999-01-01"])[1] == ["2999-01-01"]
+    assert store.lookup("ETH", ["2022-01-19"])[1] == []
+
+
+@enforce_types
+def test_days():
+    assert get_rate._days("2022-01-20", "2022-01-20") == ["2022-01-19", "2022-01-20"]
+    assert get_rate._days("2022-01-30", "2022-02-01") == [
+        "2022-01-30",
+        "2022-01-31",
+        "2022-02-01",
+    ]
+    with pytest.raises(ValueError):
+        get_rate._days("2022-01-21", "2022-01-20")
+
+
 @enforce_types
 def test_get_rate_BTC():
     r = get_rate.get_rate("BTC", "2022-01-31", "2022-01-31")
@@ -130,8 +205,17 @@ def test_get_coingecko_rate_empty():
             mock1.return_value = ""
             r = get_rate.get_coingecko_rate("OCEAN", "2022-01-20", "2022-01-20")
 
+    get_rate._coingecko_ids.cache_clear()
     with patch("df_py.util.get_rate.json.load") as mock1:
         mock1.return_value = {}
         r = get_rate._coingecko_id("OCEAN")
+    get_rate._coingecko_ids.cache_clear()
 
     assert r == ""
+
+
+@enforce_types
+def test_coingecko_id():
+    assert get_rate._coingecko_id("OCEAN") == "ocean-protocol"
+    assert get_rate._coingecko_id("ZOC") == "01coin"
+    assert get_rate._coingecko_id("NOT_A_TOKEN") == ""
@@ -0,0 +1,104 @@
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from enforce_typing import enforce_types
+
+from df_py.util import graphutil, instrument, tables
+
+
+@enforce_types
+def test_counters_gauges_timers():
+    instrument.inc("rpc_calls", method="eth_call")
+    instrument.inc("rpc_calls", 2, method="eth_call")
+    instrument.inc("rpc_calls", method="eth_getBlockByNumber")
+    instrument.set_gauge("reward_calc_lps", 5)
+    instrument.set_gauge("reward_calc_lps", 7)
+    with pytest.raises(ValueError):
+        with instrument.timer("step", step="save_rate"):
+            raise ValueError("counted anyway")
+
+    values = {
+        (m["name"], tuple(m["labels"].values())): m["value"]
+        for m in instrument.metrics()
+    }
+    assert values[("rpc_calls", ("eth_call",))] == 3
+    assert values[("rpc_calls", ("eth_getBlockByNumber",))] == 1
+    assert values[("reward_calc_lps", ())] == 7
+    assert values[("step_calls", ("save_rate",))] == 1
+    assert values[("step_seconds", ("save_rate",))] >= 0
+
+
+@enforce_types
+def test_merge():
+    instrument.inc("rpc_calls", 2, method="eth_call")
+    instrument.set_gauge("reward_calc_lps", 5)
+    worker_metrics = [
+        {
+            "name": "rpc_calls",
+            "labels": {"method": "eth_call"},
+            "type": "counter",
+            "value": 3.0,
+        },
+        {"name": "reward_calc_lps", "labels": {}, "type": "gauge", "value": 9.0},
+    ]
+    instrument.merge(worker_metrics)
+
+    values = {m["name"]: m["value"] for m in instrument.metrics()}
+    assert values == {"rpc_calls": 5.0, "reward_calc_lps": 9.0}
+
+
+@enforce_types
+def test_reports(tmp_path, monkeypatch):
+    instrument.inc("subgraph_query_calls", 3, chain=137)
+    instrument.set_gauge("stage_seconds", 1.5, stage='a "b"')
+
+    text = instrument.prometheus_text("weekly")
+    assert text.splitlines() == [
+        "# TYPE dfpy_stage_seconds gauge",
+        'dfpy_stage_seconds{command="weekly",stage="a \\"b\\""} 1.5',
+        "# TYPE dfpy_subgraph_query_calls counter",
+        'dfpy_subgraph_query_calls{command="weekly",chain="137"} 3.0',
+    ]
+
+    json_file, prom_dir = tmp_path / "runs.jsonl", tmp_path / "textfile"
+    monkeypatch.setenv("DFPY_METRICS_JSON", str(json_file))
+    monkeypatch.setenv("DFPY_METRICS_PROM", str(prom_dir))
+    instrument.write_reports("weekly")
+    instrument.write_reports("dispense_active")  # eg the next cmd of all.sh
+
+    reports = [json.loads(line) for line in json_file.read_text().splitlines()]
+    assert [r["command"] for r in reports] == ["weekly", "dispense_active"]
+    assert len(reports[0]["metrics"]) == 2
+    assert (prom_dir / "dftool_weekly.prom").read_text() == text
+    assert sorted(os.listdir(prom_dir)) == [
+        "dftool_dispense_active.prom",
+        "dftool_weekly.prom",
+    ]
+
+
+@enforce_types
+def test_hooks(tmp_path):
+    csv_file = os.path.join(str(tmp_path), "foo-1.csv")
+    tables.save_table(csv_file, {"addr": str, "amt": float}, [["0xa", 1.0]] * 4)
+    tables.load_table(csv_file, {"addr": str, "amt": float})
+
+    response = MagicMock(status_code=200, content=b"x" * 10)
+    response.json.return_value = {"data": {}}
+    with patch("requests.post", return_value=response):
+        graphutil.submit_query("{ foo }", 137)
+        graphutil.submit_query("{ bar }", 137)
+
+    values = {
+        (m["name"], tuple(m["labels"].values())): m["value"]
+        for m in instrument.metrics()
+    }
+    assert values[("table_load_calls", ("foo-1.csv",))] == 1
+    assert values[("table_rows", ("foo-1.csv",))] == 4
+    assert values[("subgraph_query_calls", ("137",))] == 2
+    assert values[("subgraph_bytes", ("137",))] == 20
+
+
+def setup_function():
+    instrument.reset()
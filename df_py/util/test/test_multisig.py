@@ -0,0 +1,96 @@
+from unittest.mock import MagicMock, patch
+
+from enforce_typing import enforce_types
+from eth_abi import decode
+from web3.main import Web3
+
+from df_py.util import dispense, multisig
+from df_py.util.multisig import CALL, DELEGATECALL, SafeCall
+
+ADDR1 = "0x" + "11" * 20
+ADDR2 = "0x" + "22" * 20
+
+
+@enforce_types
+def test_chunk_calls():
+    calls = [SafeCall(ADDR1, "0x", gas=gas) for gas in [4, 5, 2, 12, 1]]
+    chunks = multisig.chunk_calls(calls, 10)
+    assert [[call.gas for call in chunk] for chunk in chunks] == [
+        [4, 5],
+        [2],
+        [12],  # too big on its own: gets its own chunk
+        [1],
+    ]
+    assert multisig.chunk_calls([], 10) == []
+
+
+@enforce_types
+def test_encode_multisend():
+    calls = [SafeCall(ADDR1, "0xabcd"), SafeCall(ADDR2, "0x01", value=7)]
+    data = multisig.encode_multisend(calls)
+
+    selector = Web3.keccak(text="multiSend(bytes)")[:4]
+    assert data.startswith(Web3.to_hex(selector))
+    (packed,) = decode(["bytes"], bytes.fromhex(data[10:]))
+
+    # operation (1 byte), to (20), value (32), data length (32), data
+    assert packed == (
+        b"\x00"
+        + bytes.fromhex("11" * 20)
+        + (0).to_bytes(32, "big")
+        + (2).to_bytes(32, "big")
+        + b"\xab\xcd"
+        + b"\x00"
+        + bytes.fromhex("22" * 20)
+        + (7).to_bytes(32, "big")
+        + (1).to_bytes(32, "big")
+        + b"\x01"
+    )
+
+
+@enforce_types
+def test_send_multisig_txs(monkeypatch):
+    monkeypatch.delenv("MULTISEND_ADDR", raising=False)
+    web3 = MagicMock()
+    web3.eth.chain_id = 1
+    calls = [SafeCall(ADDR1, "0x01", gas=6), SafeCall(ADDR2, "0x02", gas=6)]
+    calls += [SafeCall(ADDR1, "0x03", gas=6)]
+
+    with patch("df_py.util.multisig.get_safe_nonce", return_value=40) as nonce:
+        with patch("df_py.util.multisig._propose_safe_tx") as propose:
+            multisig.send_multisig_txs("0xsafe", web3, calls, max_gas=12)
+
+    assert nonce.call_count == 1
+    assert propose.call_count == 2
+
+    # first two calls: bundled, via MultiSend
+    _, _, to, value, data, operation, nonce = propose.call_args_list[0][0]
+    assert to == multisig.MULTISEND_ADDR
+    assert (value, operation, nonce) == (0, DELEGATECALL, 40)
+    assert data == multisig.encode_multisend(calls[:2])
+
+    # last call: on its own, so called directly
+    assert propose.call_args_list[1][0][2:] == (ADDR1, 0, "0x03", CALL, 41)
+
+
+@enforce_types
+def test_dispense_bundles_at_default_batch_size():
+    # 10k recipients, default batch size: approve + allocate batches
+    N = 10_000
+    ranges = dispense.bundle_sized_ranges(N, dispense.MAX_BATCH_SIZE)
+    assert ranges[0][0] == 0 and ranges[-1][1] == N
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert all(fin - st <= dispense.MAX_BATCH_SIZE for st, fin in ranges)
+
+    calls = [SafeCall(ADDR1, "0x")] + [
+        SafeCall(ADDR2, "0x", gas=dispense.allocate_gas_bound(fin - st))
+        for st, fin in ranges
+    ]
+    chunks = multisig.chunk_calls(calls, multisig.MAX_BUNDLE_GAS)
+
+    # approve shares the first bundle, and bundles are full: as few Safe
+    # txs as the gas allows, not one per batch
+    assert len(chunks[0]) >= 2
+    tot_gas = sum(call.gas for call in calls)
+    assert len(chunks) == -(-tot_gas // multisig.MAX_BUNDLE_GAS)
+    assert all(sum(c.gas for c in chunk) <= multisig.MAX_BUNDLE_GAS for chunk in chunks)
@@ -0,0 +1,96 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from enforce_typing import enforce_types
+
+from df_py.util import graphutil, oceanutil, subgraph_replay
+from df_py.util.blockrange import BlockRange
+from df_py.volume.queries import queryAllocations
+
+LP_ADDR = "0x" + "a" * 40
+NFT_ADDR = "0x" + "b" * 40
+
+
+def _fake_subgraph(_url, _data, json, timeout):  # pylint: disable=redefined-outer-name
+    """One page of allocations, then none. Ignores everything else"""
+    assert timeout
+    allocations = []
+    if "veAllocateUsers" in json["query"] and "skip: 0" in json["query"]:
+        allocations = [
+            {
+                "id": LP_ADDR,
+                "veAllocation": [
+                    {
+                        "id": "1",
+                        "allocated": "5000",
+                        "chainId": "8996",
+                        "nftAddress": NFT_ADDR,
+                    }
+                ],
+            }
+        ]
+    response = {"data": {"veAllocateUsers": allocations}}
+    return MagicMock(status_code=200, json=MagicMock(return_value=response))
+
+
+@enforce_types
+def test_record_then_replay(tmp_path):
+    fixture_dir = str(tmp_path)
+    rng = BlockRange(st=10, fin=20, num_samples=3, random_seed=1)
+    with patch("requests.post", side_effect=_fake_subgraph):
+        with subgraph_replay.recording(fixture_dir):
+            allocs = queryAllocations(rng, 8996)
+    nft_addr, LP_addr = oceanutil.checksum_addr(NFT_ADDR), oceanutil.checksum_addr(
+        LP_ADDR
+    )
+    assert allocs == {8996: {nft_addr: {LP_addr: pytest.approx(0.5)}}}
+
+    with patch("requests.post", side_effect=AssertionError("no network")):
+        with subgraph_replay.replaying(fixture_dir):
+            assert queryAllocations(rng, 8996) == allocs
+
+        # unrecorded query
+        with subgraph_replay.replaying(fixture_dir):
+            with pytest.raises(KeyError):
+                queryAllocations(BlockRange(30, 40, 3, random_seed=1), 8996)
+            with pytest.raises(KeyError):
+                queryAllocations(rng, 137)
+
+
+@enforce_types
+def test_envvars_and_latency(tmp_path, monkeypatch):
+    query = "{_meta { block { number } } }"
+    response = {"data": {"_meta": {"block": {"number": 123}}}}
+    subgraph_replay.save_response(str(tmp_path), query, 8996, response)
+
+    monkeypatch.setenv("DFPY_SUBGRAPH_REPLAY", str(tmp_path))
+    monkeypatch.setenv("DFPY_SUBGRAPH_LATENCY", "0.05")
+    t0 = time.perf_counter()
+    assert graphutil.get_last_block(8996) == 123
+    assert time.perf_counter() - t0 >= 0.05
+
+    # whitespace doesn't matter
+    assert graphutil.submit_query("{_meta {\n  block { number } } }", 8996) == response
+
+
+@enforce_types
+def test_server(tmp_path):
+    query = "{_meta { block { number } } }"
+    response = {"data": {"_meta": {"block": {"number": 123}}}}
+    subgraph_replay.save_response(str(tmp_path), query, 8996, response)
+
+    server = subgraph_replay.make_server(str(tmp_path), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        r = requests.post(url, "", json={"query": query}, timeout=5)
+        assert r.status_code == 200 and r.json() == response
+
+        r = requests.post(url, "", json={"query": "{ other }"}, timeout=5)
+        assert r.status_code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+from enforce_typing import enforce_types
+
+from df_py.util import tables
+
+SCHEMA = {"chainID": int, "addr": str, "amt": float}
+ROWS = [[1, "0xa", 0.1], [137, "0xb", 1e-15], [1, "0xc", 12314552354.0]]
+
+
+@enforce_types
+def test_format(monkeypatch):
+    monkeypatch.delenv("DFTOOL_TABLE_FORMAT", raising=False)
+    assert tables.table_format() == "csv"
+
+    monkeypatch.setenv("DFTOOL_TABLE_FORMAT", "Parquet")
+    assert tables.table_format() == "parquet"
+
+    monkeypatch.setenv("DFTOOL_TABLE_FORMAT", "xls")
+    with pytest.raises(ValueError):
+        tables.table_format()
+
+
+@enforce_types
+def test_csv_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.delenv("DFTOOL_TABLE_FORMAT", raising=False)
+    csv_file = os.path.join(str(tmp_path), "foo-1.csv")
+    assert not tables.table_exists(csv_file)
+
+    assert tables.save_table(csv_file, SCHEMA, ROWS) == csv_file
+    assert tables.table_exists(csv_file)
+    with pytest.raises(AssertionError):
+        tables.save_table(csv_file, SCHEMA, ROWS)
+
+    cols = tables.load_table(csv_file, SCHEMA)
+    assert cols["chainID"].tolist() == [1, 137, 1]
+    assert cols["addr"].tolist() == ["0xa", "0xb", "0xc"]
+    assert cols["amt"].tolist() == [0.1, 1e-15, 12314552354.0]
+
+    with pytest.raises(AssertionError):  # columns must match
+        tables.load_table(csv_file, {"chainID": int, "amt": float, "addr": str})
+
+
+@enforce_types
+def test_csv_empty(tmp_path):
+    csv_file = os.path.join(str(tmp_path), "foo.csv")
+    tables.save_table(csv_file, SCHEMA, [])
+    cols = tables.load_table(csv_file, SCHEMA)
+    assert [len(col) for col in cols.values()] == [0, 0, 0]
+
+
+@enforce_types
+def test_load_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        tables.load_table(os.path.join(str(tmp_path), "foo.csv"), SCHEMA)
+
+
+@enforce_types
+def test_table_filenames(tmp_path):
+    csv_dir = str(tmp_path)
+    assert tables.table_filenames(csv_dir, "foo*") == []
+
+    tables.save_table(os.path.join(csv_dir, "foo-1.csv"), SCHEMA, ROWS)
+    tables.save_table(os.path.join(csv_dir, "foo-137.csv"), SCHEMA, ROWS)
+    tables.save_table(os.path.join(csv_dir, "bar-1.csv"), SCHEMA, ROWS)
+
+    # pretend foo-5 was saved as parquet
+    with open(os.path.join(csv_dir, "foo-5.parquet"), "w") as f:
+        f.write("")
+
+    assert tables.table_filenames(csv_dir, "foo*") == [
+        os.path.join(csv_dir, "foo-1.csv"),
+        os.path.join(csv_dir, "foo-137.csv"),
+        os.path.join(csv_dir, "foo-5.csv"),
+    ]
+    assert tables.table_exists(os.path.join(csv_dir, "foo-5.csv"))
+
+
+@enforce_types
+def test_parquet_roundtrip(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setenv("DFTOOL_TABLE_FORMAT", "parquet")
+    csv_file = os.path.join(str(tmp_path), "foo.csv")
+
+    filename = tables.save_table(csv_file, SCHEMA, ROWS)
+    assert filename == os.path.join(str(tmp_path), "foo.parquet")
+    assert not os.path.exists(csv_file)
+    assert tables.table_exists(csv_file)
+
+    cols = tables.load_table(csv_file, SCHEMA)
+    assert cols["chainID"].tolist() == [1, 137, 1]
+    assert cols["addr"].tolist() == ["0xa", "0xb", "0xc"]
+    assert cols["amt"].tolist() == [0.1, 1e-15, 12314552354.0]
+
+    # a csv written earlier is still found
+    monkeypatch.setenv("DFTOOL_TABLE_FORMAT", "csv")
+    assert tables.load_table(csv_file, SCHEMA)["addr"].tolist() == ["0xa", "0xb", "0xc"]
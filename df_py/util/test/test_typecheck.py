@@ -0,0 +1,28 @@
+import pytest
+
+from df_py.util import typecheck
+
+
+def _f(x: int) -> int:
+    return x
+
+
+def test_enforce(monkeypatch):
+    monkeypatch.setattr(typecheck, "ENFORCE_TYPES", True)
+    f = typecheck.enforce_types(_f)
+    assert f is not _f
+    assert f(1) == 1
+    with pytest.raises(TypeError):
+        f("1")
+
+
+def test_passthrough(monkeypatch):
+    monkeypatch.setattr(typecheck, "ENFORCE_TYPES", False)
+    f = typecheck.enforce_types(_f)
+    assert f is _f
+    assert f("1") == "1"
+
+
+def test_on_in_tests():
+    # pytest.ini sets DFPY_ENFORCE_TYPES=1
+    assert typecheck.ENFORCE_TYPES
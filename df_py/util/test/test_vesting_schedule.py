@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pytest
 from enforce_typing import enforce_types
@@ -8,7 +8,6 @@ from df_py.util import networkutil, vesting_schedule
 from df_py.util.base18 import from_wei
 from df_py.util.constants import ACTIVE_REWARDS_MULTIPLIER, PREDICTOOR_OCEAN_BUDGET
 
-
 predictoor_substream = "predictoor"
 volume_substream = "volume"
 test_params = [
@@ -49,7 +48,7 @@ def test_get_active_reward_amount_for_week_eth_by_stream():
     start_dt = datetime(2022, 1, 1)
     assert (
         vesting_schedule.get_active_reward_amount_for_week_eth_by_stream(
-            start_dt, predictoor_substream, networkutil.DEV_CHAINID
+            start_dt, predictoor_substream
         )
         == 0
     )
@@ -57,31 +56,29 @@ def test_get_active_reward_amount_for_week_eth_by_stream():
     start_dt = datetime(2042, 1, 1)
     assert (
         vesting_schedule.get_active_reward_amount_for_week_eth_by_stream(
-            start_dt, predictoor_substream, networkutil.DEV_CHAINID
+            start_dt, predictoor_substream
         )
         > 0
     )
 
     predictoor_rewards = (
         vesting_schedule.get_active_reward_amount_for_week_eth_by_stream(
-            start_dt, predictoor_substream, networkutil.DEV_CHAINID
+            start_dt, predictoor_substream
         )
     )
 
     volume_rewards = vesting_schedule.get_active_reward_amount_for_week_eth_by_stream(
-        start_dt, volume_substream, networkutil.DEV_CHAINID
+        start_dt, volume_substream
     )
 
-    total_rewards = vesting_schedule.get_active_reward_amount_for_week_eth(
-        start_dt, networkutil.DEV_CHAINID
-    )
+    total_rewards = vesting_schedule.get_active_reward_amount_for_week_eth(start_dt)
 
     assert total_rewards == approx(predictoor_rewards + volume_rewards, 0.1)
 
     invalid_substream = "invalid_substream"
     with pytest.raises(ValueError):
         vesting_schedule.get_active_reward_amount_for_week_eth_by_stream(
-            start_dt, invalid_substream, networkutil.DEV_CHAINID
+            start_dt, invalid_substream
         )
 
 
@@ -90,7 +87,7 @@ def test_launch_dates():
     start_dt = datetime(2023, 11, 2)
     predictoor_rewards = (
         vesting_schedule.get_active_reward_amount_for_week_eth_by_stream(
-            start_dt, predictoor_substream, networkutil.DEV_CHAINID
+            start_dt, predictoor_substream
         )
     )
     assert predictoor_rewards == 0, "Predictoor DF has not begun"
@@ -107,14 +104,14 @@ def test_launch_dates():
     start_dt = datetime(2023, 11, 9)
     predictoor_rewards = (
         vesting_schedule.get_active_reward_amount_for_week_eth_by_stream(
-            start_dt, predictoor_substream, networkutil.DEV_CHAINID
+            start_dt, predictoor_substream
         )
     )
 
     assert predictoor_rewards == PREDICTOOR_OCEAN_BUDGET
 
     volume_rewards = vesting_schedule.get_active_reward_amount_for_week_eth_by_stream(
-        start_dt, volume_substream, networkutil.DEV_CHAINID
+        start_dt, volume_substream
     )
 
     assert volume_rewards == 37500
@@ -126,23 +123,53 @@ def test_launch_dates():
 @pytest.mark.parametrize("test_input, expected_output", test_params)
 def test_get_reward_amount_for_week_wei(test_input, expected_output):
     assert from_wei(
-        vesting_schedule.get_reward_amount_for_week_wei(
-            test_input, networkutil.DEV_CHAINID
-        )
+        vesting_schedule.get_reward_amount_for_week_wei(test_input)
     ) == approx(expected_output)
 
 
 @pytest.mark.parametrize("test_input, expected_output", test_params)
 def test_get_active_reward_amount_for_week_eth(test_input, expected_output):
-    assert vesting_schedule.get_active_reward_amount_for_week_eth(
-        test_input, networkutil.DEV_CHAINID
-    ) == approx(expected_output * ACTIVE_REWARDS_MULTIPLIER)
+    assert vesting_schedule.get_active_reward_amount_for_week_eth(test_input) == approx(
+        expected_output * ACTIVE_REWARDS_MULTIPLIER
+    )
+
+
+@enforce_types
+def test_reward_amounts_add_up():
+    # weekly amounts of halflife vesting add up to the amount vested, exactly
+    n_weeks = 52 * 20
+    amounts = [
+        vesting_schedule.get_reward_amount_for_week_wei(
+            vesting_schedule.VESTING_START_DT + timedelta(weeks=i)
+        )
+        for i in range(n_weeks)
+    ]
+    vested = vesting_schedule._halflife(
+        vesting_schedule.VESTING_TOT_AMOUNT,
+        n_weeks * 7 * 24 * 60 * 60,
+        vesting_schedule.HALF_LIFE,
+    )
+    assert sum(amounts) == vested
+
+
+@enforce_types
+def test_halflife_reverts():
+    # where VestingWalletHalving.getAmount would revert
+    with pytest.raises(ValueError):
+        vesting_schedule._halflife(-1, 0, 10)
+    with pytest.raises(ValueError):
+        vesting_schedule._halflife(2**256, 0, 10)
+    with pytest.raises(ValueError):
+        vesting_schedule._halflife(10, 0, 0)
+    with pytest.raises(ValueError):
+        vesting_schedule._halflife(2**255, 2, 4)  # p * t overflows
+    assert vesting_schedule._halflife(2**255, 1, 4) == 2**255 // 8
 
 
 @enforce_types
 def test_compare_halflife_functions():
-    # compare python and solidity halflife function
-    value = 503370000 * 1e18
+    # compare python and solidity halflife function: they match exactly
+    value = 503370000 * 10**18
     halflife = 4 * 365 * 24 * 60 * 60  # 4 years
     month = 30 * 24 * 60 * 60
 
@@ -151,5 +178,6 @@ def test_compare_halflife_functions():
         solidity_result = vesting_schedule._halflife_solidity(
             value, i, halflife, networkutil.DEV_CHAINID
         )
-        diff = abs(py_result - solidity_result)
-        assert diff < 1e10, f"diff {diff} at i {i/halflife*2}"
+        assert py_result == solidity_result, f"at i {i/halflife*2}"
+
+    vesting_schedule.crosscheck_halflife(networkutil.DEV_CHAINID, 52 * 5)
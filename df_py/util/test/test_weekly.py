@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+from enforce_typing import enforce_types
+
+from df_py.util import weekly
+from df_py.util.weekly import Stage
+
+
+@enforce_types
+def test_run_stages_order():
+    done = []
+    stages = [
+        Stage("calc", lambda: done.append("calc"), ("rate", "volsym")),
+        Stage("rate", lambda: done.append("rate")),
+        Stage("volsym", lambda: done.append("volsym"), ("blocks",)),
+        Stage("blocks", lambda: done.append("blocks")),
+    ]
+    seconds = weekly.run_stages(stages, 4)
+
+    assert sorted(seconds) == ["blocks", "calc", "rate", "volsym"]
+    assert all(s >= 0.0 for s in seconds.values())
+    assert done.index("blocks") < done.index("volsym") < done.index("calc")
+    assert done.index("rate") < done.index("calc")
+
+
+@enforce_types
+def test_run_stages_concurrent():
+    # each stage waits for the other, so this only finishes if they overlap
+    barrier = threading.Barrier(2, timeout=5)
+    stages = [Stage("a", barrier.wait), Stage("b", barrier.wait)]
+    weekly.run_stages(stages, 2)
+
+
+@enforce_types
+def test_run_stages_timing():
+    seconds = weekly.run_stages([Stage("sleep", lambda: time.sleep(0.05))], 1)
+    assert seconds["sleep"] >= 0.05
+
+
+@enforce_types
+def test_run_stages_failure():
+    done = []
+
+    def fail():
+        raise ValueError("no rate")
+
+    stages = [
+        Stage("rate", fail),
+        Stage("calc", lambda: done.append("calc"), ("rate",)),
+        Stage("volsym", lambda: done.append("volsym")),
+    ]
+    with pytest.raises(ValueError, match="no rate"):
+        weekly.run_stages(stages, 1)
+    assert "calc" not in done
+
+
+@enforce_types
+def test_run_stages_bad_graph():
+    with pytest.raises(ValueError, match="cycle"):
+        weekly.run_stages(
+            [Stage("a", lambda: None, ("b",)), Stage("b", lambda: None, ("a",))], 2
+        )
+    with pytest.raises(AssertionError):
+        weekly.run_stages([Stage("a", lambda: None, ("nope",))], 2)
+    with pytest.raises(AssertionError):
+        weekly.run_stages([Stage("a", lambda: None), Stage("a", lambda: None)], 2)
+
+
+@enforce_types
+def test_weekly_stages(tmp_path):
+    stages = weekly.weekly_stages(
+        "2023-06-01",
+        str(tmp_path),
+        "address.json",
+        1,
+        50,
+        ["OCEAN", "ETH"],
+        [1, 137],
+        0.0,
+    )
+    deps = {stage.name: stage.deps for stage in stages}
+
+    assert deps["rate_MOCEAN"] == ("rate_OCEAN",)
+    assert deps["volsym_137"] == ("blocks_137",)
+    assert deps["allocations_realtime"] == ("blocks_1",)
+    assert deps["passive"] == ("vebals_realtime",)
+    assert set(deps["calc"]) == {
+        "rate_OCEAN",
+        "rate_ETH",
+        "rate_MOCEAN",
+        "volsym_1",
+        "volsym_137",
+        "vebals",
+        "allocations",
+        "tot_ocean",
+    }
@@ -0,0 +1,26 @@
+"""
+Runtime type checking that can be switched off.
+
+@enforce_types checks argument and return types on every call. That's what
+we want in tests, but in production runs it's pure overhead on hot paths
+(per-row loaders, per-prediction constructors, the reward calculator).
+
+Set envvar DFPY_ENFORCE_TYPES=0 to make enforce_types (and the reward
+calculator's freeze_attributes) zero-overhead pass-throughs: they return
+the decorated function or class unchanged. The envvar is read once, at
+import time. Default: on. dftool turns it off unless it's set; pytest.ini
+turns it on.
+"""
+
+import os
+
+from enforce_typing import enforce_types as _enforce_types
+
+ENFORCE_TYPES = os.getenv("DFPY_ENFORCE_TYPES", "1") != "0"
+
+
+def enforce_types(wrapped):
+    """enforce_typing.enforce_types, or a pass-through if switched off"""
+    if not ENFORCE_TYPES:
+        return wrapped
+    return _enforce_types(wrapped)
@@ -1,9 +1,6 @@
+import functools
 from datetime import datetime, timedelta
-from typing import Optional
 
-from enforce_typing import enforce_types
-
-from df_py.util import oceanutil
 from df_py.util.base18 import from_wei, to_wei
 from df_py.util.constants import (
     ACTIVE_REWARDS_MULTIPLIER,
@@ -11,18 +8,28 @@ from df_py.util.constants import (
     PREDICTOOR_OCEAN_BUDGET,
     PREDICTOOR_RELEASE_WEEK,
 )
+from df_py.util.typecheck import enforce_types
 from df_py.volume.reward_calculator import get_df_week_number
 
+UINT256_MAX = 2**256 - 1
+
+# halflife vesting, after the linear schedule of DFMAIN_CONSTANTS
+VESTING_START_DT = datetime(2025, 3, 13)
+HALF_LIFE = 4 * 365 * 24 * 60 * 60  # 4 years
+TOT_SUPPLY = 503370000 * 1e18
+# computed in float, as it always has been, so that amounts don't change
+VESTING_TOT_AMOUNT = int(TOT_SUPPLY - 32530000)
+
 
 @enforce_types
 def get_active_reward_amount_for_week_eth_by_stream(
-    start_dt: datetime, substream: str, chain_id: Optional[int] = None
+    start_dt: datetime, substream: str
 ) -> float:
     """
     Return the reward amount for the week and substream in ETH starting at start_dt.
     This is the amount that will be allocated to active rewards.
     """
-    total_reward_amount = get_active_reward_amount_for_week_eth(start_dt, chain_id)
+    total_reward_amount = get_active_reward_amount_for_week_eth(start_dt)
 
     dfweek = get_df_week_number(start_dt) - 1
 
@@ -31,21 +38,19 @@ def get_active_reward_amount_for_week_eth_by_stream(
 
     if substream == "volume":
         return total_reward_amount - get_active_reward_amount_for_week_eth_by_stream(
-            start_dt, "predictoor", chain_id
+            start_dt, "predictoor"
         )
 
     raise ValueError("Unrecognized substream: {}".format(substream))
 
 
 @enforce_types
-def get_active_reward_amount_for_week_eth(
-    start_dt: datetime, chain_id: Optional[int] = None
-) -> float:
+def get_active_reward_amount_for_week_eth(start_dt: datetime) -> float:
     """
     Return the reward amount for the week in ETH starting at start_dt.
     This is the amount that will be allocated to active rewards.
     """
-    total_reward_amount = get_reward_amount_for_week_wei(start_dt, chain_id)
+    total_reward_amount = get_reward_amount_for_week_wei(start_dt)
     active_reward_amount = int(total_reward_amount * ACTIVE_REWARDS_MULTIPLIER)
     active_reward_amount_eth = from_wei(active_reward_amount)
 
@@ -53,15 +58,18 @@ def get_active_reward_amount_for_week_eth(
 
 
 @enforce_types
-def get_reward_amount_for_week_wei(
-    start_dt: datetime, chain_id: Optional[int] = None
-) -> int:
+def get_reward_amount_for_week_wei(start_dt: datetime) -> int:
     """
     Return the total reward amount for the week in WEI starting at start_dt.
     This amount is in accordance with the vesting schedule.
     Returns 0 if the week is before the start of the vesting schedule (DF29).
+    Computed locally and memoized, so any range of weeks is cheap.
     """
+    return _reward_amount_for_week_wei(start_dt)
+
 
+@functools.lru_cache(maxsize=None)
+def _reward_amount_for_week_wei(start_dt: datetime) -> int:
     # hardcoded values for linear vesting schedule
     dfweek = get_df_week_number(start_dt) - 1
 
@@ -70,46 +78,71 @@ def get_reward_amount_for_week_wei(
             return to_wei(value)
 
     # halflife
-    TOT_SUPPLY = 503370000 * 1e18
-    HALF_LIFE = 4 * 365 * 24 * 60 * 60  # 4 years
     end_dt = start_dt + timedelta(days=7)
-
-    vesting_start_dt = datetime(2025, 3, 13)
-    vesting_tot_amount = TOT_SUPPLY - 32530000
-
-    reward = _halflife_solidity(
-        vesting_tot_amount,
-        int((end_dt - vesting_start_dt).total_seconds()),
-        HALF_LIFE,
-        chain_id,
-    ) - _halflife_solidity(
-        vesting_tot_amount,
-        int((start_dt - vesting_start_dt).total_seconds()),
-        HALF_LIFE,
-        chain_id,
+    return _vested_wei(_seconds_since_vesting_start(end_dt)) - _vested_wei(
+        _seconds_since_vesting_start(start_dt)
     )
-    return int(reward)
+
+
+def _seconds_since_vesting_start(dt: datetime) -> int:
+    return int((dt - VESTING_START_DT).total_seconds())
+
+
+@functools.lru_cache(maxsize=None)
+def _vested_wei(t: int) -> int:
+    """Amount vested t seconds after the start of halflife vesting"""
+    return _halflife(VESTING_TOT_AMOUNT, t, HALF_LIFE)
 
 
 @enforce_types
-def _halflife(value, t, h) -> int:
+def _halflife(value: int, t: int, h: int) -> int:
     """
-    Approximation of halflife function
+    VestingWalletHalving.getAmount, exactly: approximation of
+    (1-(0.5^(t/h)))*value, in uint256 math.
+    Raises ValueError where the contract would revert.
     """
-    t = int(t)
-    h = int(h)
-    value = int(value)
-    p = value >> int(t // h)
+    for x in (value, t, h):
+        if not 0 <= x <= UINT256_MAX:
+            raise ValueError(f"{x} is out of uint256 range")
+    if h == 0:
+        raise ValueError("division by zero")
+
+    p = value >> (t // h)
     t %= h
-    return int(value - p + (p * t) // h // 2)
+    if p * t > UINT256_MAX:
+        raise ValueError("overflow")
+    return value - p + (p * t) // h // 2
 
 
 @enforce_types
-def _halflife_solidity(value, t, h, chain_id: Optional[int] = None) -> int:
+def _halflife_solidity(value: int, t: int, h: int, chain_id: int) -> int:
     """
     Halflife function in Solidity, requires network connection and
     deployed VestingWallet contract
     """
-    chain_id = chain_id if chain_id else 5
+    # pylint: disable=import-outside-toplevel
+    from df_py.util import oceanutil
+
+    return oceanutil.VestingWalletV0(chain_id).getAmount(value, t, h)
 
-    return oceanutil.VestingWalletV0(chain_id).getAmount(int(value), t, h)
+
+@enforce_types
+def crosscheck_halflife(chain_id: int, n_weeks: int = 52 * 10):
+    """
+    @description
+      Check that _halflife matches the VestingWallet contract on chain_id,
+      for the amounts vested at each of the first n_weeks week boundaries
+      of halflife vesting.
+
+    @raises
+      AssertionError -- at the first mismatch
+    """
+    week = 7 * 24 * 60 * 60
+    for i in range(n_weeks + 1):
+        py_result = _halflife(VESTING_TOT_AMOUNT, i * week, HALF_LIFE)
+        solidity_result = _halflife_solidity(
+            VESTING_TOT_AMOUNT, i * week, HALF_LIFE, chain_id
+        )
+        assert (
+            py_result == solidity_result
+        ), f"{py_result} != {solidity_result}, week {i}"
@@ -1,11 +1,11 @@
 import os
 
-from enforce_typing import enforce_types
 from web3.exceptions import ExtraDataLengthError
 from web3.main import Web3
 from web3.middleware import geth_poa_middleware
 
 from df_py.util.http_provider import get_web3_connection_provider
+from df_py.util.typecheck import enforce_types
 
 
 @enforce_types
@@ -0,0 +1,247 @@
+"""
+The weekly data pipeline, run in-process. It's what `dftool weekly` runs.
+
+It's df-system/scripts/all.sh as a dependency graph of stages: rates,
+volsym per chain, vebals and allocations (sampled and realtime), calc and
+calculate_passive. Stages run in threads of one process, so they share its
+caches and connection pools. A stage starts as soon as the stages it needs
+are done. So rates and on-chain queries overlap, and calc waits for its
+inputs. Each stage is timed.
+
+Like the dftool commands, a stage doesn't redo outputs that already exist.
+So re-running after a failure only redoes what's missing.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime
+from functools import partial
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from df_py.util import blockrange, instrument, networkutil, steps, tables
+from df_py.util.blocktime import get_st_fin_blocks, timestr_to_timestamp
+from df_py.util.oceanutil import record_deployed_contracts
+from df_py.util.typecheck import enforce_types
+from df_py.volume import csvs
+from df_py.volume.calc_rewards import calc_volume_rewards_from_csvs
+
+VE_CHAINID = 1  # chain of vebals, allocations and passive rewards
+
+
+class Stage(NamedTuple):
+    name: str
+    func: Callable  # called with no args
+    deps: Tuple[str, ...] = ()  # names of the stages that must finish first
+
+
+@enforce_types
+def run_stages(stages: List[Stage], n_workers: int) -> Dict[str, float]:
+    """
+    @description
+      Run stages in a pool of n_workers threads. Each stage starts once
+      all of its deps are done.
+
+      If a stage fails, stages that haven't started yet don't start. The
+      ones that are running finish, then the first error is raised.
+
+    @return
+      seconds -- dict of [stage_name] : wall time of the stage
+    """
+    names = [stage.name for stage in stages]
+    assert len(set(names)) == len(names), "stage names must be unique"
+    for stage in stages:
+        for dep in stage.deps:
+            assert dep in names, f"stage {stage.name} needs unknown stage {dep}"
+
+    seconds: Dict[str, float] = {}
+    not_started = list(stages)
+    running: dict = {}  # future : stage name
+    error = None
+
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        while not_started or running:
+            if error is None:
+                for stage in [s for s in not_started if set(s.deps) <= set(seconds)]:
+                    not_started.remove(stage)
+                    running[executor.submit(_timed, stage.func)] = stage.name
+                    print(f"Stage {stage.name}: start")
+
+            if not running:
+                if error is None:
+                    stuck = [stage.name for stage in not_started]
+                    raise ValueError(f"Stages {stuck} can never start: cycle?")
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    seconds[name] = future.result()
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    print(f"Stage {name}: failed: {e!r}")
+                    error = error or e
+                    continue
+                print(f"Stage {name}: done, {seconds[name]:.1f} s")
+                instrument.set_gauge("stage_seconds", seconds[name], stage=name)
+
+    if error is not None:
+        raise error
+    return seconds
+
+
+def _timed(func: Callable) -> float:
+    """Call func. @return -- wall time, in s"""
+    t0 = time.perf_counter()
+    func()
+    return time.perf_counter() - t0
+
+
+@enforce_types
+def weekly_stages(
+    st: str,
+    csv_dir: str,
+    address_file: str,
+    secret_seed: int,
+    n_samp: int,
+    token_symbols: List[str],
+    chain_ids: List[int],
+    tot_ocean: float,
+    retries: int = 1,
+) -> List[Stage]:
+    """
+    @description
+      The stages of the weekly pipeline, from ST until now.
+
+    @arguments
+      st -- start date, "YYYY-MM-DD"
+      tot_ocean -- OCEAN to give out. If 0, get it from the vesting schedule
+      ..
+    """
+    today = date.today().strftime("%Y-%m-%d")
+    st_date = datetime.strptime(st, "%Y-%m-%d")
+    blocks: Dict[int, Tuple[int, int]] = {}  # [chain_id] : (st_block, fin_block)
+    amounts = {"tot_ocean": tot_ocean}
+
+    def find_blocks(chain_id: int):
+        web3 = networkutil.chain_id_to_web3(chain_id)
+        record_deployed_contracts(address_file, chain_id)
+        blocks[chain_id] = get_st_fin_blocks(web3, st, "latest")
+
+    def block_range(chain_id: int, n: int):
+        web3 = networkutil.chain_id_to_web3(chain_id)
+        st_block, fin_block = blocks[chain_id]
+        return blockrange.create_range(web3, st_block, fin_block, n, secret_seed)
+
+    def volsym(chain_id: int):
+        outputs = [
+            csvs.nftvols_csv_filename(csv_dir, chain_id),
+            csvs.owners_csv_filename(csv_dir, chain_id),
+            csvs.symbols_csv_filename(csv_dir, chain_id),
+        ]
+        if not all(tables.table_exists(f) for f in outputs):
+            rng = block_range(chain_id, n_samp)
+            steps.run_step(outputs, steps.save_volsym, rng, csv_dir, chain_id, retries)
+
+    def ve_query(save_func: Callable, csv_file: str, sampled: bool):
+        if not tables.table_exists(csv_file):
+            rng = block_range(VE_CHAINID, n_samp if sampled else 1)
+            steps.run_step(
+                [csv_file], save_func, rng, csv_dir, VE_CHAINID, retries, sampled
+            )
+
+    def get_tot_ocean():
+        if amounts["tot_ocean"] == 0:
+            amounts["tot_ocean"] = steps.calc_tot_ocean(st_date, "volume")
+        print(f"TOT_OCEAN={amounts['tot_ocean']}")
+
+    def calc():
+        if not tables.table_exists(csvs.volume_rewards_csv_filename(csv_dir)):
+            calc_volume_rewards_from_csvs(csv_dir, st_date, amounts["tot_ocean"])
+
+    def passive():
+        if not tables.table_exists(csvs.passive_csv_filename(csv_dir)):
+            timestamp = int(timestr_to_timestamp(st))
+            steps.save_passive(VE_CHAINID, timestamp, csv_dir)
+
+    stages = []
+    for token_symbol in token_symbols:
+        stages.append(
+            Stage(
+                f"rate_{token_symbol}",
+                partial(
+                    steps.run_step,
+                    [csvs.rate_csv_filename(token_symbol, csv_dir)],
+                    steps.save_rate,
+                    token_symbol,
+                    st,
+                    today,
+                    csv_dir,
+                    retries,
+                ),
+            )
+        )
+    rate_stages = [stage.name for stage in stages]
+    if "OCEAN" in token_symbols:
+        stages.append(
+            Stage(
+                "rate_MOCEAN",
+                partial(
+                    steps.run_step,
+                    [csvs.rate_csv_filename("MOCEAN", csv_dir)],
+                    steps.copy_table,
+                    csvs.rate_csv_filename("OCEAN", csv_dir),
+                    csvs.rate_csv_filename("MOCEAN", csv_dir),
+                ),
+                ("rate_OCEAN",),
+            )
+        )
+        rate_stages.append("rate_MOCEAN")
+
+    for chain_id in sorted(set(chain_ids) | {VE_CHAINID}):
+        stages.append(Stage(f"blocks_{chain_id}", partial(find_blocks, chain_id)))
+    for chain_id in chain_ids:
+        stages.append(
+            Stage(
+                f"volsym_{chain_id}",
+                partial(volsym, chain_id),
+                (f"blocks_{chain_id}",),
+            )
+        )
+
+    ve_deps = (f"blocks_{VE_CHAINID}",)
+    for sampled, suffix in [(True, ""), (False, "_realtime")]:
+        stages += [
+            Stage(
+                f"vebals{suffix}",
+                partial(
+                    ve_query,
+                    steps.save_vebals,
+                    csvs.vebals_csv_filename(csv_dir, sampled),
+                    sampled,
+                ),
+                ve_deps,
+            ),
+            Stage(
+                f"allocations{suffix}",
+                partial(
+                    ve_query,
+                    steps.save_allocations,
+                    csvs.allocation_csv_filename(csv_dir, sampled),
+                    sampled,
+                ),
+                ve_deps,
+            ),
+        ]
+
+    stages += [
+        Stage("tot_ocean", get_tot_ocean),
+        Stage(
+            "calc",
+            calc,
+            tuple(rate_stages)
+            + tuple(f"volsym_{chain_id}" for chain_id in chain_ids)
+            + ("vebals", "allocations", "tot_ocean"),
+        ),
+        Stage("passive", passive, ("vebals_realtime",)),
+    ]
+    return stages
@@ -1,5 +1,4 @@
-from enforce_typing import enforce_types
-
+from df_py.util.typecheck import enforce_types
 from df_py.volume import cleancase, csvs
 
 
@@ -17,18 +16,24 @@ def allocs_to_stakes(allocs: dict, vebals: dict) -> dict:
       stakes - dict of [chainID][nft_addr][LP_addr] : veOCEAN_float - abs alloc
     """
 
-    allocs = cleancase.mod_allocations(allocs)
     vebals = cleancase.mod_vebals(vebals)
 
-    stakes = allocs.copy()  # we'll be changing the values
+    # one pass: clean up & check allocs, and compute stakes from them
+    stakes: dict = {}
+    lpsum: dict = {}
     for chainID in allocs:
+        stakes_at_chain = stakes.setdefault(int(chainID), {})
         for nft_addr in allocs[chainID]:
+            nft_addr2 = nft_addr.lower()
+            assert nft_addr2[:2] == "0x", nft_addr2
+            stakes_at_nft = stakes_at_chain.setdefault(nft_addr2, {})
             for LP_addr, perc_alloc in allocs[chainID][nft_addr].items():
-                vebal = vebals.get(LP_addr, 0.0)
-                stake = perc_alloc * vebal
-                stakes[chainID][nft_addr][LP_addr] = stake
+                assert isinstance(perc_alloc, float)
+                LP_addr2 = LP_addr.lower()
+                lpsum[LP_addr2] = lpsum.get(LP_addr2, 0.0) + perc_alloc
+                stakes_at_nft[LP_addr2] = perc_alloc * vebals.get(LP_addr2, 0.0)
 
-    cleancase.assert_stakes(stakes)
+    cleancase.assert_lpsum(lpsum)
     return stakes
 
 
@@ -0,0 +1,133 @@
+"""
+Aquarius asset names, with a persistent local index.
+
+Asset names rarely change, so each run only asks Aquarius for dids that
+the index hasn't seen, or that it saw AQUARIUS_NAMES_TTL or more ago.
+With AQUARIUS_NAMES_TTL=0, every run asks for all dids.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from df_py.util import disk_cache
+from df_py.util.constants import AQUARIUS_BASE_URL, AQUARIUS_NAMES_TTL
+from df_py.util.typecheck import enforce_types
+
+BATCH_SIZE = 9042
+RETRY_ATTEMPTS = 3
+RETRY_DELAY_S = 5.0
+MAX_WORKERS = 4
+
+INDEX_FILENAME = "aquarius_asset_names.json"
+
+
+class AssetNameIndex:
+    """Persistent dict of [did] : (asset_name, fetched_at_timestamp)"""
+
+    def __init__(self, filename: str, ttl: float):
+        self.filename = filename
+        self.ttl = ttl
+        data = disk_cache.load_json(filename, {})
+        self._entries: Dict[str, Tuple[str, float]] = {
+            did: (name, float(fetched_at)) for did, (name, fetched_at) in data.items()
+        }
+
+    @classmethod
+    def load(cls) -> "AssetNameIndex":
+        """Load the index from the cache dir, honoring envvar AQUARIUS_NAMES_TTL"""
+        ttl = float(os.getenv("AQUARIUS_NAMES_TTL", str(AQUARIUS_NAMES_TTL)))
+        return cls(disk_cache.cache_filename(INDEX_FILENAME), ttl)
+
+    def lookup(
+        self, dids: List[str], now: Optional[float] = None
+    ) -> Tuple[Dict[str, str], List[str]]:
+        """
+        @return
+          did_to_asset_name -- dict of [did] : asset_name, for fresh entries
+          stale_dids -- dids that are missing, or fetched >= ttl s ago
+        """
+        now = time.time() if now is None else now
+        did_to_asset_name: Dict[str, str] = {}
+        stale_dids: List[str] = []
+        for did in dids:
+            entry = self._entries.get(did)
+            if entry is None or now - entry[1] >= self.ttl:
+                stale_dids.append(did)
+            else:
+                did_to_asset_name[did] = entry[0]
+        return did_to_asset_name, stale_dids
+
+    def update(self, did_to_asset_name: Dict[str, str], now: Optional[float] = None):
+        now = time.time() if now is None else now
+        for did, name in did_to_asset_name.items():
+            self._entries[did] = (name, now)
+
+    def save(self):
+        """Save the entries, merged with what's on disk. Newest fetch wins"""
+
+        def merge(data: dict) -> dict:
+            # other runs may have saved since we loaded
+            for did, entry in self._entries.items():
+                if did not in data or float(data[did][1]) <= entry[1]:
+                    data[did] = entry
+            return data
+
+        disk_cache.locked_update(self.filename, merge, {})
+
+
+@enforce_types
+def fetch_asset_names(
+    nft_dids: List[str], retry_delay_s: float = RETRY_DELAY_S
+) -> Dict[str, str]:
+    """
+    @description
+      Ask Aquarius for the names of these dids. Batches are sent
+      concurrently, and a failed batch is retried on its own.
+
+    @return
+      did_to_asset_name -- dict of [did] : asset_name
+    """
+    batches = [
+        nft_dids[i : i + BATCH_SIZE] for i in range(0, len(nft_dids), BATCH_SIZE)
+    ]
+    did_to_asset_name: Dict[str, str] = {}
+    if not batches:
+        return did_to_asset_name
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(batches))) as pool:
+        results = pool.map(lambda batch: _fetch_batch(batch, retry_delay_s), batches)
+        for result in results:
+            did_to_asset_name.update(result)
+
+    return did_to_asset_name
+
+
+@enforce_types
+def _fetch_batch(batch: List[str], retry_delay_s: float) -> Dict[str, str]:
+    url = f"{AQUARIUS_BASE_URL}/api/aquarius/assets/names"
+    headers = {"Content-Type": "application/json"}
+
+    # Aquarius expects "didList": ["did:op:...", ...]
+    payload = json.dumps({"didList": batch})
+
+    attempt = 0
+    while True:
+        try:
+            resp = requests.post(url, data=payload, headers=headers, timeout=30)
+            resp.raise_for_status()
+            return json.loads(resp.text)
+        # pylint: disable=broad-exception-caught
+        except Exception as e:
+            attempt += 1
+            if attempt > RETRY_ATTEMPTS:
+                # pylint: disable=line-too-long, broad-exception-raised
+                raise Exception(
+                    f"Failed to get asset names from Aquarius after {RETRY_ATTEMPTS} attempts. Error: {e}"
+                ) from e
+            print(f"Aquarius batch failed, retry {attempt}: {e}")
+            time.sleep(retry_delay_s)
@@ -1,11 +1,15 @@
+import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Union
-
-from enforce_typing import enforce_types
+from typing import Dict, Optional, Set, Union
 
+from df_py.predictoor.csvs import (
+    load_predictoor_feed_addrs,
+    predictoor_contracts_csv_filename,
+)
 from df_py.util.constants import DO_PUBREWARDS, DO_RANK
 from df_py.util.graphutil import wait_to_latest_block
+from df_py.util.typecheck import enforce_types
 from df_py.volume import allocations, csvs
 from df_py.volume.reward_calculator import RewardCalculator, get_df_week_number
 
@@ -24,6 +28,10 @@ def calc_volume_rewards_from_csvs(
     SYM = csvs.load_symbols_csvs(csv_dir)
     R = csvs.load_rate_csvs(csv_dir)
 
+    feed_addrs = None  # ie query them
+    if os.path.exists(predictoor_contracts_csv_filename(str(csv_dir))):
+        feed_addrs = load_predictoor_feed_addrs(str(csv_dir))
+
     chains = list(S.keys())
     for chain in chains:
         wait_to_latest_block(chain)
@@ -38,10 +46,13 @@ def calc_volume_rewards_from_csvs(
         tot_ocean,
         do_pubrewards,
         do_rank,
+        reuse_clean_inputs=True,  # they're fresh from the loaders
+        as_table=True,
+        predictoor_feed_addrs=feed_addrs,
     )
 
-    csvs.save_volume_rewards_csv(rewperlp, str(csv_dir))
-    csvs.save_volume_rewardsinfo_csv(rewinfo, str(csv_dir))
+    csvs.save_volume_rewards_table(rewperlp, str(csv_dir))
+    csvs.save_volume_rewardsinfo_table(rewinfo, str(csv_dir))
 
 
 def calc_volume_rewards(
@@ -54,6 +65,9 @@ def calc_volume_rewards(
     tot_ocean: Optional[float] = 0.0,
     do_pubrewards: Optional[bool] = DO_PUBREWARDS,
     do_rank: Optional[bool] = DO_RANK,
+    reuse_clean_inputs: bool = False,
+    as_table: bool = False,
+    predictoor_feed_addrs: Optional[Dict[int, Set[str]]] = None,
 ):
     prev_week = 0
     if start_date is None:
@@ -81,6 +95,8 @@ def calc_volume_rewards(
         tot_ocean,
         do_pubrewards,
         do_rank,
+        reuse_clean_inputs,
+        predictoor_feed_addrs,
     )
 
-    return vol_calculator.calculate()
+    return vol_calculator.calculate(as_table)
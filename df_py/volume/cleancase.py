@@ -1,26 +1,38 @@
 # 'modX' functions modify 'X' to follow rules: lowercase address,uppercase token,"0x" in address
 # 'assertX' functions asserts that 'X' follows the rules
+#
+# modX build the clean copy and check the rules in the same pass. With
+# reuse_if_clean=True, an X that already follows the rules (eg straight from
+# our own csv loaders) is returned as-is, without a copy.
 
-from enforce_typing import enforce_types
+from df_py.util.typecheck import enforce_types
 
 FAKE_CHAINID = 99
 FAKE_TOKEN_ADDR = "0xfake_token"
 
 
 @enforce_types
-def mod_allocations(allocs: dict) -> dict:
+def mod_allocations(allocs: dict, reuse_if_clean: bool = False) -> dict:
     """allocs - dict of [chainID][nft_addr][LP_addr] : LP's % alloc"""
+    if reuse_if_clean and _is_clean(assert_allocations, allocs):
+        return allocs
+
     allocs2: dict = {}
+    lpsum: dict = {}
     for chainID in allocs:
         chainID2 = int(chainID)
         allocs2[chainID2] = {}
         for nft_addr in allocs[chainID]:
             nft_addr2 = nft_addr.lower()
+            assert nft_addr2[:2] == "0x", nft_addr2
             allocs2[chainID2][nft_addr2] = {}
             for LP_addr, alloc in allocs[chainID][nft_addr].items():
+                assert isinstance(alloc, float)
                 LP_addr2 = LP_addr.lower()
                 allocs2[chainID2][nft_addr2][LP_addr2] = alloc
-    assert_allocations(allocs2)
+                lpsum[LP_addr2] = lpsum.get(LP_addr2, 0.0) + alloc
+
+    assert_lpsum(lpsum)
     return allocs2
 
 
@@ -34,11 +46,28 @@ def assert_allocations(allocs: dict):
             assert nft_addr[:2] == "0x", nft_addr
             assert nft_addr.lower() == nft_addr, nft_addr
             for LP_addr, alloc in allocs[chainID][nft_addr].items():
+                assert LP_addr[:2] == "0x", LP_addr
+                assert LP_addr.lower() == LP_addr, LP_addr
                 assert isinstance(alloc, float)
                 if LP_addr not in lpsum:
                     lpsum[LP_addr] = 0.0
                 lpsum[LP_addr] += float(alloc)
 
+    assert_lpsum(lpsum)
+
+
+def _is_clean(assert_func, x) -> bool:
+    """Does x pass assert_func?"""
+    try:
+        assert_func(x)
+    except AssertionError:
+        return False
+    return True
+
+
+@enforce_types
+def assert_lpsum(lpsum: dict):
+    """lpsum - dict of [LP_addr] : LP's total % alloc"""
     for LP_addr in lpsum:
         assert (
             lpsum[LP_addr] <= 1.0 + 1e-5
@@ -46,19 +75,23 @@ def assert_allocations(allocs: dict):
 
 
 @enforce_types
-def mod_stakes(stakes: dict) -> dict:
+def mod_stakes(stakes: dict, reuse_if_clean: bool = False) -> dict:
     """stakes - dict of [chainID][nft_addr][LP_addr] : LP's absolute alloc"""
+    if reuse_if_clean and _is_clean(assert_stakes, stakes):
+        return stakes
+
     stakes2: dict = {}
     for chainID in stakes:
         chainID2 = int(chainID)
         stakes2[chainID2] = {}
         for nft_addr in stakes[chainID]:
             nft_addr2 = nft_addr.lower()
+            assert nft_addr2[:2] == "0x", nft_addr2
             stakes2[chainID2][nft_addr2] = {}
             for LP_addr, alloc in stakes[chainID][nft_addr].items():
+                assert isinstance(alloc, float)
                 LP_addr2 = LP_addr.lower()
                 stakes2[chainID2][nft_addr2][LP_addr2] = alloc
-    assert_stakes(stakes2)
     return stakes2
 
 
@@ -72,19 +105,23 @@ def assert_stakes(stakes: dict):
         for nft_addr in stakes[chainID]:
             assert nft_addr[:2] == "0x", nft_addr
             assert nft_addr.lower() == nft_addr, nft_addr
-            for stake in stakes[chainID][nft_addr].values():
+            for LP_addr, stake in stakes[chainID][nft_addr].items():
+                assert LP_addr[:2] == "0x", LP_addr
+                assert LP_addr.lower() == LP_addr, LP_addr
                 assert isinstance(stake, float)
 
 
 @enforce_types
-def mod_vebals(vebals: dict) -> dict:
+def mod_vebals(vebals: dict, reuse_if_clean: bool = False) -> dict:
     """vebals - dict of [LP_addr] : LP's ve balance"""
+    if reuse_if_clean and _is_clean(assert_vebals, vebals):
+        return vebals
+
     vebals2 = {}
     for LP_addr, bal in vebals.items():
         LP_addr2 = LP_addr.lower()
+        assert LP_addr2[:2] == "0x", LP_addr2
         vebals2[LP_addr2] = bal
-
-    assert_vebals(vebals2)
     return vebals2
 
 
@@ -97,20 +134,23 @@ def assert_vebals(vebals: dict):
 
 
 @enforce_types
-def mod_nft_vols(nftvols: dict) -> dict:
+def mod_nft_vols(nftvols: dict, reuse_if_clean: bool = False) -> dict:
     """nftvols - dict of [chainID][basetoken_address][NFT_addr] : vol"""
+    if reuse_if_clean and _is_clean(assert_nft_vols, nftvols):
+        return nftvols
+
     nftvols2: dict = {}
     for chainID in nftvols:
         chainID2 = chainID
         nftvols2[chainID2] = {}
         for base_addr in nftvols[chainID]:
             base_addr2 = base_addr.lower()
+            assert base_addr2[:2] == "0x", base_addr2
             nftvols2[chainID2][base_addr2] = {}
             for NFT_addr, vol in nftvols[chainID][base_addr].items():
                 NFT_addr2 = NFT_addr.lower()
+                assert NFT_addr2[:2] == "0x", NFT_addr2
                 nftvols2[chainID2][base_addr2][NFT_addr2] = vol
-
-    assert_nft_vols(nftvols2)
     return nftvols2
 
 
@@ -118,6 +158,7 @@ def mod_nft_vols(nftvols: dict) -> dict:
 def assert_nft_vols(nftvols: dict):
     """nftvols - dict of [chainID][basetoken_address][nft_addr] : vol"""
     for chainID in nftvols:
+        assert isinstance(chainID, int)
         for base_addr in nftvols[chainID]:
             assert base_addr == base_addr.lower(), base_addr
             assert base_addr[:2] == "0x", base_addr
@@ -127,18 +168,19 @@ def assert_nft_vols(nftvols: dict):
 
 
 @enforce_types
-def mod_symbols(symbols: dict) -> dict:
+def mod_symbols(symbols: dict, reuse_if_clean: bool = False) -> dict:
     """symbols - dict of [chainID][basetoken_address] : symbol"""
+    if reuse_if_clean and _is_clean(assert_symbols, symbols):
+        return symbols
+
     symbols2: dict = {}
     for chainID in symbols:
         chainID2 = chainID
         symbols2[chainID2] = {}
         for base_addr, symbol in symbols[chainID].items():
             base_addr2 = base_addr.lower()
-            symbol2 = symbol.upper()
-            symbols2[chainID2][base_addr2] = symbol2
-
-    assert_symbols(symbols2)
+            assert base_addr2[:2] == "0x", base_addr2
+            symbols2[chainID2][base_addr2] = symbol.upper()
     return symbols2
 
 
@@ -146,6 +188,7 @@ def mod_symbols(symbols: dict) -> dict:
 def assert_symbols(symbols: dict):
     """nftvols - dict of [chainID][basetoken_address] : symbol"""
     for chainID in symbols:
+        assert isinstance(chainID, int)
         for base_addr, symbol in symbols[chainID].items():
             assert base_addr == base_addr.lower(), base_addr
             assert base_addr[:2] == "0x", base_addr
@@ -153,14 +196,16 @@ def assert_symbols(symbols: dict):
 
 
 @enforce_types
-def mod_rates(rates: dict) -> dict:
+def mod_rates(rates: dict, reuse_if_clean: bool = False) -> dict:
     """rates - dict of [basetoken_symbol] : USD_per_basetoken"""
+    if reuse_if_clean and _is_clean(assert_rates, rates):
+        return rates
+
     rates2 = {}
     for base_symb, rate in rates.items():
         base_symb2 = base_symb.upper()
+        assert base_symb2[:2] != "0x", base_symb2
         rates2[base_symb2] = rate
-
-    assert_rates(rates2)
     return rates2
 
 
@@ -173,8 +218,11 @@ def assert_rates(rates: dict):
 
 
 @enforce_types
-def mod_owners(owners: dict) -> dict:
+def mod_owners(owners: dict, reuse_if_clean: bool = False) -> dict:
     """owners - dict of [chainID][nft_addr] : owner_addr"""
+    if reuse_if_clean and _is_clean(assert_owners, owners):
+        return owners
+
     owners2: dict = {}
     for chainID in owners:
         chainID2 = chainID
@@ -182,9 +230,9 @@ def mod_owners(owners: dict) -> dict:
         for nft_addr, owner_addr in owners[chainID].items():
             nft_addr2 = nft_addr.lower()
             owner_addr2 = owner_addr.lower()
+            assert nft_addr2[:2] == "0x", nft_addr2
+            assert owner_addr2[:2] == "0x", owner_addr2
             owners2[chainID2][nft_addr2] = owner_addr2
-
-    assert_owners(owners2)
     return owners2
 
 
@@ -192,6 +240,7 @@ def mod_owners(owners: dict) -> dict:
 def assert_owners(owners: dict):
     """nftvols - dict of [chainID][nft_addr] : owner_addr"""
     for chainID in owners:
+        assert isinstance(chainID, int)
         for nft_addr, owner_addr in owners[chainID].items():
             assert nft_addr == nft_addr.lower(), nft_addr
             assert nft_addr[:2] == "0x", nft_addr
@@ -3,12 +3,38 @@ import glob
 import os
 from typing import Any, Dict, List, Tuple
 
-from enforce_typing import enforce_types
-from web3.main import Web3
+import numpy as np
 
-from df_py.util.csv_helpers import _last_int, assert_is_eth_addr
+from df_py.util import tables
+from df_py.util.csv_helpers import _last_int, assert_is_eth_addr, lowercase_eth_addrs
+from df_py.util.typecheck import enforce_types
 from df_py.volume.models import SimpleDataNft
 
+ALLOCATION_SCHEMA = {"chainID": int, "nft_addr": str, "LP_addr": str, "percent": float}
+VEBALS_SCHEMA = {
+    "LP_addr": str,
+    "balance": float,
+    "locked_amt": float,
+    "unlock_time": int,
+}
+NFTVOLS_SCHEMA = {
+    "chainID": int,
+    "basetoken_addr": str,
+    "nft_addr": str,
+    "vol_amt": float,
+}
+OWNERS_SCHEMA = {"chainID": int, "nft_addr": str, "owner_addr": str}
+SYMBOLS_SCHEMA = {"chainID": int, "token_addr": str, "token_symbol": str}
+RATE_SCHEMA = {"token_symbol": str, "rate": float}
+VOLUME_REWARDS_SCHEMA = {"chainID": int, "LP_addr": str, "OCEAN_amt": float}
+REWARDSINFO_SCHEMA = {
+    "chainID": int,
+    "nft_addr": str,
+    "LP_addr": str,
+    "amt": float,
+    "token": str,
+}
+
 # ========================================================================
 # allocation csvs
 
@@ -25,25 +51,15 @@ def save_allocation_csv(allocs: dict, csv_dir: str, sampled=True):
     """
     assert os.path.exists(csv_dir), csv_dir
     csv_file = allocation_csv_filename(csv_dir, sampled)
-    assert not os.path.exists(csv_file), csv_file
     S = allocs
-    with open(csv_file, "w") as f:
-        writer = csv.writer(f)
-        row = ["chainID", "nft_addr", "LP_addr", "percent"]
-        writer.writerow(row)
-        for chainID in S.keys():
-            for nft_addr in S[chainID].keys():
-                assert_is_eth_addr(nft_addr)
-                for LP_addr, percent in S[chainID][nft_addr].items():
-                    assert_is_eth_addr(nft_addr)
-                    row = [
-                        chainID,
-                        nft_addr.lower(),
-                        LP_addr.lower(),
-                        percent,
-                    ]
-                    writer.writerow(row)
-    print(f"Created {csv_file}")
+    rows = []
+    for chainID in S.keys():
+        for nft_addr in S[chainID].keys():
+            assert_is_eth_addr(nft_addr)
+            for LP_addr, percent in S[chainID][nft_addr].items():
+                assert_is_eth_addr(LP_addr)
+                rows.append([chainID, nft_addr.lower(), LP_addr.lower(), percent])
+    tables.save_table(csv_file, ALLOCATION_SCHEMA, rows)
 
 
 @enforce_types
@@ -56,31 +72,21 @@ def load_allocation_csvs(csv_dir: str) -> Dict[int, Dict[str, Dict[str, float]]]
       allocs -- dict of [chainID][basetoken_addr][nft_addr][LP_addr] : perc_flt
     """
     csv_file = allocation_csv_filename(csv_dir)
-    allocs: Dict[int, Dict[str, Dict[str, float]]] = {}
-    with open(csv_file, "r") as f:
-        reader = csv.reader(f)
-        for row_i, row in enumerate(reader):
-            if row_i == 0:
-                assert row == ["chainID", "nft_addr", "LP_addr", "percent"]
-                continue
-            _chainID, nft_addr, LP_addr, _percent = row
+    cols = tables.load_table(csv_file, ALLOCATION_SCHEMA)
+    nft_addrs = lowercase_eth_addrs(cols["nft_addr"])
+    LP_addrs = _checksum_addrs(lowercase_eth_addrs(cols["LP_addr"]))
 
-            chainID = int(_chainID)
-            nft_addr = nft_addr.lower()
-            LP_addr = Web3.to_checksum_address(LP_addr.lower())
-            percent = float(_percent)
-
-            assert_is_eth_addr(nft_addr)
-            assert_is_eth_addr(LP_addr)
-
-            if chainID not in allocs:
-                allocs[chainID] = {}
+    allocs: Dict[int, Dict[str, Dict[str, float]]] = {}
+    for chainID, nft_addr, LP_addr, percent in zip(
+        cols["chainID"].tolist(), nft_addrs, LP_addrs, cols["percent"].tolist()
+    ):
+        if chainID not in allocs:
+            allocs[chainID] = {}
 
-            if nft_addr not in allocs[chainID]:
-                allocs[chainID][nft_addr] = {}
+        if nft_addr not in allocs[chainID]:
+            allocs[chainID][nft_addr] = {}
 
-            allocs[chainID][nft_addr][LP_addr] = percent
-    print(f"Loaded {csv_file}")
+        allocs[chainID][nft_addr][LP_addr] = percent
 
     return allocs
 
@@ -112,22 +118,18 @@ def save_vebals_csv(
     """
     assert os.path.exists(csv_dir), csv_dir
     csv_file = vebals_csv_filename(csv_dir, sampled)
-    assert not os.path.exists(csv_file), csv_file
-    with open(csv_file, "w") as f:
-        writer = csv.writer(f)
-        row = ["LP_addr", "balance", "locked_amt", "unlock_time"]
-        writer.writerow(row)
-        for LP_addr in vebals.keys():
-            assert_is_eth_addr(LP_addr)
-            row = [
+    rows = []
+    for LP_addr in vebals.keys():
+        assert_is_eth_addr(LP_addr)
+        rows.append(
+            [
                 LP_addr.lower(),
                 vebals[LP_addr],
                 locked_amt[LP_addr],
                 unlock_time[LP_addr],
             ]
-            writer.writerow(row)
-
-    print(f"Created {csv_file}")
+        )
+    tables.save_table(csv_file, VEBALS_SCHEMA, rows)
 
 
 def load_vebals_csv(
@@ -141,29 +143,12 @@ def load_vebals_csv(
       vebals -- dict of [LP_addr] : balance
     """
     csv_file = vebals_csv_filename(csv_dir, sampled)
-    vebals: Dict[str, float] = {}
-    locked_amts: Dict[str, float] = {}
-    unlock_times: Dict[str, int] = {}
-    with open(csv_file, "r") as f:
-        reader = csv.reader(f)
-        for row_i, row in enumerate(reader):
-            if row_i == 0:
-                assert row == ["LP_addr", "balance", "locked_amt", "unlock_time"]
-                continue
-            LP_addr, _balance, _locked_amt, _unlock_time = row
-
-            LP_addr = Web3.to_checksum_address(LP_addr.lower())
-            balance = float(_balance)
-            locked_amt = float(_locked_amt)
-            unlock_time = int(_unlock_time)
+    cols = tables.load_table(csv_file, VEBALS_SCHEMA)
+    LP_addrs = _checksum_addrs(lowercase_eth_addrs(cols["LP_addr"]))
 
-            assert_is_eth_addr(LP_addr)
-
-            vebals[LP_addr] = balance
-            locked_amts[LP_addr] = locked_amt
-            unlock_times[LP_addr] = unlock_time
-
-    print(f"Loaded {csv_file}")
+    vebals: Dict[str, float] = dict(zip(LP_addrs, cols["balance"].tolist()))
+    locked_amts: Dict[str, float] = dict(zip(LP_addrs, cols["locked_amt"].tolist()))
+    unlock_times: Dict[str, int] = dict(zip(LP_addrs, cols["unlock_time"].tolist()))
     return vebals, locked_amts, unlock_times
 
 
@@ -357,18 +342,14 @@ def save_nftvols_csv(nftvols_at_chain: dict, csv_dir: str, chainID: int):
     """
     assert os.path.exists(csv_dir), csv_dir
     csv_file = nftvols_csv_filename(csv_dir, chainID)
-    assert not os.path.exists(csv_file), csv_file
     nftvols = nftvols_at_chain
-    with open(csv_file, "w") as f:
-        writer = csv.writer(f)
-        writer.writerow(["chainID", "basetoken_addr", "nft_addr", "vol_amt"])
-        for basetoken_addr in nftvols.keys():
-            assert_is_eth_addr(basetoken_addr)
-            for nft_addr, vol in nftvols[basetoken_addr].items():
-                assert_is_eth_addr(nft_addr)
-                row = [chainID, basetoken_addr.lower(), nft_addr.lower(), vol]
-                writer.writerow(row)
-    print(f"Created {csv_file}")
+    rows = []
+    for basetoken_addr in nftvols.keys():
+        assert_is_eth_addr(basetoken_addr)
+        for nft_addr, vol in nftvols[basetoken_addr].items():
+            assert_is_eth_addr(nft_addr)
+            rows.append([chainID, basetoken_addr.lower(), nft_addr.lower(), vol])
+    tables.save_table(csv_file, NFTVOLS_SCHEMA, rows)
 
 
 @enforce_types
@@ -398,28 +379,19 @@ def load_nftvols_csv(csv_dir: str, chainID: int):
       nftvols_at_chain -- dict of [basetoken_addr][nft_addr] : vol_amt
     """
     csv_file = nftvols_csv_filename(csv_dir, chainID)
-    nftvols: Dict[str, Dict[str, float]] = {}  # ie nftvols_at_chain
-    with open(csv_file, "r") as f:
-        reader = csv.reader(f)
-        for row_i, row in enumerate(reader):
-            if row_i == 0:  # header
-                assert row == ["chainID", "basetoken_addr", "nft_addr", "vol_amt"]
-                continue
-
-            chainID2 = int(row[0])
-            basetoken_addr = row[1].lower()
-            nft_addr = row[2].lower()
-            vol_amt = float(row[3])
+    cols = tables.load_table(csv_file, NFTVOLS_SCHEMA)
+    assert (cols["chainID"] == chainID).all(), "csv had data from different chain"
+    basetoken_addrs = lowercase_eth_addrs(cols["basetoken_addr"])
+    nft_addrs = lowercase_eth_addrs(cols["nft_addr"])
 
-            assert chainID2 == chainID, "csv had data from different chain"
-            assert_is_eth_addr(basetoken_addr)
-            assert_is_eth_addr(nft_addr)
-
-            if basetoken_addr not in nftvols:
-                nftvols[basetoken_addr] = {}
-            assert nft_addr not in nftvols[basetoken_addr], "duplicate found"
-            nftvols[basetoken_addr][nft_addr] = vol_amt
-    print(f"Loaded {csv_file}")
+    nftvols: Dict[str, Dict[str, float]] = {}  # ie nftvols_at_chain
+    for basetoken_addr, nft_addr, vol_amt in zip(
+        basetoken_addrs, nft_addrs, cols["vol_amt"].tolist()
+    ):
+        if basetoken_addr not in nftvols:
+            nftvols[basetoken_addr] = {}
+        assert nft_addr not in nftvols[basetoken_addr], "duplicate found"
+        nftvols[basetoken_addr][nft_addr] = vol_amt
 
     return nftvols
 
@@ -427,7 +399,7 @@ def load_nftvols_csv(csv_dir: str, chainID: int):
 @enforce_types
 def nftvols_csv_filenames(csv_dir: str) -> List[str]:
     """Returns a list of nftvols filenames in this directory"""
-    return glob.glob(os.path.join(csv_dir, "nftvols*.csv"))
+    return tables.table_filenames(csv_dir, "nftvols*")
 
 
 @enforce_types
@@ -459,21 +431,12 @@ def save_owners_csv(owners_at_chain: Dict[str, str], csv_dir: str, chainID: int)
     """
     assert os.path.exists(csv_dir), csv_dir
     csv_file = owners_csv_filename(csv_dir, chainID)
-    assert not os.path.exists(csv_file), csv_file
-    with open(csv_file, "w") as f:
-        writer = csv.writer(f)
-        writer.writerow(["chainID", "nft_addr", "owner_addr"])
-        for nft_addr, owner_addr in owners_at_chain.items():
-            assert_is_eth_addr(nft_addr)
-            assert_is_eth_addr(owner_addr)
-            row = [
-                chainID,
-                nft_addr.lower(),
-                owner_addr.lower(),
-            ]
-            writer.writerow(row)
-
-    print(f"Created {csv_file}")
+    rows = []
+    for nft_addr, owner_addr in owners_at_chain.items():
+        assert_is_eth_addr(nft_addr)
+        assert_is_eth_addr(owner_addr)
+        rows.append([chainID, nft_addr.lower(), owner_addr.lower()])
+    tables.save_table(csv_file, OWNERS_SCHEMA, rows)
 
 
 @enforce_types
@@ -504,32 +467,19 @@ def load_owners_csv(csv_dir: str, chainID: int) -> Dict[str, str]:
       owners_at_chain -- dict of [nft_addr] : owner_addr
     """
     csv_file = owners_csv_filename(csv_dir, chainID)
-    owners_at_chain: dict = {}
-    with open(csv_file, "r") as f:
-        reader = csv.reader(f)
-        for row_i, row in enumerate(reader):
-            if row_i == 0:  # header
-                assert row == ["chainID", "nft_addr", "owner_addr"]
-                continue
+    cols = tables.load_table(csv_file, OWNERS_SCHEMA)
+    assert (cols["chainID"] == chainID).all(), "csv had data from different chain"
+    nft_addrs = lowercase_eth_addrs(cols["nft_addr"])
+    owner_addrs = lowercase_eth_addrs(cols["owner_addr"])
 
-            chainID2 = int(row[0])
-            nft_addr = row[1].lower()
-            owner_addr = row[2].lower()
-
-            assert chainID2 == chainID, "csv had data from different chain"
-            assert_is_eth_addr(nft_addr)
-            assert_is_eth_addr(owner_addr)
-
-            owners_at_chain[nft_addr] = owner_addr
-
-    print(f"Loaded {csv_file}")
+    owners_at_chain: dict = dict(zip(nft_addrs, owner_addrs))
     return owners_at_chain
 
 
 @enforce_types
 def owners_csv_filenames(csv_dir: str) -> List[str]:
     """Returns a list of owners filenames in this directory"""
-    return glob.glob(os.path.join(csv_dir, "owners*.csv"))
+    return tables.table_filenames(csv_dir, "owners*")
 
 
 @enforce_types
@@ -561,20 +511,11 @@ def save_symbols_csv(symbols_at_chain: Dict[str, str], csv_dir: str, chainID: in
     """
     assert os.path.exists(csv_dir), csv_dir
     csv_file = symbols_csv_filename(csv_dir, chainID)
-    assert not os.path.exists(csv_file), csv_file
-    with open(csv_file, "w") as f:
-        writer = csv.writer(f)
-        writer.writerow(["chainID", "token_addr", "token_symbol"])
-        for token_addr, token_symbol in symbols_at_chain.items():
-            assert_is_eth_addr(token_addr)
-            row = [
-                chainID,
-                token_addr.lower(),
-                token_symbol.upper(),
-            ]
-            writer.writerow(row)
-
-    print(f"Created {csv_file}")
+    rows = []
+    for token_addr, token_symbol in symbols_at_chain.items():
+        assert_is_eth_addr(token_addr)
+        rows.append([chainID, token_addr.lower(), token_symbol.upper()])
+    tables.save_table(csv_file, SYMBOLS_SCHEMA, rows)
 
 
 @enforce_types
@@ -605,31 +546,19 @@ def load_symbols_csv(csv_dir: str, chainID: int) -> Dict[str, str]:
       symbols_at_chain -- dict of [basetoken_addr] : basetoken_symbol
     """
     csv_file = symbols_csv_filename(csv_dir, chainID)
-    symbols_at_chain: dict = {}
-    with open(csv_file, "r") as f:
-        reader = csv.reader(f)
-        for row_i, row in enumerate(reader):
-            if row_i == 0:  # header
-                assert row == ["chainID", "token_addr", "token_symbol"]
-                continue
+    cols = tables.load_table(csv_file, SYMBOLS_SCHEMA)
+    assert (cols["chainID"] == chainID).all(), "csv had data from different chain"
+    token_addrs = lowercase_eth_addrs(cols["token_addr"])
+    token_symbols = np.char.upper(cols["token_symbol"].astype(str)).tolist()
 
-            chainID2 = int(row[0])
-            token_addr = row[1].lower()
-            token_symbol = row[2].upper()
-
-            assert chainID2 == chainID, "csv had data from different chain"
-            assert_is_eth_addr(token_addr)
-
-            symbols_at_chain[token_addr] = token_symbol
-
-    print(f"Loaded {csv_file}")
+    symbols_at_chain: dict = dict(zip(token_addrs, token_symbols))
     return symbols_at_chain
 
 
 @enforce_types
 def symbols_csv_filenames(csv_dir: str) -> List[str]:
     """Returns a list of symbols filenames in this directory"""
-    return glob.glob(os.path.join(csv_dir, "symbols*.csv"))
+    return tables.table_filenames(csv_dir, "symbols*")
 
 
 @enforce_types
@@ -661,12 +590,7 @@ def save_rate_csv(token_symbol: str, rate: float, csv_dir: str):
     """
     token_symbol = token_symbol.upper()
     csv_file = rate_csv_filename(token_symbol, csv_dir)
-    assert not os.path.exists(csv_file), f"{csv_file} can't already exist"
-    with open(csv_file, "w") as f:
-        writer = csv.writer(f)
-        writer.writerow(["token_symbol", "rate"])
-        writer.writerow([token_symbol, str(rate)])
-    print(f"Created {csv_file}")
+    tables.save_table(csv_file, RATE_SCHEMA, [[token_symbol, rate]])
 
 
 @enforce_types
@@ -681,18 +605,11 @@ def load_rate_csvs(csv_dir: str) -> Dict[str, float]:
     csv_files = rate_csv_filenames(csv_dir)
     rates = {}
     for csv_file in csv_files:
-        with open(csv_file, "r") as f:
-            reader = csv.reader(f)
-            for row_i, row in enumerate(reader):
-                if row_i == 0:  # header
-                    assert row == ["token_symbol", "rate"]
-                elif row_i == 1:
-                    token_symbol = row[0].upper()
-                    rate = float(row[1])
-                    rates[token_symbol] = rate
-                else:
-                    raise ValueError("csv should only have two rows")
-        print(f"Loaded {csv_file}")
+        cols = tables.load_table(csv_file, RATE_SCHEMA)
+        if len(cols["rate"]) != 1:
+            raise ValueError("csv should only have two rows")
+        token_symbol = cols["token_symbol"][0].upper()
+        rates[token_symbol] = float(cols["rate"][0])
 
     # have rates for non-standard token names like MOCEAN
     if "OCEAN" in rates:
@@ -704,7 +621,7 @@ def load_rate_csvs(csv_dir: str) -> Dict[str, float]:
 @enforce_types
 def rate_csv_filenames(csv_dir: str) -> List[str]:
     """Returns a list of exchange rate filenames in this directory"""
-    return glob.glob(os.path.join(csv_dir, "rate*.csv"))
+    return tables.table_filenames(csv_dir, "rate*")
 
 
 @enforce_types
@@ -731,46 +648,54 @@ def save_volume_rewards_csv(
       rewards -- dict of [chainID][LP_addr] : value (float, *not* integers / wei)
       ..
     """
-    csv_file = volume_rewards_csv_filename(csv_dir)
-    assert not os.path.exists(csv_file), f"{csv_file} can't already exist"
-    with open(csv_file, "w") as f:
-        writer = csv.writer(f)
+    table: Dict[str, list] = {"chainID": [], "LP_addr": [], "OCEAN_amt": []}
+    for chainID, innerdict in rewards.items():
+        for LP_addr, value in innerdict.items():
+            table["chainID"].append(chainID)
+            table["LP_addr"].append(LP_addr)
+            table["OCEAN_amt"].append(value)
+    save_volume_rewards_table(table, csv_dir)
 
-        header = ["chainID", "LP_addr", "OCEAN_amt"]
-        writer.writerow(header)
 
-        for chainID, innerdict in rewards.items():
-            for LP_addr, value in innerdict.items():
-                assert_is_eth_addr(LP_addr)
-                row = [chainID, LP_addr.lower(), value]
-                writer.writerow(row)
-    print(f"Created {csv_file}")
+@enforce_types
+def save_volume_rewards_table(table: Dict[str, list], csv_dir: str):
+    """
+    @description
+      Like save_volume_rewards_csv(), but from a flat table. Eg from
+      RewardCalculator.calculate(as_table=True).
+
+    @arguments
+      table -- dict of [column_name] : list. Columns: chainID, LP_addr, OCEAN_amt
+      ..
+    """
+    csv_file = volume_rewards_csv_filename(csv_dir)
+    assert list(table) == list(VOLUME_REWARDS_SCHEMA), list(table)
+    for LP_addr in table["LP_addr"]:
+        assert_is_eth_addr(LP_addr)
+    rows = zip(
+        table["chainID"],
+        [LP_addr.lower() for LP_addr in table["LP_addr"]],
+        table["OCEAN_amt"],
+    )
+    tables.save_table(csv_file, VOLUME_REWARDS_SCHEMA, list(rows))
 
 
 @enforce_types
 def load_volume_rewards_csv(csv_dir: str) -> Dict[str, Dict[str, float]]:
     """Loads rewards -- dict of [chainID][LP_addr] : value, from csv"""
     csv_file = volume_rewards_csv_filename(csv_dir)
-    rewards: Dict[Any, Dict[str, float]] = {}
-
-    with open(csv_file, "r") as f:
-        reader = csv.reader(f)
-        for row_i, row in enumerate(reader):
-            if row_i == 0:  # header
-                assert row == ["chainID", "LP_addr", "OCEAN_amt"]
-            else:
-                chainID = int(row[0])
-                LP_addr = Web3.to_checksum_address(row[1].lower())
-                amt = float(row[2])
+    cols = tables.load_table(csv_file, VOLUME_REWARDS_SCHEMA)
+    LP_addrs = _checksum_addrs(lowercase_eth_addrs(cols["LP_addr"]))
 
-                assert_is_eth_addr(LP_addr)
-                if chainID not in rewards:
-                    rewards[chainID] = {}
-                assert LP_addr not in rewards[chainID], "duplicate found"
+    rewards: Dict[Any, Dict[str, float]] = {}
+    for chainID, LP_addr, amt in zip(
+        cols["chainID"].tolist(), LP_addrs, cols["OCEAN_amt"].tolist()
+    ):
+        if chainID not in rewards:
+            rewards[chainID] = {}
+        assert LP_addr not in rewards[chainID], "duplicate found"
 
-                rewards[chainID][LP_addr] = amt
-
-    print(f"Loaded {csv_file}")
+        rewards[chainID][LP_addr] = amt
 
     return rewards
 
@@ -797,28 +722,41 @@ def save_volume_rewardsinfo_csv(
       rewards -- dict of [chainID][nft_addr][LP_addr] : value (float, *not* base 18)
       ..
     """
-    csv_file = volume_rewardsinfo_csv_filename(csv_dir)
-    assert not os.path.exists(csv_file), f"{csv_file} can't already exist"
-    with open(csv_file, "w") as f:
-        writer = csv.writer(f)
+    table: Dict[str, list] = {"chainID": [], "nft_addr": [], "LP_addr": [], "amt": []}
+    for chainID, innerdict in rewards.items():
+        for nft_addr, innerdict2 in innerdict.items():
+            for LP_addr, value in innerdict2.items():
+                table["chainID"].append(chainID)
+                table["nft_addr"].append(nft_addr)
+                table["LP_addr"].append(LP_addr)
+                table["amt"].append(value)
+    save_volume_rewardsinfo_table(table, csv_dir)
 
-        header = ["chainID", "nft_addr", "LP_addr", "amt", "token"]
-        writer.writerow(header)
 
-        for chainID, innerdict in rewards.items():
-            for LP_addr, innerdict2 in innerdict.items():
-                assert_is_eth_addr(LP_addr)
-                for nft_addr, value in innerdict2.items():
-                    assert_is_eth_addr(nft_addr)
-                    row = [
-                        chainID,
-                        LP_addr.lower(),
-                        nft_addr.lower(),
-                        value,
-                        "OCEAN",
-                    ]
-                    writer.writerow(row)
-    print(f"Created {csv_file}")
+@enforce_types
+def save_volume_rewardsinfo_table(table: Dict[str, list], csv_dir: str):
+    """
+    @description
+      Like save_volume_rewardsinfo_csv(), but from a flat table. Eg from
+      RewardCalculator.calculate(as_table=True).
+
+    @arguments
+      table -- dict of [column_name] : list. Columns: chainID, nft_addr,
+        LP_addr, amt. Token is always OCEAN.
+      ..
+    """
+    csv_file = volume_rewardsinfo_csv_filename(csv_dir)
+    assert list(table) == list(REWARDSINFO_SCHEMA)[:-1], list(table)
+    for addr in table["nft_addr"] + table["LP_addr"]:
+        assert_is_eth_addr(addr)
+    rows = zip(
+        table["chainID"],
+        [nft_addr.lower() for nft_addr in table["nft_addr"]],
+        [LP_addr.lower() for LP_addr in table["LP_addr"]],
+        table["amt"],
+        ["OCEAN"] * len(table["amt"]),
+    )
+    tables.save_table(csv_file, REWARDSINFO_SCHEMA, list(rows))
 
 
 @enforce_types
@@ -830,33 +768,30 @@ def volume_rewardsinfo_csv_filename(csv_dir: str) -> str:
 def load_volume_rewardsinfo_csv(csv_dir: str) -> Dict[int, Dict[str, Dict[str, Any]]]:
     """Loads rewards -- dict of [chainID][LP_addr] : value, from csv"""
     csv_file = volume_rewardsinfo_csv_filename(csv_dir)
-    rewardsinfo: Dict[int, Dict[str, Dict[str, Any]]] = {}
+    cols = tables.load_table(csv_file, REWARDSINFO_SCHEMA)
+    nft_addrs = _checksum_addrs(lowercase_eth_addrs(cols["nft_addr"]))
+    LP_addrs = _checksum_addrs(lowercase_eth_addrs(cols["LP_addr"]))
 
-    with open(csv_file, "r") as f:
-        reader = csv.reader(f)
-        for row_i, row in enumerate(reader):
-            if row_i == 0:  # header
-                assert row == ["chainID", "nft_addr", "LP_addr", "amt", "token"]
-            else:
-                chainID = int(row[0])
-                nft_addr = Web3.to_checksum_address(row[1].lower())
-                LP_addr = Web3.to_checksum_address(row[2].lower())
-                amt = float(row[3])
-
-                assert_is_eth_addr(nft_addr)
-                assert_is_eth_addr(LP_addr)
+    rewardsinfo: Dict[int, Dict[str, Dict[str, Any]]] = {}
+    for chainID, nft_addr, LP_addr, amt in zip(
+        cols["chainID"].tolist(), nft_addrs, LP_addrs, cols["amt"].tolist()
+    ):
+        if chainID not in rewardsinfo:
+            rewardsinfo[chainID] = {}
 
-                if chainID not in rewardsinfo:
-                    rewardsinfo[chainID] = {}
+        if nft_addr not in rewardsinfo[chainID]:
+            rewardsinfo[chainID][nft_addr] = {}
 
-                if nft_addr not in rewardsinfo[chainID]:
-                    rewardsinfo[chainID][nft_addr] = {}
+        rewardsinfo[chainID][nft_addr][LP_addr] = amt
 
-                if LP_addr not in rewardsinfo[chainID][nft_addr]:
-                    rewardsinfo[chainID][nft_addr][LP_addr] = {}
+    return rewardsinfo
 
-                rewardsinfo[chainID][nft_addr][LP_addr] = amt
 
-    print(f"Loaded {csv_file}")
+def _checksum_addrs(addrs: List[str]) -> List[str]:
+    # oceanutil imports web3, which is slow. Only the loaders need it, so
+    # import it here, rather than for every user of this module
+    from df_py.util.oceanutil import (  # pylint: disable=import-outside-toplevel
+        checksum_addrs,
+    )
 
-    return rewardsinfo
+    return checksum_addrs(addrs)
@@ -1,12 +1,21 @@
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
 
-from enforce_typing import enforce_types
-
-from df_py.util import oceanutil
+from df_py.util.typecheck import enforce_types
 
 
 @enforce_types
 class SimpleDataNft:
+    # created once per nft on the chain, so keep instances small
+    __slots__ = (
+        "chain_id",
+        "nft_addr",
+        "symbol",
+        "owner_addr",
+        "is_purgatory",
+        "name",
+        "_did",
+    )
+
     def __init__(
         self,
         chain_id: int,
@@ -22,13 +31,34 @@ class SimpleDataNft:
         self.owner_addr = owner_addr.lower()
         self.is_purgatory = is_purgatory
         self.name = name  # can be any mix of upper and lower case
-        self.did = oceanutil.calc_did(nft_addr, chain_id)
+        self._did: Optional[str] = None  # computed on first access
+
+    @property
+    def did(self) -> str:
+        if self._did is None:
+            # oceanutil imports web3, which is slow; only import it if needed
+            from df_py.util import oceanutil  # pylint: disable=import-outside-toplevel
+
+            self._did = oceanutil.calc_did(self.nft_addr, self.chain_id)
+        return self._did
 
     def set_name(self, name: str):
         self.name = name
 
+    def _key(self) -> tuple:
+        return (
+            self.chain_id,
+            self.nft_addr,
+            self.symbol,
+            self.owner_addr,
+            self.is_purgatory,
+            self.name,
+        )
+
     def __eq__(self, x) -> bool:
-        return repr(self) == repr(x)
+        if not isinstance(x, SimpleDataNft):
+            return False
+        return self._key() == x._key()
 
     def __repr__(self) -> str:
         return (
@@ -56,6 +86,11 @@ class TokSet:
         """tups - list of (chainID, address, symbol). Will set to [] if None"""
         tups = tups or []
         self.toks = set()
+
+        # indexes, for O(1) lookup. Each is [chainID][address or symbol] : Tok
+        self._tok_at_address: Dict[int, Dict[str, Tok]] = {}
+        self._tok_at_symbol: Dict[int, Dict[str, Tok]] = {}
+
         for chainID, address, symbol in tups:
             self.add(chainID, address, symbol)
 
@@ -68,13 +103,12 @@ class TokSet:
         assert not self.has_symbol(chainID, symbol), (chainID, symbol)
         tok = Tok(chainID, address, symbol)
         self.toks.add(tok)
+        self._tok_at_address.setdefault(chainID, {})[address] = tok
+        self._tok_at_symbol.setdefault(chainID, {})[symbol] = tok
 
     def has_chain(self, chainID: int) -> bool:
         """Are there any tokens at this chainID?"""
-        for tok in self.toks:
-            if tok.chainID == chainID:
-                return True
-        return False
+        return chainID in self._tok_at_address
 
     def has_address(self, chainID: int, address: str) -> bool:
         """Is there a token at this chainID & address?"""
@@ -102,24 +136,20 @@ class TokSet:
         """Returns Tok if there's a token, otherwise returns None"""
         assert address == address.lower(), address
         assert address[:2] == "0x", address
-        for tok in self.toks:
-            if tok.chainID == chainID and tok.address == address:
-                return tok
-        return None
+        return self._tok_at_address.get(chainID, {}).get(address)
 
     def tok_at_symbol(self, chainID: int, symbol: str) -> Union[Tok, None]:
         """Returns Tok if there's a token, otherwise returns None"""
         assert symbol == symbol.upper(), symbol
-        for tok in self.toks:
-            if tok.chainID == chainID and tok.symbol == symbol:
-                return tok
-        return None
+        return self._tok_at_symbol.get(chainID, {}).get(symbol)
+
+    def toks_at_chain(self, chainID: int) -> List[Tok]:
+        """Returns all Toks at this chainID"""
+        return list(self._tok_at_address.get(chainID, {}).values())
 
     def export_token_addrs(self) -> Dict[int, List[str]]:
         """@return -- dict of [chainID] : list_of_addr"""
-        d: dict = {}
-        for tok in self.toks:
-            if tok.chainID not in d:
-                d[tok.chainID] = []
-            d[tok.chainID].append(tok.address)
-        return d
+        return {
+            chainID: list(toks_at_chain.keys())
+            for chainID, toks_at_chain in self._tok_at_address.items()
+        }
@@ -0,0 +1,82 @@
+"""
+The list of data assets in purgatory.
+
+The list is fetched at most once per process. The fetch is a conditional
+GET (ETag / If-Modified-Since) against an on-disk copy, and that copy is
+used as-is if the list can't be reached.
+"""
+
+import json
+from typing import FrozenSet, Optional
+
+import requests
+
+from df_py.util import disk_cache
+from df_py.util.typecheck import enforce_types
+
+PURGATORY_URL = (
+    "https://raw.githubusercontent.com/oceanprotocol/list-purgatory/main/"
+    "list-assets.json"
+)
+CACHE_FILENAME = "purgatory_assets.json"
+
+_DIDS: Optional[FrozenSet[str]] = None  # in-process copy
+
+
+@enforce_types
+def dids_in_purgatory() -> FrozenSet[str]:
+    """
+    @description
+      Return dids of data assets that are in purgatory
+
+    @return
+      dids -- frozenset of str
+    """
+    global _DIDS
+    if _DIDS is None:
+        _DIDS = _fetch_dids()
+    return _DIDS
+
+
+def reset():
+    """Forget the in-process copy, so that the next call re-validates"""
+    global _DIDS
+    _DIDS = None
+
+
+@enforce_types
+def _fetch_dids() -> FrozenSet[str]:
+    filename = disk_cache.cache_filename(CACHE_FILENAME)
+    cached = disk_cache.load_json(filename, None)
+
+    headers = {}
+    if cached is not None:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        resp = requests.get(PURGATORY_URL, headers=headers, timeout=30)
+        if resp.status_code == 304 and cached is not None:
+            return frozenset(cached["dids"])
+        resp.raise_for_status()
+
+        # list of {'did' : 'did:op:6F7...', 'reason':'..'}
+        data = json.loads(resp.text)
+        dids = [item["did"] for item in data]
+    except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+        if cached is None:
+            raise
+        print(f"Couldn't refresh purgatory list, using on-disk copy. Error: {e}")
+        return frozenset(cached["dids"])
+
+    disk_cache.save_json(
+        filename,
+        {
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "dids": dids,
+        },
+    )
+    return frozenset(dids)
@@ -1,17 +1,14 @@
-import json
-from typing import Dict, List, Tuple
-
-import requests
-from enforce_typing import enforce_types
-from web3.main import Web3
+from typing import Dict, FrozenSet, List, Tuple
 
 from df_py.predictoor.queries import query_predictoor_contracts
 from df_py.util import networkutil, oceanutil
 from df_py.util.base18 import from_wei
 from df_py.util.blockrange import BlockRange
-from df_py.util.constants import AQUARIUS_BASE_URL, MAX_ALLOCATE
+from df_py.util.constants import MAX_ALLOCATE
 from df_py.util.contract_base import ContractBase
 from df_py.util.graphutil import submit_query
+from df_py.util.typecheck import enforce_types
+from df_py.volume import asset_names, purgatory
 from df_py.volume.models import SimpleDataNft, TokSet
 
 MAX_TIME = 4 * 365 * 86400  # max lock time
@@ -84,7 +81,7 @@ def _process_delegation(
     delegation_amt = time_left_unlock * delegated_amt_past / time_left_to_unlock_past
 
     # receiver address
-    delegated_to = str(Web3.to_checksum_address(delegation["receiver"]["id"]))
+    delegated_to = oceanutil.checksum_addr(delegation["receiver"]["id"])
 
     balance = balance - delegation_amt
 
@@ -200,7 +197,7 @@ def queryVebalances(
                 if balance < 0:
                     raise ValueError("balance < 0, something is wrong")
                 # set user balance
-                LP_addr = str(Web3.to_checksum_address(user["id"]))
+                LP_addr = oceanutil.checksum_addr(user["id"])
                 vebals.setdefault(LP_addr, 0)
                 vebals[LP_addr] += balance
 
@@ -281,11 +278,9 @@ def queryAllocations(
                 break
 
             for allocation in _allocs:
-                LP_addr = str(Web3.to_checksum_address(allocation["id"]))
+                LP_addr = oceanutil.checksum_addr(allocation["id"])
                 for ve_allocation in allocation["veAllocation"]:
-                    nft_addr = str(
-                        Web3.to_checksum_address(ve_allocation["nftAddress"])
-                    )
+                    nft_addr = oceanutil.checksum_addr(ve_allocation["nftAddress"])
                     chain_id = int(ve_allocation["chainId"])
                     allocated = float(ve_allocation["allocated"])
 
@@ -681,7 +676,7 @@ def _filterOutPurgatory(nft_dids: List[str]) -> List[str]:
       filtered_dids: list of filtered dids
     """
     bad_dids = _didsInPurgatory()
-    filtered_dids = set(nft_dids) - set(bad_dids)
+    filtered_dids = set(nft_dids) - bad_dids
     return list(filtered_dids)
 
 
@@ -698,8 +693,8 @@ def _filterNftinfos(nftinfos: List[SimpleDataNft]) -> List[SimpleDataNft]:
       filtered_nftinfos: list of filtered SimpleDataNft objects
     """
     nft_dids = [nft.did for nft in nftinfos]
-    nft_dids = _filterToAquariusAssets(nft_dids)
-    filtered_nftinfos = [nft for nft in nftinfos if nft.did in nft_dids]
+    aquarius_dids = set(_filterToAquariusAssets(nft_dids))
+    filtered_nftinfos = [nft for nft in nftinfos if nft.did in aquarius_dids]
     return filtered_nftinfos
 
 
@@ -771,17 +766,16 @@ def _filterNftvols(nftvols: dict, chainID: int) -> dict:
         return filtered_nftvols_predictoor
 
     filtered_nftvols: Dict[str, Dict[str, float]] = {}
-    nft_dids = []
+    nft_addrs = {
+        nft_addr for basetoken_addr in nftvols for nft_addr in nftvols[basetoken_addr]
+    }
+    nft_to_did = oceanutil.calc_dids(chainID, list(nft_addrs))
 
-    for basetoken_addr in nftvols:
-        for nft_addr in nftvols[basetoken_addr]:
-            nft_dids.append(oceanutil.calc_did(nft_addr, chainID))
-
-    filtered_dids = _filterDids(nft_dids)
+    filtered_dids = set(_filterDids(list(nft_to_did.values())))
 
     for basetoken_addr in nftvols:
         for nft_addr in nftvols[basetoken_addr]:
-            did = oceanutil.calc_did(nft_addr, chainID)
+            did = nft_to_did[nft_addr]
             if did in filtered_dids:
                 if basetoken_addr not in filtered_nftvols:
                     filtered_nftvols[basetoken_addr] = {}
@@ -817,22 +811,16 @@ def _filterToAquariusAssets(nft_dids: List[str]) -> List[str]:
 
 
 @enforce_types
-def _didsInPurgatory() -> List[str]:
+def _didsInPurgatory() -> FrozenSet[str]:
     """
     @description
-      Return dids of data assets that are in purgatory
+      Return dids of data assets that are in purgatory.
+      Fetched at most once per run; see purgatory.py.
 
     @return
-      dids -- list of str
+      dids -- frozenset of str
     """
-    url = "https://raw.githubusercontent.com/oceanprotocol/list-purgatory/main/list-assets.json"
-    resp = requests.get(url, timeout=30)
-
-    # list of {'did' : 'did:op:6F7...', 'reason':'..'}
-    data = json.loads(resp.text)
-
-    dids = [item["did"] for item in data]
-    return dids
+    return purgatory.dids_in_purgatory()
 
 
 @enforce_types
@@ -844,7 +832,7 @@ def getSymbols(tokens: TokSet, chainID: int) -> Dict[str, str]:
     @return
       symbols_at_chain -- dict of [basetoken_addr] : basetoken_symbol
     """
-    return {tok.address: tok.symbol for tok in tokens.toks if tok.chainID == chainID}
+    return {tok.address: tok.symbol for tok in tokens.toks_at_chain(chainID)}
 
 
 _ADDR_TO_SYMBOL = networkutil._ADDRS_TO_SYMBOL  # address : TOKEN_symbol
@@ -867,7 +855,8 @@ def queryAquariusAssetNames(
 ) -> Dict[str, str]:
     """
     @description
-      Return mapping of did -> asset name
+      Return mapping of did -> asset name.
+      Only asks Aquarius for dids that the local index doesn't have fresh.
 
     @params
       nft_dids -- array of dids
@@ -879,35 +868,13 @@ def queryAquariusAssetNames(
     # Remove duplicates
     nft_dids = list(set(nft_dids))
 
-    # make a post request to Aquarius
-    url = f"{AQUARIUS_BASE_URL}/api/aquarius/assets/names"
-
-    headers = {"Content-Type": "application/json"}
-
-    did_to_asset_name = {}
-
-    BATCH_SIZE = 9042
-    RETRY_ATTEMPTS = 3
-
-    error_counter = 0
-    # Send in chunks
-    for i in range(0, len(nft_dids), BATCH_SIZE):
-        # Aquarius expects "didList": ["did:op:...", ...]
-        payload = json.dumps({"didList": nft_dids[i : i + BATCH_SIZE]})
-
-        try:
-            resp = requests.post(url, data=payload, headers=headers, timeout=30)
-            data = json.loads(resp.text)
-            did_to_asset_name.update(data)
-        # pylint: disable=broad-exception-caught
-        except Exception as e:
-            error_counter += 1
-            i -= BATCH_SIZE
-            if error_counter > RETRY_ATTEMPTS:
-                # pylint: disable=line-too-long, broad-exception-raised
-                raise Exception(
-                    f"Failed to get asset names from Aquarius after {RETRY_ATTEMPTS} attempts. Error: {e}"
-                ) from e
-        error_counter = 0
+    index = asset_names.AssetNameIndex.load()
+    did_to_asset_name, stale_dids = index.lookup(nft_dids)
+
+    if stale_dids:
+        fetched = asset_names.fetch_asset_names(stale_dids)
+        index.update(fetched)
+        index.save()
+        did_to_asset_name.update(fetched)
 
     return did_to_asset_name
@@ -1,11 +1,11 @@
 from datetime import datetime
-from typing import Dict, List, Tuple, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 import scipy
-from enforce_typing import enforce_types
 
 from df_py.predictoor.queries import query_predictoor_contracts
+from df_py.util import instrument, typecheck
 from df_py.util.constants import (
     DEPLOYER_ADDRS,
     MAX_N_RANK_ASSETS,
@@ -13,6 +13,7 @@ from df_py.util.constants import (
     RANK_SCALE_OP,
     TARGET_WPY,
 )
+from df_py.util.typecheck import enforce_types
 from df_py.volume import cleancase as cc
 from df_py.volume import to_usd
 
@@ -21,6 +22,10 @@ def freeze_attributes(func):
     # makes sure the state is not changed during the function call
     # use as deorator to preserve state.
     # only the constructor and the calculate method should be allowed to change state
+    # like enforce_types, it's a pass-through when type checks are switched off
+    if not typecheck.ENFORCE_TYPES:
+        return func
+
     def wrapper(self, *args, **kwargs):
         self._freeze_attributes = True
         return_value = func(self, *args, **kwargs)
@@ -47,6 +52,8 @@ class RewardCalculator:
         OCEAN_avail: float,
         do_pubrewards: bool,
         do_rank: bool,
+        reuse_clean_inputs: bool = False,
+        predictoor_feed_addrs: Optional[Dict[int, Set[str]]] = None,
     ):
         """
         @arguments
@@ -59,14 +66,19 @@ class RewardCalculator:
           OCEAN_avail -- amount of rewards avail, in units of OCEAN
           do_pubrewards -- 2x effective stake to publishers?
           do_rank -- allocate OCEAN to assets by DCV rank, vs pro-rata
+          reuse_clean_inputs -- use inputs that are already clean (see
+            cleancase) as-is, rather than copying them
+          predictoor_feed_addrs -- dict of [chainID] : set of nft_addr.
+            If None, query them. Pass them in to run offline, or to reuse
+            them across calculators
         """
         self._freeze_attributes = False
 
-        self.stakes = cc.mod_stakes(stakes)
-        self.nftvols = cc.mod_nft_vols(nftvols)
-        self.owners = cc.mod_owners(owners)
-        self.symbols = cc.mod_symbols(symbols)
-        self.rates = cc.mod_rates(rates)
+        self.stakes = cc.mod_stakes(stakes, reuse_clean_inputs)
+        self.nftvols = cc.mod_nft_vols(nftvols, reuse_clean_inputs)
+        self.owners = cc.mod_owners(owners, reuse_clean_inputs)
+        self.symbols = cc.mod_symbols(symbols, reuse_clean_inputs)
+        self.rates = cc.mod_rates(rates, reuse_clean_inputs)
 
         self.nftvols_USD = to_usd.nft_vols_to_usd(
             self.nftvols, self.symbols, self.rates
@@ -80,7 +92,13 @@ class RewardCalculator:
         self.do_pubrewards = do_pubrewards
         self.do_rank = do_rank
 
-        self.predictoor_feed_addrs = self._get_predictoor_feed_addrs()
+        if predictoor_feed_addrs is None:
+            predictoor_feed_addrs = self._get_predictoor_feed_addrs()
+        self.predictoor_feed_addrs: Dict[int, Set[str]] = {
+            chainID: set() for chainID in self.stakes
+        }
+        for chainID, feed_addrs in predictoor_feed_addrs.items():
+            self.predictoor_feed_addrs[chainID] = set(feed_addrs)
 
         # will be filled in by calculate()
         self.S: np.ndarray
@@ -91,19 +109,29 @@ class RewardCalculator:
         self._freeze_attributes = True
 
     @enforce_types
-    def calculate(self):
+    def calculate(self, as_table: bool = False):
         """
+        @arguments
+          as_table -- return flat tables (see _reward_array_to_tables)
+            rather than nested dicts?
+
         @notes
           In the return dicts, chainID is the chain of the nft, not the
           chain where rewards go.
         """
         self._freeze_attributes = False
 
-        self.S, self.V_USD, self.M, self.C = self._stake_vol_owner_dicts_to_arrays()
-        self.R = self._calc_rewards_usd()
+        with instrument.timer("reward_calc"):
+            self.S, self.V_USD, self.M, self.C = self._stake_vol_owner_dicts_to_arrays()
+            self.R = self._calc_rewards_usd()
+        instrument.set_gauge("reward_calc_lps", self.S.shape[0])
+        instrument.set_gauge("reward_calc_nfts", self.S.shape[1])
 
         self._freeze_attributes = True
 
+        if as_table:
+            return self._reward_array_to_tables()
+
         (rewardsperlp, rewardsinfo) = self._reward_array_to_dicts()
 
         return rewardsperlp, rewardsinfo
@@ -120,6 +148,7 @@ class RewardCalculator:
         """
         N_j = len(self.chain_nft_tups)
         N_i = len(self.LP_addrs)
+        LP_index = {LP_addr: i for i, LP_addr in enumerate(self.LP_addrs)}
 
         M = np.zeros(N_j, dtype=float)
         S = np.zeros((N_i, N_j), dtype=float)
@@ -127,9 +156,9 @@ class RewardCalculator:
         C = np.zeros(N_j, dtype=int)
 
         for j, (chainID, nft_addr) in enumerate(self.chain_nft_tups):
-            for i, LP_addr in enumerate(self.LP_addrs):
-                assert nft_addr in self.stakes[chainID], "each tup should be in stakes"
-                S[i, j] = self.stakes[chainID][nft_addr].get(LP_addr, 0.0)
+            assert nft_addr in self.stakes[chainID], "each tup should be in stakes"
+            for LP_addr, stake in self.stakes[chainID][nft_addr].items():
+                S[LP_index[LP_addr], j] = stake
             V_USD[j] += self.nftvols_USD[chainID].get(nft_addr, 0.0)
 
             M[j] = calc_dcv_multiplier(
@@ -137,11 +166,7 @@ class RewardCalculator:
             )
 
             owner_addr = self.owners[chainID][nft_addr]
-            C[j] = (
-                -1
-                if owner_addr not in self.LP_addrs
-                else self.LP_addrs.index(owner_addr)
-            )
+            C[j] = LP_index.get(owner_addr, -1)  # -1 = owner didn't stake
 
         return S, V_USD, M, C
 
@@ -286,26 +311,65 @@ class RewardCalculator:
           In the return dicts, chainID is the chain of the nft, not the
           chain where rewards go.
         """
+        perlp_table, info_table = self._reward_array_to_tables()
+
         rewardsperlp: dict = {}
+        for chainID, LP_addr, amt in zip(*perlp_table.values()):
+            if chainID not in rewardsperlp:
+                rewardsperlp[chainID] = {}
+            rewardsperlp[chainID][LP_addr] = amt
+
         rewardsinfo: dict = {}
+        for chainID, nft_addr, LP_addr, amt in zip(*info_table.values()):
+            if chainID not in rewardsinfo:
+                rewardsinfo[chainID] = {}
+            if nft_addr not in rewardsinfo[chainID]:
+                rewardsinfo[chainID][nft_addr] = {}
+            rewardsinfo[chainID][nft_addr][LP_addr] = amt
+
+        return rewardsperlp, rewardsinfo
 
-        for i, LP_addr in enumerate(self.LP_addrs):
-            for j, (chainID, nft_addr) in enumerate(self.chain_nft_tups):
-                assert self.R[i, j] >= 0.0, self.R[i, j]
-                if self.R[i, j] == 0.0:
-                    continue
+    @freeze_attributes
+    @enforce_types
+    def _reward_array_to_tables(self) -> Tuple[Dict[str, list], Dict[str, list]]:
+        """
+        @return
+          rewardsperlp -- table of chainID, LP_addr, OCEAN_amt
+          rewardsinfo -- table of chainID, nft_addr, LP_addr, amt
 
-                if chainID not in rewardsperlp:
-                    rewardsperlp[chainID] = {}
-                if LP_addr not in rewardsperlp[chainID]:
-                    rewardsperlp[chainID][LP_addr] = 0.0
-                rewardsperlp[chainID][LP_addr] += self.R[i, j]
+        @notes
+          A table is a dict of [column_name] : list, with one row per
+          nonzero reward. Rows are in the same order as the nested dicts of
+          _reward_array_to_dicts(), so both give the same csvs.
+        """
+        assert (self.R >= 0.0).all(), self.R
+        I, J = np.nonzero(self.R)  # by LP, then by chain_nft
+        amts = self.R[I, J]
+        chainIDs = np.array([tup[0] for tup in self.chain_nft_tups], dtype=int)[J]
+
+        # like the nested dicts: chains, then nfts, in order of first reward
+        chain_pos = _first_pos(chainIDs)
+        nft_pos = _first_pos(J)
+
+        rows = np.lexsort((I, nft_pos, chain_pos))
+        rewardsinfo = {
+            "chainID": chainIDs[rows].tolist(),
+            "nft_addr": [self.chain_nft_tups[j][1] for j in J[rows].tolist()],
+            "LP_addr": [self.LP_addrs[i] for i in I[rows].tolist()],
+            "amt": amts[rows].tolist(),
+        }
 
-                if chainID not in rewardsinfo:
-                    rewardsinfo[chainID] = {}
-                if nft_addr not in rewardsinfo[chainID]:
-                    rewardsinfo[chainID][nft_addr] = {}
-                rewardsinfo[chainID][nft_addr][LP_addr] = self.R[i, j]
+        # sum over nfts, per (chain, LP). bincount adds in nft order
+        groups, firsts, group_of_row = np.unique(
+            chain_pos * len(self.LP_addrs) + I, return_index=True, return_inverse=True
+        )
+        sums = np.bincount(group_of_row, weights=amts, minlength=len(groups))
+        rows = np.lexsort((I[firsts], chain_pos[firsts]))
+        rewardsperlp = {
+            "chainID": chainIDs[firsts][rows].tolist(),
+            "LP_addr": [self.LP_addrs[i] for i in I[firsts][rows].tolist()],
+            "OCEAN_amt": sums[rows].tolist(),
+        }
 
         return rewardsperlp, rewardsinfo
 
@@ -357,26 +421,19 @@ class RewardCalculator:
 
     @freeze_attributes
     @enforce_types
-    def _get_predictoor_feed_addrs(self) -> Dict[int, List[str]]:
+    def _get_predictoor_feed_addrs(self) -> Dict[int, Set[str]]:
         """
         @return
-          predictoor_feed_addrs -- dict of (chainID, list of nft_addrs)
+          predictoor_feed_addrs -- dict of [chainID] : set of nft_addr
 
         @notes
           This will only return the prediction feeds that are owned by DEPLOYER_ADDRS, due to functionality of query_predictoor_contracts().
         """
-        chainIDs = list(self.stakes.keys())
-        predictoor_feed_addrs: Dict[int, List[str]] = {
-            chain_id: [] for chain_id in chainIDs
+        return {
+            chain_id: set(query_predictoor_contracts(chain_id))
+            for chain_id in DEPLOYER_ADDRS
         }
 
-        for chain_id in DEPLOYER_ADDRS.keys():
-            predictoor_feed_addrs[chain_id] = query_predictoor_contracts(
-                chain_id
-            ).keys()
-
-        return predictoor_feed_addrs
-
 
 class RewardShaper:
     @staticmethod
@@ -407,6 +464,12 @@ class RewardShaper:
         return merged_dict
 
 
+def _first_pos(x: np.ndarray) -> np.ndarray:
+    """For each entry of x, the index where its value first appears in x"""
+    _, firsts, inverse = np.unique(x, return_index=True, return_inverse=True)
+    return firsts[inverse]
+
+
 @enforce_types
 def get_df_week_number(dt: datetime) -> int:
     """Return the DF week number. This is used by boundRewardsByDcv().
@@ -1,5 +1,6 @@
 from unittest.mock import patch
 
+import pytest
 from enforce_typing import enforce_types
 
 from df_py.volume import csvs
@@ -63,3 +64,14 @@ def test_load_stakes(tmp_path):
         mock.side_effect = lambda value: value
         loaded_stakes = load_stakes(csv_dir)
     assert loaded_stakes == target_stakes
+
+
+@enforce_types
+def test_mixed_case_and_overallocation():
+    perc_allocs = {C1: {"0xNFTA_addr": {"0xST1_addr": 0.5}, NB: {ST1: 0.5}}}
+    vebals = {"0xST1_Addr": 10.0}
+    stakes = allocs_to_stakes(perc_allocs, vebals)
+    assert stakes == {C1: {NA: {ST1: 5.0}, NB: {ST1: 5.0}}}
+
+    with pytest.raises(AssertionError):
+        allocs_to_stakes({C1: {NA: {ST1: 0.5}, NB: {ST1: 0.51}}}, vebals)
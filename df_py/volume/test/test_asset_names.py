@@ -0,0 +1,135 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from enforce_typing import enforce_types
+
+from df_py.volume import asset_names, queries
+from df_py.volume.asset_names import AssetNameIndex
+
+
+class _Resp:
+    def __init__(self, text: str):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+def _fake_post(names: dict, calls: list, n_failures: int = 0):
+    """Returns a fake requests.post that fails n_failures times, then works"""
+
+    def post(url, data, headers, timeout):  # pylint: disable=unused-argument
+        dids = json.loads(data)["didList"]
+        calls.append(dids)
+        if len(calls) <= n_failures:
+            raise ConnectionError("aquarius down")
+        return _Resp(json.dumps({did: names.get(did, "") for did in dids}))
+
+    return post
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("DFPY_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@enforce_types
+def test_index_lookup_and_ttl(tmp_path):
+    index = AssetNameIndex(str(tmp_path / "names.json"), ttl=100.0)
+    index.update({"did:op:1": "name1", "did:op:2": ""}, now=1000.0)
+
+    found, stale = index.lookup(["did:op:1", "did:op:2", "did:op:3"], now=1050.0)
+    assert found == {"did:op:1": "name1", "did:op:2": ""}
+    assert stale == ["did:op:3"]
+
+    found, stale = index.lookup(["did:op:1"], now=1101.0)
+    assert found == {}
+    assert stale == ["did:op:1"]
+
+    # persisted
+    index.save()
+    index2 = AssetNameIndex(str(tmp_path / "names.json"), ttl=100.0)
+    found, stale = index2.lookup(["did:op:1"], now=1050.0)
+    assert found == {"did:op:1": "name1"}
+    assert not stale
+
+
+@enforce_types
+def test_index_save_merges(tmp_path):
+    filename = str(tmp_path / "names.json")
+    index1 = AssetNameIndex(filename, ttl=100.0)
+    index2 = AssetNameIndex(filename, ttl=100.0)
+    index1.update({"did:op:1": "name1", "did:op:2": "old2"}, now=1000.0)
+    index2.update({"did:op:2": "new2", "did:op:3": "name3"}, now=1010.0)
+    index2.save()
+    index1.save()  # mustn't drop index2's dids, or its newer fetch
+
+    found, stale = AssetNameIndex(filename, ttl=100.0).lookup(
+        ["did:op:1", "did:op:2", "did:op:3"], now=1050.0
+    )
+    assert found == {"did:op:1": "name1", "did:op:2": "new2", "did:op:3": "name3"}
+    assert not stale
+
+
+@enforce_types
+def test_fetch_retries_failed_batch():
+    calls: list = []
+    post = _fake_post({"did:op:1": "name1"}, calls, n_failures=2)
+    with patch("df_py.volume.asset_names.requests.post", side_effect=post):
+        names = asset_names.fetch_asset_names(["did:op:1"], retry_delay_s=0.0)
+
+    assert names == {"did:op:1": "name1"}
+    assert calls == [["did:op:1"]] * 3  # the same batch, retried
+
+
+@enforce_types
+def test_fetch_gives_up():
+    calls: list = []
+    post = _fake_post({}, calls, n_failures=100)
+    with patch("df_py.volume.asset_names.requests.post", side_effect=post):
+        with pytest.raises(Exception, match="Failed to get asset names"):
+            asset_names.fetch_asset_names(["did:op:1"], retry_delay_s=0.0)
+    assert len(calls) == asset_names.RETRY_ATTEMPTS + 1
+
+
+@enforce_types
+def test_fetch_many_batches(monkeypatch):
+    monkeypatch.setattr(asset_names, "BATCH_SIZE", 2)
+    dids = [f"did:op:{i}" for i in range(7)]
+    calls: list = []
+    post = _fake_post({did: did.upper() for did in dids}, calls)
+    with patch("df_py.volume.asset_names.requests.post", side_effect=post):
+        names = asset_names.fetch_asset_names(dids)
+
+    assert names == {did: did.upper() for did in dids}
+    assert sorted(len(batch) for batch in calls) == [1, 2, 2, 2]
+
+
+@enforce_types
+def test_queryAquariusAssetNames_only_fetches_new_dids():
+    calls: list = []
+    post = _fake_post({"did:op:1": "name1", "did:op:2": "name2"}, calls)
+    with patch("df_py.volume.asset_names.requests.post", side_effect=post):
+        names = queries.queryAquariusAssetNames(["did:op:1", "did:op:1"])
+        assert names == {"did:op:1": "name1"}
+        assert calls == [["did:op:1"]]
+
+        names = queries.queryAquariusAssetNames(["did:op:1", "did:op:2"])
+        assert names == {"did:op:1": "name1", "did:op:2": "name2"}
+        assert calls == [["did:op:1"], ["did:op:2"]]
+
+        names = queries.queryAquariusAssetNames(["did:op:1", "did:op:2"])
+        assert len(calls) == 2  # all fresh in the index
+
+
+@enforce_types
+def test_queryAquariusAssetNames_ttl_zero_refetches(monkeypatch):
+    monkeypatch.setenv("AQUARIUS_NAMES_TTL", "0")
+    calls: list = []
+    post = _fake_post({"did:op:1": "name1"}, calls)
+    with patch("df_py.volume.asset_names.requests.post", side_effect=post):
+        queries.queryAquariusAssetNames(["did:op:1"])
+        queries.queryAquariusAssetNames(["did:op:1"])
+    assert len(calls) == 2
@@ -39,7 +39,9 @@ DF_WEEK = 7
 
 class MockRewardCalculator(RewardCalculator):
     def __init__(self):
-        return super().__init__({}, {}, {}, {}, {}, DF_WEEK, False, False, False)
+        return super().__init__(
+            {}, {}, {}, {}, {}, DF_WEEK, False, False, False, predictoor_feed_addrs={}
+        )
 
     def set_mock_attribute(self, attr_name, attr_value):
         self._freeze_attributes = False
@@ -62,6 +64,32 @@ def test_freeze_attributes():
     rc.new_attr = 1
 
 
+@patch(
+    "df_py.volume.reward_calculator.query_predictoor_contracts",
+    MagicMock(side_effect=AssertionError("shouldn't query")),
+)
+@enforce_types
+def test_predictoor_feed_addrs_injected():
+    stakes = {C1: {NA: {LP1: 1.0}}, C2: {NB: {LP1: 1.0}}}
+    nftvols = {C1: {OCN_ADDR: {NA: 1.0}}, C2: {OCN_ADDR2: {NB: 1.0}}}
+    owners = {C1: {NA: LP1}, C2: {NB: LP1}}
+    feed_addrs = {C2: {NB}, C3: {NC}}
+
+    rc = RewardCalculator(
+        stakes,
+        nftvols,
+        owners,
+        SYMBOLS,
+        RATES,
+        DF_WEEK,
+        10.0,
+        False,
+        False,
+        predictoor_feed_addrs=feed_addrs,
+    )
+    assert rc.predictoor_feed_addrs == {C1: set(), C2: {NB}, C3: {NC}}
+
+
 @patch(
     "df_py.volume.reward_calculator.query_predictoor_contracts",
     MagicMock(return_value={}),
@@ -1229,6 +1257,40 @@ def test_volume_reward_calculator_predictoor_mul(tmp_path):
         )  # predictoor multiplier
 
 
+@patch(
+    "df_py.volume.reward_calculator.query_predictoor_contracts",
+    MagicMock(return_value={}),
+)
+@enforce_types
+def test_reward_array_to_tables():
+    mock_calculator = MockRewardCalculator()
+    mock_calculator.set_mock_attribute("LP_addrs", [LP1, LP2])
+    mock_calculator.set_mock_attribute("chain_nft_tups", [(C2, NA), (C1, NB), (C2, NC)])
+    R = np.array([[0.0, 1.0, 2.0], [3.0, 0.0, 4.0]], dtype=float)
+    mock_calculator.set_mock_attribute("R", R)
+
+    rewardsperlp, rewardsinfo = mock_calculator._reward_array_to_tables()
+    assert rewardsperlp == {
+        "chainID": [C1, C2, C2],
+        "LP_addr": [LP1, LP1, LP2],
+        "OCEAN_amt": [1.0, 2.0, 7.0],
+    }
+    assert rewardsinfo == {
+        "chainID": [C1, C2, C2, C2],
+        "nft_addr": [NB, NC, NC, NA],
+        "LP_addr": [LP1, LP1, LP2, LP2],
+        "amt": [1.0, 2.0, 4.0, 3.0],
+    }
+
+    # same content, and same order, as the nested dicts
+    rewardsperlp, rewardsinfo = mock_calculator._reward_array_to_dicts()
+    assert list(rewardsperlp.items()) == [(C1, {LP1: 1.0}), (C2, {LP1: 2.0, LP2: 7.0})]
+    assert list(rewardsinfo[C2].items()) == [
+        (NC, {LP1: 2.0, LP2: 4.0}),
+        (NA, {LP2: 3.0}),
+    ]
+
+
 # ========================================================================
 # Helpers to keep function calls compact, and return vals compact.
 
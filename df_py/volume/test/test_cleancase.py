@@ -169,3 +169,43 @@ def test_owners():
     mod_owners = cleancase.mod_owners(owners)
     cleancase.assert_owners(mod_owners)
     assert mod_owners == target_owners
+
+
+@enforce_types
+def test_reuse_if_clean():
+    clean_stakes = {1: {"0xpoola": {"0xlp1": 10.0}}}
+    assert cleancase.mod_stakes(clean_stakes, reuse_if_clean=True) is clean_stakes
+    assert cleancase.mod_stakes(clean_stakes) is not clean_stakes
+
+    # not clean -> still gets a clean copy
+    stakes = {1: {"0xPOOLA": {"0xLP1": 10.0}}}
+    mod_stakes = cleancase.mod_stakes(stakes, reuse_if_clean=True)
+    assert mod_stakes is not stakes
+    assert mod_stakes == clean_stakes
+
+    # LP keys and chainIDs are checked too
+    stakes = {1: {"0xpoola": {"0xLP1": 10.0}}}
+    assert cleancase.mod_stakes(stakes, reuse_if_clean=True) == clean_stakes
+    allocs = {1: {"0xpoola": {"0xLP1": 1.0}}}
+    mod_allocs = cleancase.mod_allocations(allocs, reuse_if_clean=True)
+    assert mod_allocs == {1: {"0xpoola": {"0xlp1": 1.0}}}
+    nftvols = {"1": {"0xocean": {"0xnfta": 1.0}}}
+    assert cleancase.mod_nft_vols(nftvols, reuse_if_clean=True) is not nftvols
+
+    clean_rates = {"OCEAN": 0.25}
+    assert cleancase.mod_rates(clean_rates, reuse_if_clean=True) is clean_rates
+    assert cleancase.mod_rates({"ocean": 0.25}, reuse_if_clean=True) == clean_rates
+
+
+@enforce_types
+def test_mod_checks_rules():
+    with pytest.raises(AssertionError):
+        cleancase.mod_vebals({"lp1": 10.1})
+    with pytest.raises(AssertionError):
+        cleancase.mod_owners({1: {"0xnft1": "lp1"}})
+    with pytest.raises(AssertionError):
+        cleancase.mod_stakes({1: {"0xpoola": {"0xlp1": 10}}})  # int, not float
+    with pytest.raises(AssertionError):
+        cleancase.mod_allocations(
+            {1: {"0xpoola": {"0xLP1": 0.5}, "0xpoolb": {"0xlp1": 0.51}}}
+        )
@@ -1,5 +1,7 @@
+import os
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 from enforce_typing import enforce_types
 
@@ -362,6 +364,45 @@ def test_rewards_info(tmp_path):  # pylint: disable=unused-argument
     assert loaded_rewards == rewards
 
 
+@enforce_types
+def test_rewards_tables(tmp_path):
+    rewardsperlp = {1: {LP1: 1.1, LP2: 2.2}, 137: {LP1: 137.1}}
+    rewardsinfo = {1: {PA: {LP1: 1.1}, PB: {LP2: 2.2}}, 137: {PA: {LP1: 137.1}}}
+    dir1, dir2 = str(tmp_path / "nested"), str(tmp_path / "table")
+    os.mkdir(dir1)
+    os.mkdir(dir2)
+
+    csvs.save_volume_rewards_csv(rewardsperlp, dir1)
+    csvs.save_volume_rewardsinfo_csv(rewardsinfo, dir1)
+
+    csvs.save_volume_rewards_table(
+        {
+            "chainID": [1, 1, 137],
+            "LP_addr": [LP1, LP2, LP1],
+            "OCEAN_amt": [1.1, 2.2, 137.1],
+        },
+        dir2,
+    )
+    csvs.save_volume_rewardsinfo_table(
+        {
+            "chainID": [1, 1, 137],
+            "nft_addr": [PA, PB, PA],
+            "LP_addr": [LP1, LP2, LP1],
+            "amt": [1.1, 2.2, 137.1],
+        },
+        dir2,
+    )
+
+    for filename_func in [
+        csvs.volume_rewards_csv_filename,
+        csvs.volume_rewardsinfo_csv_filename,
+    ]:
+        with open(filename_func(dir1), "rb") as f1, open(
+            filename_func(dir2), "rb"
+        ) as f2:
+            assert f1.read() == f2.read()
+
+
 # =================================================================
 # helper funcs
 @enforce_types
@@ -372,4 +413,13 @@ def test_assert_is_eth_addr():
         csvs.assert_is_eth_addr("FOO")
 
 
+@enforce_types
+def test_lowercase_eth_addrs():
+    addrs = np.array(["0xFOO", "0X12aB"], dtype=object)
+    assert csvs.lowercase_eth_addrs(addrs) == ["0xfoo", "0x12ab"]
+    assert csvs.lowercase_eth_addrs(np.array([], dtype=object)) == []
+    with pytest.raises(AssertionError):
+        csvs.lowercase_eth_addrs(np.array(["0xfoo", "FOO"], dtype=object))
+
+
 # =================================================================
@@ -0,0 +1,86 @@
+import json
+from unittest.mock import patch
+
+import pytest
+import requests
+from enforce_typing import enforce_types
+
+from df_py.volume import purgatory, queries
+
+
+class _Resp:
+    def __init__(self, status_code: int, data=None, headers=None):
+        self.status_code = status_code
+        self.text = json.dumps(data)
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"status {self.status_code}")
+
+
+LIST1 = [{"did": "did:op:1", "reason": "bad"}, {"did": "did:op:2", "reason": "bad"}]
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(tmp_path, monkeypatch):
+    monkeypatch.setenv("DFPY_CACHE_DIR", str(tmp_path))
+    purgatory.reset()
+    yield
+    purgatory.reset()
+
+
+@enforce_types
+def test_fetches_once_per_run():
+    resp = _Resp(200, LIST1, {"ETag": '"abc"'})
+    with patch("df_py.volume.purgatory.requests.get", return_value=resp) as mock:
+        assert purgatory.dids_in_purgatory() == {"did:op:1", "did:op:2"}
+        assert queries._filterOutPurgatory(["did:op:1", "did:op:3"]) == ["did:op:3"]
+        assert purgatory.dids_in_purgatory() == {"did:op:1", "did:op:2"}
+    assert mock.call_count == 1
+    assert mock.call_args.kwargs["headers"] == {}
+
+
+@enforce_types
+def test_revalidates_with_etag():
+    resp = _Resp(200, LIST1, {"ETag": '"abc"', "Last-Modified": "yesterday"})
+    with patch("df_py.volume.purgatory.requests.get", return_value=resp):
+        purgatory.dids_in_purgatory()
+
+    # next run: conditional GET, answered with "not modified"
+    purgatory.reset()
+    with patch("df_py.volume.purgatory.requests.get", return_value=_Resp(304)) as mock:
+        assert purgatory.dids_in_purgatory() == {"did:op:1", "did:op:2"}
+    assert mock.call_args.kwargs["headers"] == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "yesterday",
+    }
+
+    # next run: list changed
+    purgatory.reset()
+    resp = _Resp(200, [{"did": "did:op:9", "reason": "bad"}], {"ETag": '"def"'})
+    with patch("df_py.volume.purgatory.requests.get", return_value=resp):
+        assert purgatory.dids_in_purgatory() == {"did:op:9"}
+
+
+@enforce_types
+def test_offline_uses_disk_copy():
+    with patch("df_py.volume.purgatory.requests.get", return_value=_Resp(200, LIST1)):
+        purgatory.dids_in_purgatory()
+
+    purgatory.reset()
+    with patch(
+        "df_py.volume.purgatory.requests.get",
+        side_effect=requests.ConnectionError("offline"),
+    ):
+        assert purgatory.dids_in_purgatory() == {"did:op:1", "did:op:2"}
+
+
+@enforce_types
+def test_offline_without_disk_copy_raises():
+    with patch(
+        "df_py.volume.purgatory.requests.get",
+        side_effect=requests.ConnectionError("offline"),
+    ):
+        with pytest.raises(requests.ConnectionError):
+            purgatory.dids_in_purgatory()
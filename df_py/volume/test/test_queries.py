@@ -929,11 +929,14 @@ def test_SimpleDataNFT():
     assert nft.owner_addr == "0x123abc"
     assert nft.name == ""
     assert not nft.is_purgatory
+    assert nft._did is None  # did is computed lazily
     assert isinstance(nft.did, str)
+    assert nft.did == oceanutil.calc_did(nft_addr, 137)
 
     # test __eq__
     nft2 = SimpleDataNft(137, nft_addr, "Dn1", "0x123abC")
     assert nft == nft2
+    assert nft != repr(nft)
 
     nft3 = SimpleDataNft(137, nft_addr, "DN2", "0x123abc")
     assert nft != nft3
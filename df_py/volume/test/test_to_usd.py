@@ -117,3 +117,19 @@ def test_native_token_rates():
 
     nftvols_USD = nft_vols_to_usd(nftvols, symbols, rates)
     assert nftvols_USD == {1: {LP1: 100.0, LP2: 200.0}}
+
+
+@enforce_types
+def test_nft_vols_to_usd_leaves_inputs():
+    poolvols = {C1: {OCN_ADDR: {PA: 9.0}, UNAPP_ADDR: {PB: 1.0}}, C2: {}}
+    symbols = {C1: {OCN_ADDR: OCN_SYMB}}
+    poolvols_USD = nft_vols_to_usd(poolvols, symbols, RATES)
+    assert poolvols_USD == {C1: {PA: 9.0 * 0.5}, C2: {}}  # C2 has a native token
+    assert symbols == {C1: {OCN_ADDR: OCN_SYMB}}
+    assert poolvols == {C1: {OCN_ADDR: {PA: 9.0}, UNAPP_ADDR: {PB: 1.0}}, C2: {}}
+
+
+@enforce_types
+def test_nft_vols_to_usd_empty():
+    assert nft_vols_to_usd({}, SYMBOLS, RATES) == {}
+    assert nft_vols_to_usd({C1: {}}, SYMBOLS, RATES) == {C1: {}}
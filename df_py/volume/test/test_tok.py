@@ -103,3 +103,27 @@ def test_TokSet_main():
     assert sorted(addrs.keys()) == [1, 2]
     assert sorted(addrs[1]) == ["0x123", "0x456"]
     assert sorted(addrs[2]) == ["0x78b"]
+
+
+@enforce_types
+def test_TokSet_toks_at_chain():
+    tok_set = TokSet([(1, "0x123", "OCEAN"), (1, "0x456", "H2O")])
+    tok_set.add(2, "0x78b", "OCEAN")
+
+    assert sorted(tok.address for tok in tok_set.toks_at_chain(1)) == [
+        "0x123",
+        "0x456",
+    ]
+    assert [tok.address for tok in tok_set.toks_at_chain(2)] == ["0x78b"]
+    assert tok_set.toks_at_chain(9) == []
+
+
+@enforce_types
+def test_TokSet_uniqueness():
+    tok_set = TokSet([(1, "0x123", "OCEAN")])
+    with pytest.raises(AssertionError):
+        tok_set.add(1, "0x123", "H2O")  # duplicate address on chain
+    with pytest.raises(AssertionError):
+        tok_set.add(1, "0x456", "OCEAN")  # duplicate symbol on chain
+    tok_set.add(2, "0x123", "OCEAN")  # ok on another chain
+    assert len(tok_set.toks) == 2
@@ -1,8 +1,9 @@
-from typing import Dict
+from typing import Dict, List, Tuple
 
-from enforce_typing import enforce_types
+import numpy as np
 
 from df_py.util.networkutil import _CHAINID_TO_ADDRS, _CHAINID_TO_NATIVE_TOKEN
+from df_py.util.typecheck import enforce_types
 from df_py.volume import cleancase
 
 
@@ -36,10 +37,10 @@ def nft_vols_to_usd(
     nftvols: Dict[int, Dict[str, Dict[str, float]]],
     symbols: Dict[int, Dict[str, str]],
     rates: Dict[str, float],
-) -> Dict[int, Dict[str, str]]:
+) -> Dict[int, Dict[str, float]]:
     """
     @description
-      For a given chain, converts volume values to be USD-denominated.
+      Converts volume values to be USD-denominated. Leaves inputs as-is.
 
     @arguments
       nftvols -- dict of [chainID][basetoken_address][nft_addr] : vol
@@ -52,35 +53,63 @@ def nft_vols_to_usd(
     cleancase.assert_nft_vols(nftvols)
     cleancase.assert_rates(rates)
 
-    # Add native token rates
-    for chain_id in _CHAINID_TO_ADDRS:
-        token_addr = _CHAINID_TO_ADDRS[chain_id]
-        token_symbol = _CHAINID_TO_NATIVE_TOKEN[chain_id]
-
-        if chain_id not in symbols:
-            symbols[chain_id] = {}
-
-        symbols[chain_id][token_addr] = token_symbol
-
     addr_rates = rates_to_addr_rates(
-        rates, symbols
+        rates, with_native_tokens(symbols)
     )  # dict of [chain_id][basetoken_addr] : USD_price
 
-    nftvols_USD: dict = {}
-    for chain_id in nftvols:
-        if chain_id not in addr_rates:
-            continue
-
-        nftvols_USD[chain_id] = {}
-        for basetoken_addr in nftvols[chain_id]:
-            if basetoken_addr not in addr_rates[chain_id]:
-                continue
-            rate = addr_rates[chain_id][basetoken_addr]
-
-            if basetoken_addr not in nftvols[chain_id]:
-                continue
-            for nft_addr, vol in nftvols[chain_id][basetoken_addr].items():
-                if nft_addr not in nftvols_USD[chain_id]:
-                    nftvols_USD[chain_id][nft_addr] = 0
-                nftvols_USD[chain_id][nft_addr] += vol * rate
+    # COO table of volumes: one entry per (chain, basetoken, nft)
+    pairs: List[Tuple[int, str]] = []  # (chain_id, basetoken_addr), in nftvols order
+    n_per_pair: List[int] = []
+    nft_keys: List[Tuple[int, str]] = []  # (chain_id, nft_addr) per entry
+    vols: List[float] = []
+    for chain_id, vols_at_chain in nftvols.items():
+        for basetoken_addr, vols_at_basetoken in vols_at_chain.items():
+            pairs.append((chain_id, basetoken_addr))
+            n_per_pair.append(len(vols_at_basetoken))
+            nft_keys += [(chain_id, nft_addr) for nft_addr in vols_at_basetoken]
+            vols += vols_at_basetoken.values()
+
+    # join rates: (chain, basetoken) -> rate vector, NaN if there's no rate
+    pair_rates = np.array(
+        [addr_rates.get(c, {}).get(b, np.nan) for c, b in pairs], dtype=np.float64
+    )
+    vols_USD = np.array(vols, dtype=np.float64) * np.repeat(pair_rates, n_per_pair)
+    has_rate = ~np.isnan(vols_USD)
+
+    # group-by sum per (chain, nft)
+    group_of_key: Dict[Tuple[int, str], int] = {}
+    groups = np.array(
+        [group_of_key.setdefault(key, len(group_of_key)) for key in nft_keys],
+        dtype=int,
+    )
+    sums = np.bincount(
+        groups[has_rate], weights=vols_USD[has_rate], minlength=len(group_of_key)
+    )
+
+    nftvols_USD: dict = {chain_id: {} for chain_id in nftvols if chain_id in addr_rates}
+    keys = list(group_of_key)
+    # keep the order in which nfts first appear with a rate
+    _, first_seen = np.unique(groups[has_rate], return_index=True)
+    for group in groups[has_rate][np.sort(first_seen)].tolist():
+        chain_id, nft_addr = keys[group]
+        nftvols_USD[chain_id][nft_addr] = float(sums[group])
     return nftvols_USD
+
+
+@enforce_types
+def with_native_tokens(symbols: Dict[int, Dict[str, str]]) -> Dict[int, Dict[str, str]]:
+    """
+    @description
+      Returns a copy of symbols, plus each chain's native token.
+
+    @arguments
+      symbols -- dict of [chainID][basetoken_addr] : basetoken_symbol
+
+    @return
+      symbols2 -- dict of [chainID][basetoken_addr] : basetoken_symbol
+    """
+    symbols2 = {chain_id: dict(syms) for chain_id, syms in symbols.items()}
+    for chain_id, token_addr in _CHAINID_TO_ADDRS.items():
+        token_symbol = _CHAINID_TO_NATIVE_TOKEN[chain_id]
+        symbols2.setdefault(chain_id, {})[token_addr] = token_symbol
+    return symbols2
@@ -40,13 +40,7 @@ fi
 
 
 # Get data
-dftool get_rate OCEAN $date $now $CSV_DIR
-dftool get_rate ETH $date $now $CSV_DIR
-dftool get_rate BNB $date $now $CSV_DIR
-dftool get_rate EWT $date $now $CSV_DIR
-dftool get_rate MOVR $date $now $CSV_DIR
-dftool get_rate MATIC $date $now $CSV_DIR
-dftool get_rate USDC $date $now $CSV_DIR
+dftool get_rate OCEAN,ETH,BNB,EWT,MOVR,MATIC,USDC $date $now $CSV_DIR
 USE_TESTNET="${USE_TESTNET:-0}"
 if [ $USE_TESTNET -eq 1 ]; then
     dftool query $date $now $SAMPLES $CSV_DIR 5